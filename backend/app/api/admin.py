@@ -11,6 +11,7 @@ from app.models.product import Product
 from app.models.user import User
 from app.models.category import Category
 from app.services.order import OrderService
+from app.services.product import ProductService
 from app.schemas.order import OrderResponse
 from app.schemas.product import ProductCreate, ProductUpdate, ProductResponse
 from app.middleware.auth import require_admin_user
@@ -254,6 +255,7 @@ async def create_admin_product(
         db.add(product)
         await db.commit()
         await db.refresh(product)
+        await ProductService(db).refresh_catalog(db)
 
         return {
             "success": True,
@@ -327,6 +329,7 @@ async def update_admin_product(
 
         await db.commit()
         await db.refresh(product)
+        await ProductService(db).refresh_catalog(db)
 
         return {
             "success": True,
@@ -376,6 +379,7 @@ async def delete_admin_product(
         product.is_active = False  # Also deactivate
 
         await db.commit()
+        await ProductService(db).refresh_catalog(db)
 
         return {
             "success": True,
@@ -8,7 +8,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel, Field
 
 from app.database import get_async_session
-from app.services.auth import AuthService, AuthenticationError, AuthorizationError
+from app.services.auth import auth_service, AuthenticationError, AuthorizationError
 from app.middleware.auth import (
     require_authenticated_user, require_admin_user, auth_rate_limit,
     get_current_user
@@ -88,10 +88,9 @@ async def login(
 
     Returns JWT tokens and user information.
     """
-    auth_service = AuthService(db)
-
     try:
         result = await auth_service.authenticate_user(
+            db,
             username=login_data.username,
             password=login_data.password,
             client_ip=request.client.host
@@ -132,15 +131,13 @@ async def telegram_login(
 
     Returns JWT tokens and user information.
     """
-    auth_service = AuthService(db)
-
     try:
         # Parse and validate Telegram initData
         telegram_data = parse_telegram_init_data(init_data.init_data)
         if not telegram_data:
             raise AuthenticationError("Invalid Telegram initData")
 
-        result = await auth_service.authenticate_telegram_user(telegram_data)
+        result = await auth_service.authenticate_telegram_user(db, telegram_data)
 
         logger.info(f"Telegram user {result['user'].telegram_id} authenticated successfully")
 
@@ -177,10 +174,8 @@ async def refresh_token(
 
     Returns new access and refresh tokens.
     """
-    auth_service = AuthService(db)
-
     try:
-        tokens = await auth_service.refresh_tokens(refresh_data.refresh_token)
+        tokens = await auth_service.refresh_tokens(db, refresh_data.refresh_token)
 
         logger.info("Token refresh successful")
 
@@ -209,16 +204,13 @@ async def refresh_token(
 async def logout(
     request: Request,
     logout_data: LogoutRequest = Body(...),
-    user: User = Depends(require_authenticated_user),
-    db: AsyncSession = Depends(get_async_session)
+    user: User = Depends(require_authenticated_user)
 ):
     """
     Logout user by blacklisting tokens.
 
     Blacklists the current access token and optionally refresh token.
     """
-    auth_service = AuthService(db)
-
     try:
         # Get access token from Authorization header
         auth_header = request.headers.get("Authorization")
@@ -258,16 +250,13 @@ async def logout(
 @router.post("/logout-all", status_code=200)
 async def logout_all(
     request: Request,
-    user: User = Depends(require_authenticated_user),
-    db: AsyncSession = Depends(get_async_session)
+    user: User = Depends(require_authenticated_user)
 ):
     """
     Logout user from all sessions.
 
     Blacklists all tokens for the current user.
     """
-    auth_service = AuthService(db)
-
     try:
         success = await auth_service.logout_all_user_sessions(user.id)
 
@@ -313,10 +302,9 @@ async def change_password(
     Requires current password and validates new password strength.
     All existing sessions will be terminated.
     """
-    auth_service = AuthService(db)
-
     try:
         success = await auth_service.change_password(
+            db,
             user_id=user.id,
             current_password=password_data.current_password,
             new_password=password_data.new_password
@@ -357,8 +345,6 @@ async def register_user(
 
     Only admins can create new users. Creates user with specified role.
     """
-    auth_service = AuthService(db)
-
     try:
         # Only allow creating users with role equal or lower than current user
         if current_user.role == UserRole.MANAGER and user_data.role == UserRole.ADMIN:
@@ -368,6 +354,7 @@ async def register_user(
             )
 
         new_user = await auth_service.register_admin_user(
+            db,
             username=user_data.username,
             password=user_data.password,
             first_name=user_data.first_name,
@@ -83,6 +83,19 @@ async def get_products(
     )
 
 
+# GET /products/catalog - Storefront product cards
+@router.get("/catalog")
+async def get_catalog(
+    category_id: Optional[int] = Query(None, description="Filter by category ID"),
+    limit: int = Query(50, ge=1, le=100, description="Number of products"),
+    offset: int = Query(0, ge=0, description="Number of products to skip"),
+    db: AsyncSession = Depends(get_async_session)
+):
+    """Get active in-stock products for the storefront."""
+    service = ProductService(db)
+    return await service.get_catalog(category_id=category_id, limit=limit, offset=offset)
+
+
 # POST /products - Create new product
 @router.post("/", response_model=ProductResponse, status_code=201)
 async def create_product(
@@ -1,20 +1,26 @@
 """Feedback handlers for Telegram bot."""
 
 import logging
+from datetime import datetime, timedelta
 from typing import Optional
 from aiogram import types
 from aiogram.dispatcher import FSMContext
 
+from app.config import settings
 from app.database import async_session_maker
 from app.models.user import User
 from app.models.order import Order
 from app.models.notification import FeedbackRating
 from app.services.notification import NotificationService
 from app.bot.bot import dp, bot
-from sqlalchemy import select
+from sqlalchemy import select, func
+from sqlalchemy.orm import selectinload
 
 logger = logging.getLogger(__name__)
 
+# Telegram caps messages at 4096 characters, so only the latest entries are shown
+FEEDBACK_HISTORY_LIMIT = 10
+
 
 @dp.callback_query_handler(lambda c: c.data and c.data.startswith('rate_order_'))
 async def handle_order_rating(callback_query: types.CallbackQuery):
@@ -211,14 +217,16 @@ async def handle_feedback_text(message: types.Message, state: FSMContext):
         await state.update_data(pending_feedback_order_id=None)
 
         user_telegram_id = message.from_user.id
-        feedback_text = message.text
+        raw_text = message.text or ""
 
-        if not feedback_text or len(feedback_text.strip()) == 0:
-            await message.reply("Комментарий не может быть пустым. Попробуйте еще раз.")
+        # Check length first so oversized messages are rejected without stripping them
+        if len(raw_text) > 1000:
+            await message.reply("Комментарий слишком длинный. Максимум 1000 символов.")
             return
 
-        if len(feedback_text) > 1000:
-            await message.reply("Комментарий слишком длинный. Максимум 1000 символов.")
+        feedback_text = raw_text.strip()
+        if not feedback_text:
+            await message.reply("Комментарий не может быть пустым. Попробуйте еще раз.")
             return
 
         async with async_session_maker() as db:
@@ -246,7 +254,7 @@ async def handle_feedback_text(message: types.Message, state: FSMContext):
                 return
 
             # Update feedback with text
-            feedback.feedback_text = feedback_text.strip()
+            feedback.feedback_text = feedback_text
             await db.commit()
 
             # Send confirmation
@@ -258,7 +266,6 @@ async def handle_feedback_text(message: types.Message, state: FSMContext):
             )
 
             # Notify admin about new detailed feedback
-            from app.config import settings
             admin_message = f"""
 💬 <b>Новый развернутый отзыв</b>
 
@@ -270,8 +277,7 @@ async def handle_feedback_text(message: types.Message, state: FSMContext):
 <i>{feedback_text}</i>
             """.strip()
 
-            notification_service = NotificationService(db)
-            await notification_service.send_admin_notification(admin_message)
+            NotificationService.schedule_admin_notification(admin_message)
 
     except Exception as e:
         await message.reply("Произошла ошибка при сохранении комментария")
@@ -297,14 +303,15 @@ async def show_user_feedback(message: types.Message):
                 await message.reply("Пользователь не найден")
                 return
 
-            # Get user's feedback with order details
+            # Get user's latest feedback with order details
             feedback_result = await db.execute(
-                select(FeedbackRating, Order)
-                .join(Order, FeedbackRating.order_id == Order.id)
+                select(FeedbackRating)
+                .options(selectinload(FeedbackRating.order))
                 .where(FeedbackRating.user_id == user.id)
                 .order_by(FeedbackRating.created_at.desc())
+                .limit(FEEDBACK_HISTORY_LIMIT)
             )
-            feedback_list = feedback_result.all()
+            feedback_list = feedback_result.scalars().all()
 
             if not feedback_list:
                 await message.reply(
@@ -315,8 +322,8 @@ async def show_user_feedback(message: types.Message):
 
             text = "📝 <b>Ваши отзывы:</b>\n\n"
 
-            for feedback, order in feedback_list:
-                text += f"📦 <b>Заказ #{order.id}</b>\n"
+            for feedback in feedback_list:
+                text += f"📦 <b>Заказ #{feedback.order.id}</b>\n"
                 text += f"⭐ <b>Оценка:</b> {feedback.rating_emoji}\n"
                 text += f"📅 <b>Дата:</b> {feedback.created_at.strftime('%d.%m.%Y')}\n"
 
@@ -337,9 +344,6 @@ async def show_feedback_stats(message: types.Message):
     """Show feedback statistics (admin only)."""
     try:
         async with async_session_maker() as db:
-            from datetime import datetime, timedelta
-            from sqlalchemy import func
-
             # Get stats for last 30 days
             start_date = datetime.utcnow() - timedelta(days=30)
 
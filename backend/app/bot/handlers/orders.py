@@ -1,7 +1,9 @@
 """Order management handlers for Telegram bot."""
 
+import logging
 from aiogram import Router, types, F
 from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_async_session
@@ -10,8 +12,69 @@ from app.models.user import User
 from app.services.order import OrderService
 from app.services.notification import NotificationService
 
+logger = logging.getLogger(__name__)
 router = Router()
 
+# Message templates, formatted with str.format() per call
+_CANCELLED_USER_TMPL = """
+❌ <b>Заказ #{order_id} отменен</b>
+
+Ваш заказ был успешно отменен.
+Если была произведена оплата, средства будут возвращены в течение 3-5 рабочих дней.
+
+Спасибо за использование нашего сервиса! 🙏
+"""
+
+_CANCELLED_ADMIN_TMPL = """
+🚫 <b>Заказ отменен пользователем</b>
+
+📦 <b>Заказ:</b> #{order_id}
+👤 <b>Клиент:</b> {customer_name}
+📞 <b>Телефон:</b> {customer_phone}
+💰 <b>Сумма:</b> {total}
+⏰ <b>Время отмены:</b> {cancelled_at}
+
+🔍 <b>Причина:</b> Отменен пользователем через бот
+"""
+
+_CREATED_TMPL = """
+✅ <b>Спасибо за заказ!</b>
+
+Ваш заказ на сумму <b>{total}</b>:
+{items}
+
+<b>Сумма к оплате:</b> {total}
+
+Для оплаты сделайте перевод:
+<code>5536 9141 2359 8116</code> (скопируется нажатием)
+
+• <b>Комментарий к платежу:</b> {order_id}
+
+• Можно перевести более крупную сумму для оплаты наличных.
+Статус: ожидание оплаты ⏳
+
+<b>Отменить</b>
+"""
+
+_PAYMENT_TMPL = """
+✅ <b>Оплата прошла успешно!</b>
+
+Заказ #{order_id} оплачен и будет доставлен в указанное время.
+
+<b>Доставка:</b> 10-15 мин
+
+Заказ был успешно доставлен.
+Благодарим вас за покупку! 🎉
+"""
+
+_COMPLETED_TMPL = """
+🎉 <b>Заказ доставлен!</b>
+
+Заказ #{order_id} был успешно доставлен.
+
+Оцените качество нашего сервиса:
+"""
+
 
 @router.callback_query(F.data.startswith("cancel_order:"))
 async def handle_cancel_order(callback: types.CallbackQuery):
@@ -25,20 +88,15 @@ async def handle_cancel_order(callback: types.CallbackQuery):
         async for session in get_async_session():
             order_service = OrderService(session)
 
-            # Get order and validate ownership
-            order = await order_service.get_order_by_id(order_id)
+            # Get order together with its owner and validate ownership
+            order, is_owner = await order_service.get_order_with_owner(
+                order_id, user_telegram_id
+            )
             if not order:
                 await callback.answer("❌ Заказ не найден", show_alert=True)
                 return
 
-            # Get user to validate ownership
-            from sqlalchemy import select
-            user_result = await session.execute(
-                select(User).where(User.telegram_id == user_telegram_id)
-            )
-            user = user_result.scalar_one_or_none()
-
-            if not user or order.user_id != user.id:
+            if not is_owner:
                 await callback.answer("❌ Это не ваш заказ", show_alert=True)
                 return
 
@@ -53,20 +111,14 @@ async def handle_cancel_order(callback: types.CallbackQuery):
             # Cancel the order
             success = await order_service.cancel_order(
                 order_id=order_id,
+                db=session,
                 reason="Отменен пользователем через бот",
-                cancelled_by_user_id=user.id
+                cancelled_by_user_id=order.user_id
             )
 
             if success:
                 # Update the message to show cancellation
-                cancel_text = f"""
-❌ <b>Заказ #{order_id} отменен</b>
-
-Ваш заказ был успешно отменен.
-Если была произведена оплата, средства будут возвращены в течение 3-5 рабочих дней.
-
-Спасибо за использование нашего сервиса! 🙏
-                """
+                cancel_text = _CANCELLED_USER_TMPL.format(order_id=order_id)
 
                 # Remove the cancel button
                 await callback.message.edit_text(
@@ -77,27 +129,23 @@ async def handle_cancel_order(callback: types.CallbackQuery):
                 await callback.answer("✅ Заказ отменен", show_alert=True)
 
                 # Send admin notification about cancellation
-                admin_text = f"""
-🚫 <b>Заказ отменен пользователем</b>
-
-📦 <b>Заказ:</b> #{order_id}
-👤 <b>Клиент:</b> {order.customer_name}
-📞 <b>Телефон:</b> {order.customer_phone}
-💰 <b>Сумма:</b> {order.formatted_total}
-⏰ <b>Время отмены:</b> {order.updated_at.strftime('%d.%m.%Y %H:%M')}
-
-🔍 <b>Причина:</b> Отменен пользователем через бот
-                """
+                admin_text = _CANCELLED_ADMIN_TMPL.format(
+                    order_id=order_id,
+                    customer_name=order.customer_name,
+                    customer_phone=order.customer_phone,
+                    total=order.formatted_total,
+                    cancelled_at=order.updated_at.strftime('%d.%m.%Y %H:%M')
+                )
 
-                await NotificationService.send_admin_notification(admin_text)
+                NotificationService.schedule_admin_notification(admin_text)
             else:
                 await callback.answer("❌ Ошибка при отмене заказа", show_alert=True)
 
             break
 
-    except Exception as e:
+    except Exception:
         await callback.answer("❌ Ошибка при обработке запроса", show_alert=True)
-        print(f"Error cancelling order: {e}")
+        logger.exception("Error cancelling order")
 
 
 async def send_order_notification(
@@ -109,30 +157,15 @@ async def send_order_notification(
 
     # Format order details
     if message_type == "created":
-        notification_text = f"""
-✅ <b>Спасибо за заказ!</b>
-
-Ваш заказ на сумму <b>{order.formatted_total}</b>:
-"""
         # Add order items
-        if order.items:
-            for item in order.items:
-                notification_text += f"• {item.product.name} - {item.quantity} шт.\n"
-
-        notification_text += f"""
-
-<b>Сумма к оплате:</b> {order.formatted_total}
-
-Для оплаты сделайте перевод:
-<code>5536 9141 2359 8116</code> (скопируется нажатием)
-
-• <b>Комментарий к платежу:</b> {order.id}
-
-• Можно перевести более крупную сумму для оплаты наличных.
-Статус: ожидание оплаты ⏳
-
-<b>Отменить</b>
-        """
+        items_block = "".join(
+            f"• {item.product.name} - {item.quantity} шт.\n" for item in order.items or ()
+        )
+        notification_text = _CREATED_TMPL.format(
+            total=order.formatted_total,
+            items=items_block,
+            order_id=order.id
+        )
 
         # Add cancel button if order can be cancelled
         if order.can_be_cancelled:
@@ -150,26 +183,11 @@ async def send_order_notification(
             keyboard = None
 
     elif message_type == "payment_success":
-        notification_text = f"""
-✅ <b>Оплата прошла успешно!</b>
-
-Заказ #{order.id} оплачен и будет доставлен в указанное время.
-
-<b>Доставка:</b> 10-15 мин
-
-Заказ был успешно доставлен.
-Благодарим вас за покупку! 🎉
-        """
+        notification_text = _PAYMENT_TMPL.format(order_id=order.id)
         keyboard = None
 
     elif message_type == "completed":
-        notification_text = f"""
-🎉 <b>Заказ доставлен!</b>
-
-Заказ #{order.id} был успешно доставлен.
-
-Оцените качество нашего сервиса:
-        """
+        notification_text = _COMPLETED_TMPL.format(order_id=order.id)
 
         # Add feedback buttons
         keyboard = InlineKeyboardMarkup(
@@ -191,8 +209,8 @@ async def send_order_notification(
             notification_text,
             reply_markup=keyboard
         )
-    except Exception as e:
-        print(f"Failed to send order notification: {e}")
+    except Exception:
+        logger.exception("Failed to send order notification")
 
 
 @router.callback_query(F.data == "my_orders")
@@ -202,7 +220,6 @@ async def handle_my_orders(callback: types.CallbackQuery):
 
     async for session in get_async_session():
         # Get user
-        from sqlalchemy import select
         user_result = await session.execute(
             select(User).where(User.telegram_id == user_telegram_id)
         )
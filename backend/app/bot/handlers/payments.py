@@ -1,26 +1,211 @@
 """Payment handlers for Telegram bot."""
 
+import asyncio
 import logging
-from typing import Dict, Any
+import re
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Set
 from aiogram import Router, F
+from aiogram.exceptions import TelegramRetryAfter
 from aiogram.types import (
     PreCheckoutQuery, SuccessfulPayment, CallbackQuery,
     InlineKeyboardMarkup, InlineKeyboardButton, Message
 )
 from aiogram.filters import Command
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
-from app.database import get_async_session
-from app.models.payment import Payment, PaymentStatus, PaymentMethod
-from app.models.order import Order, OrderStatus
+from app.database import get_async_session_ctx
+from app.models.payment import Payment, PaymentStatus, PaymentMethod, PAYMENT_STATUS_DISPLAY
+from app.models.order import Order, OrderItem, OrderStatus, ORDER_STATUS_DISPLAY, ACTIVE_ORDER_ITEMS
 from app.models.user import User
-from app.services.payment import PaymentService
+from app.services.notification import NotificationService
+from app.services.payment import PaymentService, PaymentLockedError
 from app.services.telegram_payments import TelegramPaymentsService
 from app.bot.bot import bot
 
 logger = logging.getLogger(__name__)
 router = Router()
 
+# Bot is a module-level singleton, so the payments service can be shared too
+_tg_payments = TelegramPaymentsService(bot)
+
+_CANCEL_PAYMENT_RE = re.compile(r"^cancel_payment_(\d+)$")
+
+# User-facing payment messages, the bot sends HTML by default
+_CANCEL_TMPL = (
+    "❌ <b>Платёж отменён</b>\n\n"
+    "📦 <b>Заказ:</b> #{order_id}\n"
+    "💳 <b>Сумма:</b> {amount}\n\n"
+    "Вы можете оформить заказ заново в любое время."
+)
+_INVOICE_CREATED_TMPL = (
+    "💳 <b>Счёт для оплаты создан!</b>\n\n"
+    "📦 <b>Заказ:</b> #{order_id}\n"
+    "💰 <b>Сумма:</b> {amount}\n\n"
+    "Нажмите кнопку ниже для оплаты ⬇️"
+)
+_PAYMENT_ERROR_TEXT = "❌ Ошибка при обработке платежа. Обратитесь в поддержку."
+_RECONCILE_FAILED_TMPL = (
+    "⚠️ <b>Платёж #{payment_id} одобрен по подписи, но не прошёл сверку</b>\n\n"
+    "Причина: {problem}\n"
+    "Проверьте списание и при необходимости оформите возврат вручную."
+)
+
+# Fallback pre-checkout answer must not hold the handler longer than this
+PRE_CHECKOUT_FALLBACK_TIMEOUT = 2  # seconds
+
+# Keep references to delayed answers so they are not garbage collected
+_background_tasks: Set[asyncio.Task] = set()
+
+
+# Telegram ID -> user ID mapping never changes for a registered user, keep the recent ones in memory
+_USER_ID_CACHE_SIZE = 10000
+_user_id_cache: "OrderedDict[int, int]" = OrderedDict()
+_user_id_cache_lock = asyncio.Lock()
+
+
+async def _user_id_for_tg(db: AsyncSession, telegram_id: int) -> Optional[int]:
+    """Get user ID by Telegram ID, or None if the user is not registered."""
+    async with _user_id_cache_lock:
+        user_id = _user_id_cache.get(telegram_id)
+        if user_id is not None:
+            _user_id_cache.move_to_end(telegram_id)
+            return user_id
+
+    result = await db.execute(
+        select(User.id).where(User.telegram_id == telegram_id)
+    )
+    user_id = result.scalar_one_or_none()
+
+    # Unknown users are not cached so that /start takes effect immediately
+    if user_id is not None:
+        async with _user_id_cache_lock:
+            _user_id_cache[telegram_id] = user_id
+            if len(_user_id_cache) > _USER_ID_CACHE_SIZE:
+                _user_id_cache.popitem(last=False)
+
+    return user_id
+
+
+def _run_in_background(coro) -> None:
+    """Run coroutine as a background task, keeping a reference until it's done."""
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+async def _reconcile_pre_checkout(payment_id: int, total_amount: int):
+    """
+    Check a pre-checkout query approved by signature against the database.
+
+    Telegram may already be charging the user, so a mismatch fails the payment
+    if it is still pending and is flagged to admin for a manual refund.
+    """
+    try:
+        async with get_async_session_ctx() as db:
+            payment_service = PaymentService(db)
+            # Plain read: a concurrent handler holding the row lock is not a mismatch
+            payment = await payment_service.get_payment_by_id(payment_id)
+            if not payment:
+                problem = "не найден"
+            elif payment.amount_kopecks != total_amount:
+                problem = f"сумма {total_amount} коп. вместо {payment.amount_kopecks} коп."
+                if payment.status == PaymentStatus.PENDING:
+                    await payment_service.process_failed_payment(
+                        payment_id=payment_id,
+                        error_message="Сумма подтверждённого платежа не совпала"
+                    )
+            elif payment.status == PaymentStatus.PENDING:
+                return
+            elif payment.status == PaymentStatus.SUCCESS and payment.telegram_payment_charge_id:
+                # successful_payment of this query was processed before the check
+                return
+            else:
+                problem = f"уже в статусе {payment.status.value}"
+    except Exception as e:
+        logger.error(f"Error reconciling pre-checkout for payment {payment_id}: {e}")
+        problem = "не удалось проверить"
+
+    logger.error(f"Payment {payment_id} approved by signature failed reconciliation: {problem}")
+    NotificationService.schedule_admin_notification(
+        _RECONCILE_FAILED_TMPL.format_map({"payment_id": payment_id, "problem": problem})
+    )
+
+
+async def _check_pre_checkout_payment(
+    payment_service: PaymentService, payment_id: int, total_amount: int
+) -> Optional[str]:
+    """Check payment against the database, returning an error message if it can't be paid."""
+    # Lock payment so concurrent queries can't both approve it
+    try:
+        payment = await payment_service.get_payment_by_id(payment_id, for_update=True)
+    except PaymentLockedError:
+        logger.warning(f"Payment {payment_id} is locked by a concurrent handler")
+        return "Платёж обрабатывается, попробуйте ещё раз"
+
+    if not payment:
+        logger.error(f"Payment {payment_id} not found")
+        return "Платёж не найден"
+
+    # Verify payment is still pending
+    if payment.status != PaymentStatus.PENDING:
+        logger.warning(f"Payment {payment.id} is not pending: {payment.status}")
+        return "Платёж уже обработан"
+
+    # Verify order exists and is valid
+    if not payment.order:
+        logger.error(f"Order {payment.order_id} not found for payment {payment.id}")
+        return "Заказ не найден"
+
+    # Verify amount matches
+    if total_amount != payment.amount_kopecks:
+        logger.error(
+            f"Amount mismatch for payment {payment.id}: "
+            f"expected {payment.amount_kopecks}, got {total_amount}"
+        )
+        return "Неверная сумма платежа"
+
+    return None
+
+
+async def _answer_pre_checkout_later(pre_checkout_query_id: str, delay: float, error_message: str):
+    """Reject pre-checkout query once Telegram's flood wait is over."""
+    await asyncio.sleep(delay)
+    await _tg_payments.answer_pre_checkout_query(
+        pre_checkout_query_id,
+        ok=False,
+        error_message=error_message
+    )
+
+
+async def _reject_pre_checkout_query(pre_checkout_query_id: str, error_message: str):
+    """
+    Reject pre-checkout query after an unexpected error.
+
+    The answer is bounded by a timeout, and on a 429 it is retried once in the
+    background instead of blocking the handler.
+    """
+    try:
+        await asyncio.wait_for(
+            bot.answer_pre_checkout_query(
+                pre_checkout_query_id=pre_checkout_query_id,
+                ok=False,
+                error_message=error_message
+            ),
+            timeout=PRE_CHECKOUT_FALLBACK_TIMEOUT
+        )
+    except TelegramRetryAfter as e:
+        logger.warning(f"Flood wait {e.retry_after}s answering pre-checkout query {pre_checkout_query_id}")
+        _run_in_background(
+            _answer_pre_checkout_later(pre_checkout_query_id, e.retry_after, error_message)
+        )
+    except asyncio.TimeoutError:
+        logger.error(f"Timed out answering pre-checkout query {pre_checkout_query_id}")
+    except Exception as e:
+        logger.error(f"Failed to answer pre-checkout query {pre_checkout_query_id}: {e}")
+
 
 @router.pre_checkout_query()
 async def handle_pre_checkout_query(pre_checkout_query: PreCheckoutQuery):
@@ -40,87 +225,80 @@ async def handle_pre_checkout_query(pre_checkout_query: PreCheckoutQuery):
 
         if not payment_data:
             logger.error(f"Invalid payload in pre-checkout query: {pre_checkout_query.invoice_payload}")
-            await TelegramPaymentsService(bot).answer_pre_checkout_query(
+            await _tg_payments.answer_pre_checkout_query(
                 pre_checkout_query.id,
                 ok=False,
                 error_message="Неверные данные платежа"
             )
             return
 
-        # Get database session
-        async for db in get_async_session():
-            try:
-                payment_service = PaymentService(db)
-
-                # Get payment by ID
-                payment = await payment_service.get_payment_by_id(payment_data["payment_id"])
-                if not payment:
-                    logger.error(f"Payment {payment_data['payment_id']} not found")
-                    await TelegramPaymentsService(bot).answer_pre_checkout_query(
-                        pre_checkout_query.id,
-                        ok=False,
-                        error_message="Платёж не найден"
-                    )
-                    return
-
-                # Verify payment is still pending
-                if payment.status != PaymentStatus.PENDING:
-                    logger.warning(f"Payment {payment.id} is not pending: {payment.status}")
-                    await TelegramPaymentsService(bot).answer_pre_checkout_query(
-                        pre_checkout_query.id,
-                        ok=False,
-                        error_message="Платёж уже обработан"
-                    )
-                    return
-
-                # Verify order exists and is valid
-                if not payment.order:
-                    logger.error(f"Order {payment.order_id} not found for payment {payment.id}")
-                    await TelegramPaymentsService(bot).answer_pre_checkout_query(
-                        pre_checkout_query.id,
-                        ok=False,
-                        error_message="Заказ не найден"
-                    )
-                    return
-
-                # Verify amount matches
-                total_amount_kopecks = int(payment.amount * 100)
-                if pre_checkout_query.total_amount != total_amount_kopecks:
-                    logger.error(
-                        f"Amount mismatch for payment {payment.id}: "
-                        f"expected {total_amount_kopecks}, got {pre_checkout_query.total_amount}"
-                    )
-                    await TelegramPaymentsService(bot).answer_pre_checkout_query(
-                        pre_checkout_query.id,
-                        ok=False,
-                        error_message="Неверная сумма платежа"
-                    )
-                    return
-
-                # All checks passed - approve payment
-                await TelegramPaymentsService(bot).answer_pre_checkout_query(
+        # Approve from the snapshot cached at invoice creation, hitting the DB only on a miss
+        cached = await PaymentService.get_cached_payment(payment_data["payment_id"])
+        if cached:
+            if cached["s"] != PaymentStatus.PENDING.value:
+                logger.warning(f"Payment {payment_data['payment_id']} is not pending: {cached['s']}")
+                await _tg_payments.answer_pre_checkout_query(
                     pre_checkout_query.id,
-                    ok=True
+                    ok=False,
+                    error_message="Платёж уже обработан"
                 )
+                return
 
-                logger.info(f"Pre-checkout query approved for payment {payment.id}")
-                break
-
-            except Exception as e:
-                logger.error(f"Database error in pre-checkout handler: {e}")
-                await TelegramPaymentsService(bot).answer_pre_checkout_query(
+            if (
+                cached["o"] == payment_data["order_id"]
+                and cached["a"] == pre_checkout_query.total_amount
+            ):
+                await _tg_payments.answer_pre_checkout_query(
                     pre_checkout_query.id,
-                    ok=False,
-                    error_message="Внутренняя ошибка сервера"
+                    ok=True
                 )
+                logger.info(f"Pre-checkout query approved from cache for payment {payment_data['payment_id']}")
                 return
 
+        # On a cache miss signed payloads are approved without touching the database,
+        # the payment is checked against it in the background
+        elif TelegramPaymentsService.verify_payment_signature(
+            payment_data["payment_id"],
+            pre_checkout_query.total_amount,
+            payment_data["signature"]
+        ):
+            await _tg_payments.answer_pre_checkout_query(
+                pre_checkout_query.id,
+                ok=True
+            )
+            logger.info(f"Pre-checkout query approved by signature for payment {payment_data['payment_id']}")
+            _run_in_background(
+                _reconcile_pre_checkout(payment_data["payment_id"], pre_checkout_query.total_amount)
+            )
+            return
+
+        # Telegram is answered only after the transaction holding the row lock ends
+        async with get_async_session_ctx() as db:
+            error_message = await _check_pre_checkout_payment(
+                PaymentService(db), payment_data["payment_id"], pre_checkout_query.total_amount
+            )
+
+        if error_message:
+            await _tg_payments.answer_pre_checkout_query(
+                pre_checkout_query.id,
+                ok=False,
+                error_message=error_message
+            )
+            return
+
+        # All checks passed - approve payment
+        await _tg_payments.answer_pre_checkout_query(
+            pre_checkout_query.id,
+            ok=True
+        )
+
+        logger.info(f"Pre-checkout query approved for payment {payment_data['payment_id']}")
+
     except Exception as e:
         logger.error(f"Error in pre-checkout query handler: {e}")
-        await TelegramPaymentsService(bot).answer_pre_checkout_query(
+        await _reject_pre_checkout_query(
             pre_checkout_query.id,
-            ok=False,
-            error_message="Ошибка обработки платежа"
+            "Ошибка обработки платежа"
         )
 
 
@@ -143,119 +321,101 @@ async def handle_successful_payment(message: Message):
 
         if not payment_data:
             logger.error(f"Invalid payload in successful payment: {payment_info.invoice_payload}")
-            await message.answer(
-                "❌ Ошибка обработки платежа. Обратитесь в поддержку.",
-                parse_mode="HTML"
-            )
+            await message.answer("❌ Ошибка обработки платежа. Обратитесь в поддержку.")
             return
 
         # Get database session
-        async for db in get_async_session():
-            try:
-                payment_service = PaymentService(db)
-
-                # Process successful payment
-                success = await payment_service.process_successful_payment(
-                    order_id=payment_data["order_id"],
-                    payment_id=payment_data["payment_id"],
-                    telegram_payment_charge_id=payment_info.telegram_payment_charge_id,
-                    provider_payment_charge_id=payment_info.provider_payment_charge_id,
-                    provider_data={
-                        "currency": payment_info.currency,
-                        "total_amount": payment_info.total_amount,
-                        "order_info": payment_info.order_info.__dict__ if payment_info.order_info else None,
-                        "shipping_option_id": payment_info.shipping_option_id
-                    }
-                )
+        async with get_async_session_ctx() as db:
+            payment_service = PaymentService(db)
 
-                if success:
-                    # Get updated payment details for response
-                    payment = await payment_service.get_payment_by_id(payment_data["payment_id"])
-                    if payment and payment.order:
-                        # Send success message
-                        success_message = TelegramPaymentsService.format_payment_success_message(
-                            payment.order, payment
-                        )
-                        await message.answer(success_message, parse_mode="HTML")
-                    else:
-                        await message.answer(
-                            "✅ Платёж успешно обработан! Спасибо за покупку!",
-                            parse_mode="HTML"
-                        )
-                else:
-                    await message.answer(
-                        "❌ Ошибка при обработке платежа. Обратитесь в поддержку.",
-                        parse_mode="HTML"
-                    )
-
-                break
-
-            except Exception as e:
-                logger.error(f"Database error in successful payment handler: {e}")
-                await message.answer(
-                    "❌ Ошибка при обработке платежа. Обратитесь в поддержку.",
-                    parse_mode="HTML"
+            # Serialize handlers of the same order, Telegram may redeliver the update
+            if not await payment_service.try_lock_order(payment_data["order_id"]):
+                logger.warning(
+                    f"Concurrent successful payment handler in progress for order {payment_data['order_id']}"
                 )
                 return
 
+            # Process successful payment
+            payment = await payment_service.process_successful_payment(
+                order_id=payment_data["order_id"],
+                payment_id=payment_data["payment_id"],
+                telegram_payment_charge_id=payment_info.telegram_payment_charge_id,
+                provider_payment_charge_id=payment_info.provider_payment_charge_id,
+                provider_data={
+                    "currency": payment_info.currency,
+                    "total_amount": payment_info.total_amount,
+                    "order_info": (
+                        payment_info.order_info.model_dump(exclude_none=True)
+                        if payment_info.order_info else None
+                    ),
+                    "shipping_option_id": payment_info.shipping_option_id
+                }
+            )
+
+            if payment:
+                # Payment is returned with its order already loaded
+                if payment.order:
+                    # Send success message
+                    success_message = TelegramPaymentsService.format_payment_success_message(
+                        payment.order, payment
+                    )
+                    await message.answer(success_message)
+                else:
+                    await message.answer("✅ Платёж успешно обработан! Спасибо за покупку!")
+            else:
+                await message.answer(_PAYMENT_ERROR_TEXT)
+
     except Exception as e:
         logger.error(f"Error in successful payment handler: {e}")
-        await message.answer(
-            "❌ Ошибка при обработке платежа. Обратитесь в поддержку.",
-            parse_mode="HTML"
-        )
+        await message.answer(_PAYMENT_ERROR_TEXT)
 
 
 @router.callback_query(F.data.startswith("cancel_payment_"))
 async def handle_cancel_payment(callback_query: CallbackQuery):
     """Handle payment cancellation."""
+    # Extract payment ID from callback data
+    match = _CANCEL_PAYMENT_RE.match(callback_query.data)
+    if not match:
+        await callback_query.answer("Неверные данные", show_alert=True)
+        return
+
+    payment_id = int(match.group(1))
+
     try:
-        # Extract payment ID from callback data
-        payment_id = int(callback_query.data.split("_")[-1])
+        async with get_async_session_ctx() as db:
+            payment_service = PaymentService(db)
 
-        async for db in get_async_session():
+            # Get and lock payment
             try:
-                payment_service = PaymentService(db)
-
-                # Get payment
-                payment = await payment_service.get_payment_by_id(payment_id)
-                if not payment:
-                    await callback_query.answer("Платёж не найден", show_alert=True)
-                    return
-
-                if payment.status != PaymentStatus.PENDING:
-                    await callback_query.answer("Платёж уже обработан", show_alert=True)
-                    return
-
-                # Mark payment as failed (cancelled by user)
-                await payment_service.process_failed_payment(
-                    payment_id=payment_id,
-                    error_message="Отменено пользователем"
-                )
+                payment = await payment_service.get_payment_by_id(payment_id, for_update=True)
+            except PaymentLockedError:
+                await callback_query.answer("Платёж обрабатывается, попробуйте ещё раз", show_alert=True)
+                return
+            if not payment:
+                await callback_query.answer("Платёж не найден", show_alert=True)
+                return
 
-                # Send cancellation message
-                if payment.order:
-                    cancel_message = (
-                        f"❌ <b>Платёж отменён</b>\n\n"
-                        f"📦 <b>Заказ:</b> #{payment.order.id}\n"
-                        f"💳 <b>Сумма:</b> {payment.formatted_amount}\n\n"
-                        f"Вы можете оформить заказ заново в любое время."
-                    )
-                else:
-                    cancel_message = "❌ Платёж отменён"
+            if payment.status != PaymentStatus.PENDING:
+                await callback_query.answer("Платёж уже обработан", show_alert=True)
+                return
 
-                await callback_query.message.edit_text(
-                    cancel_message,
-                    parse_mode="HTML"
-                )
-                await callback_query.answer("Платёж отменён")
+            # Mark payment as failed (cancelled by user)
+            await payment_service.process_failed_payment(
+                payment_id=payment_id,
+                error_message="Отменено пользователем"
+            )
 
-                break
+            # Send cancellation message
+            if payment.order:
+                cancel_message = _CANCEL_TMPL.format_map({
+                    "order_id": payment.order.id,
+                    "amount": payment.formatted_amount
+                })
+            else:
+                cancel_message = "❌ Платёж отменён"
 
-            except Exception as e:
-                logger.error(f"Database error in cancel payment handler: {e}")
-                await callback_query.answer("Ошибка отмены платежа", show_alert=True)
-                return
+            await callback_query.message.edit_text(cancel_message)
+            await callback_query.answer("Платёж отменён")
 
     except Exception as e:
         logger.error(f"Error in cancel payment handler: {e}")
@@ -273,88 +433,71 @@ async def handle_pay_command(message: Message):
     try:
         user_id = message.from_user.id
 
-        async for db in get_async_session():
-            try:
-                # Get user
-                from sqlalchemy import select
-                user_result = await db.execute(
-                    select(User).where(User.telegram_id == user_id)
+        async with get_async_session_ctx() as db:
+            db_user_id = await _user_id_for_tg(db, user_id)
+            if db_user_id is None:
+                await message.answer(
+                    "❌ Пользователь не найден. Пожалуйста, запустите бота командой /start"
                 )
-                user = user_result.scalar_one_or_none()
+                return
 
-                if not user:
-                    await message.answer(
-                        "❌ Пользователь не найден. Пожалуйста, запустите бота командой /start"
-                    )
-                    return
-
-                # Get latest pending order without payment
-                from sqlalchemy.orm import selectinload
-                order_result = await db.execute(
-                    select(Order)
-                    .options(selectinload(Order.items), selectinload(Order.payment))
-                    .where(
-                        Order.user_id == user.id,
-                        Order.status == OrderStatus.PENDING,
-                        Order.is_deleted == False
-                    )
-                    .order_by(Order.created_at.desc())
-                    .limit(1)
+            # Get latest pending order of the user
+            order_result = await db.execute(
+                select(Order)
+                .options(
+                    selectinload(Order.items).selectinload(OrderItem.product),
+                    ACTIVE_ORDER_ITEMS,
+                    selectinload(Order.payment)
                 )
-                order = order_result.scalar_one_or_none()
-
-                if not order:
-                    await message.answer(
-                        "❌ У вас нет ожидающих оплаты заказов.\n"
-                        "Оформите заказ через веб-приложение бота."
-                    )
-                    return
-
-                # Check if order already has a payment
-                if order.payment and order.payment.status == PaymentStatus.PENDING:
-                    await message.answer(
-                        f"💳 У заказа #{order.id} уже создан платёж.\n"
-                        f"Сумма: {order.payment.formatted_amount}\n"
-                        f"Статус: {order.payment.status_display}"
-                    )
-                    return
+                .where(
+                    Order.user_id == db_user_id,
+                    Order.status == OrderStatus.PENDING,
+                    Order.is_deleted == False
+                )
+                .order_by(Order.created_at.desc())
+                .limit(1)
+            )
+            order = order_result.scalar_one_or_none()
 
-                # Create payment for the order
-                payment_service = PaymentService(db)
-                payment = await payment_service.create_payment(
-                    order=order,
-                    payment_method=PaymentMethod.TELEGRAM
+            if not order:
+                await message.answer(
+                    "❌ У вас нет ожидающих оплаты заказов.\n"
+                    "Оформите заказ через веб-приложение бота."
                 )
+                return
 
-                # Send invoice
-                telegram_payments = TelegramPaymentsService(bot)
-                invoice_sent = await telegram_payments.create_invoice(
-                    chat_id=message.chat.id,
-                    order=order,
-                    payment=payment
+            # Check if order already has a payment
+            if order.payment and order.payment.status == PaymentStatus.PENDING:
+                await message.answer(
+                    f"💳 У заказа #{order.id} уже создан платёж.\n"
+                    f"Сумма: {order.payment.formatted_amount}\n"
+                    f"Статус: {order.payment.status_display}"
                 )
+                return
 
-                if invoice_sent:
-                    await message.answer(
-                        f"💳 <b>Счёт для оплаты создан!</b>\n\n"
-                        f"📦 <b>Заказ:</b> #{order.id}\n"
-                        f"💰 <b>Сумма:</b> {payment.formatted_amount}\n\n"
-                        f"Нажмите кнопку ниже для оплаты ⬇️",
-                        parse_mode="HTML"
-                    )
-                else:
-                    await message.answer(
-                        "❌ Ошибка создания счёта для оплаты. Попробуйте позже."
-                    )
+            # Create payment for the order
+            payment_service = PaymentService(db)
+            payment = await payment_service.create_payment(
+                order=order,
+                payment_method=PaymentMethod.TELEGRAM
+            )
 
-                break
+            # Send invoice
+            invoice_sent = await _tg_payments.create_invoice(
+                chat_id=message.chat.id,
+                order=order,
+                payment=payment
+            )
 
-            except Exception as e:
-                logger.error(f"Database error in pay command handler: {e}")
+            if invoice_sent:
+                await message.answer(_INVOICE_CREATED_TMPL.format_map({
+                    "order_id": order.id,
+                    "amount": payment.formatted_amount
+                }))
+            else:
                 await message.answer(
-                    "❌ Ошибка при создании платежа. Попробуйте позже."
+                    "❌ Ошибка создания счёта для оплаты. Попробуйте позже."
                 )
-                return
 
     except Exception as e:
         logger.error(f"Error in pay command handler: {e}")
@@ -369,66 +512,57 @@ async def handle_payment_status_command(message: Message):
     try:
         user_id = message.from_user.id
 
-        async for db in get_async_session():
-            try:
-                # Get user
-                from sqlalchemy import select
-                user_result = await db.execute(
-                    select(User).where(User.telegram_id == user_id)
+        async with get_async_session_ctx() as db:
+            db_user_id = await _user_id_for_tg(db, user_id)
+            if db_user_id is None:
+                await message.answer(
+                    "❌ Пользователь не найден. Пожалуйста, запустите бота командой /start"
                 )
-                user = user_result.scalar_one_or_none()
+                return
 
-                if not user:
-                    await message.answer(
-                        "❌ Пользователь не найден. Пожалуйста, запустите бота командой /start"
-                    )
-                    return
-
-                # Get recent orders with payments
-                from sqlalchemy.orm import selectinload
-                orders_result = await db.execute(
-                    select(Order)
-                    .options(selectinload(Order.payment))
-                    .where(
-                        Order.user_id == user.id,
-                        Order.is_deleted == False
-                    )
-                    .order_by(Order.created_at.desc())
-                    .limit(5)
+            # Get only the displayed columns of recent orders and their payments
+            orders_result = await db.execute(
+                select(
+                    Order.id,
+                    Order.total_amount,
+                    Order.status,
+                    Order.created_at,
+                    Payment.status,
+                    Payment.telegram_payment_charge_id
                 )
-                orders = orders_result.scalars().all()
-
-                if not orders:
-                    await message.answer("❌ У вас пока нет заказов.")
-                    return
-
-                # Format response
-                response = "<b>💳 Статус платежей по вашим заказам:</b>\n\n"
+                .outerjoin(Payment, Payment.order_id == Order.id)
+                .where(
+                    Order.user_id == db_user_id,
+                    Order.is_deleted == False
+                )
+                .order_by(Order.created_at.desc())
+                .limit(5)
+            )
+            orders = orders_result.all()
 
-                for order in orders:
-                    response += f"📦 <b>Заказ #{order.id}</b>\n"
-                    response += f"💰 Сумма: {order.formatted_total}\n"
-                    response += f"📅 Дата: {order.created_at.strftime('%d.%m.%Y %H:%M')}\n"
+            if not orders:
+                await message.answer("❌ У вас пока нет заказов.")
+                return
 
-                    if order.payment:
-                        response += f"💳 Платёж: {order.payment.status_display}\n"
-                        if order.payment.telegram_payment_charge_id:
-                            response += f"🔗 ID: <code>{order.payment.telegram_payment_charge_id}</code>\n"
-                    else:
-                        response += "💳 Платёж: Не создан\n"
+            # Format response
+            parts = ["<b>💳 Статус платежей по вашим заказам:</b>\n\n"]
 
-                    response += f"🏷 Статус заказа: {order.status_display}\n\n"
+            for order_id, total_amount, order_status, created_at, payment_status, charge_id in orders:
+                parts.append(f"📦 <b>Заказ #{order_id}</b>\n")
+                parts.append(f"💰 Сумма: {int(total_amount)}₽\n")
+                parts.append(f"📅 Дата: {created_at.strftime('%d.%m.%Y %H:%M')}\n")
 
-                await message.answer(response, parse_mode="HTML")
+                if payment_status:
+                    parts.append(f"💳 Платёж: {PAYMENT_STATUS_DISPLAY.get(payment_status, payment_status.value)}\n")
+                    if charge_id:
+                        parts.append(f"🔗 ID: <code>{charge_id}</code>\n")
+                else:
+                    parts.append("💳 Платёж: Не создан\n")
 
-                break
+                parts.append(f"🏷 Статус заказа: {ORDER_STATUS_DISPLAY.get(order_status, order_status.value)}\n\n")
 
-            except Exception as e:
-                logger.error(f"Database error in payment status handler: {e}")
-                await message.answer(
-                    "❌ Ошибка при получении статуса платежей."
-                )
-                return
+            response = "".join(parts)
+            await message.answer(response)
 
     except Exception as e:
         logger.error(f"Error in payment status handler: {e}")
@@ -1,8 +1,12 @@
 """Application configuration."""
 
 import os
+from pydantic import model_validator
 from pydantic_settings import BaseSettings
-from typing import Optional, List
+from typing import Any, Optional, Tuple
+
+# Environments that always run with debug enabled
+DEBUG_ENVIRONMENTS = frozenset({"development", "dev", "testing", "test"})
 
 
 class Settings(BaseSettings):
@@ -41,12 +45,12 @@ class Settings(BaseSettings):
     password_max_length: int = 128
 
     # CORS settings
-    cors_origins: List[str] = [
+    cors_origins: Tuple[str, ...] = (
         "http://localhost:3000",
         "http://localhost:8080",
         "https://domashniystandart.com",
         "https://www.domashniystandart.com"
-    ]
+    )
     cors_allow_credentials: bool = True
 
     # Business Logic
@@ -60,13 +64,17 @@ class Settings(BaseSettings):
     port: int = 8000
     base_url: str = "https://domashniystandart.com"  # Base URL for API endpoints
 
+    @model_validator(mode="before")
+    @classmethod
+    def _set_debug_from_environment(cls, data: Any) -> Any:
+        """Override debug based on environment, settings are frozen after validation."""
+        if isinstance(data, dict):
+            environment = str(data.get("environment", "production")).lower()
+            data["debug"] = environment in DEBUG_ENVIRONMENTS
+        return data
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        # Override debug based on environment
-        if self.environment.lower() in ["development", "dev", "testing", "test"]:
-            self.debug = True
-        else:
-            self.debug = False
 
         # Production security checks
         if self.environment.lower() == "production":
@@ -86,6 +94,7 @@ class Settings(BaseSettings):
     class Config:
         env_file = ".env"
         case_sensitive = False
+        frozen = True
 
 
 settings = Settings()
\ No newline at end of file
@@ -1,7 +1,8 @@
 """Database configuration and session management."""
 
 import asyncio
-from typing import AsyncGenerator
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator, AsyncIterator
 
 from sqlalchemy import create_engine
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
@@ -15,8 +16,9 @@ async_engine = create_async_engine(
     settings.database_url,
     echo=settings.debug,
     pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20
+    pool_size=20,
+    max_overflow=10,
+    pool_recycle=1800
 )
 
 # Sync engine for Alembic migrations
@@ -50,6 +52,18 @@ async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+@asynccontextmanager
+async def get_async_session_ctx() -> AsyncIterator[AsyncSession]:
+    """Context manager for getting async database session outside of FastAPI dependencies."""
+    async with AsyncSessionLocal() as session:
+        try:
+            yield session
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+
+
 def get_sync_session():
     """Get sync database session."""
     db = SessionLocal()
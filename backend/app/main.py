@@ -13,12 +13,9 @@ from app.bot.bot import setup_bot, bot, dp
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """FastAPI lifespan events."""
-    # Startup
-    await setup_bot()
-
-    # Start notification scheduler
+    # Startup: bot setup and notification scheduler are independent, run them concurrently
     from app.utils.scheduler import start_scheduler
-    await start_scheduler()
+    await asyncio.gather(setup_bot(), start_scheduler())
 
     # Start bot polling in background
     bot_task = asyncio.create_task(dp.start_polling(bot))
@@ -115,11 +112,24 @@ app.include_router(payments.router, tags=["payments"])
 app.include_router(notifications.router, prefix="/api", tags=["notifications"])
 
 
+def custom_openapi():
+    """Generate OpenAPI schema, attaching schema examples on first generation."""
+    if app.openapi_schema is None:
+        # Examples are only needed for docs, keep them out of import time
+        from app.schemas._examples import attach_schema_examples
+        attach_schema_examples()
+    return FastAPI.openapi(app)
+
+
+app.openapi = custom_openapi
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
         "app.main:app",
         host=settings.host,
         port=settings.port,
-        reload=settings.debug
+        reload=settings.debug,
+        loop="uvloop"
     )
\ No newline at end of file
@@ -1,15 +1,24 @@
 """Authentication middleware and dependencies."""
 
 import logging
-from typing import Optional, List
+import random
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from datetime import datetime
+from functools import lru_cache
+from typing import AsyncIterator, Optional, List
 from fastapi import Depends, HTTPException, status, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_async_session
-from app.models.user import User, UserRole
-from app.services.auth import AuthService, AuthenticationError, AuthorizationError
-from app.utils.security import rate_limiter
+from app.models.base import request_now
+from app.models.user import (
+    User, UserRole, ORDER_CREATE, ORDER_UPDATE, ORDER_VIEW_ALL, PRODUCT_CREATE, PRODUCT_DELETE, PRODUCT_UPDATE
+)
+from app.services.auth import auth_service, AuthenticationError, AuthorizationError
+from app.utils.security import redis_rate_limiter, bucket_rate_limiter
 
 
 logger = logging.getLogger(__name__)
@@ -18,6 +27,100 @@ logger = logging.getLogger(__name__)
 security = HTTPBearer(auto_error=False)
 
 
+class AdmissionController:
+    """
+    AIMD concurrency limit for authenticated requests.
+
+    The limit grows additively while responses are fast and is halved on
+    upstream errors or when average latency exceeds the target.
+    """
+
+    MIN_CONCURRENCY = 4
+    MAX_CONCURRENCY = 256
+    TARGET_LATENCY = 0.5  # seconds
+    INCREASE_STEP = 0.5
+    DECREASE_FACTOR = 0.5
+    DECREASE_INTERVAL = 1.0  # seconds between two decreases
+    # Rate limit 429s are per client and say nothing about server load
+    OVERLOAD_STATUSES = frozenset({502, 504})
+
+    def __init__(self, window: int = 128):
+        """Initialize admission controller."""
+        self.limit = float(self.MAX_CONCURRENCY)
+        self.in_flight = 0
+        self._latencies = deque(maxlen=window)
+        self._last_decrease = 0.0
+
+    def record(self, status_code: int, elapsed: float) -> None:
+        """Adjust concurrency limit with a response status and latency."""
+        self._latencies.append(elapsed)
+        mean_latency = sum(self._latencies) / len(self._latencies)
+
+        if status_code in self.OVERLOAD_STATUSES or mean_latency > self.TARGET_LATENCY:
+            now = time.monotonic()
+            if now - self._last_decrease >= self.DECREASE_INTERVAL:
+                self.limit = max(self.MIN_CONCURRENCY, self.limit * self.DECREASE_FACTOR)
+                self._last_decrease = now
+        else:
+            self.limit = min(self.MAX_CONCURRENCY, self.limit + self.INCREASE_STEP)
+
+    @asynccontextmanager
+    async def admit(self) -> AsyncIterator[None]:
+        """Admit request or reject it with 503 if the concurrency limit is reached."""
+        if self.in_flight >= int(self.limit):
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Service is overloaded, retry later",
+                # Jitter spreads the retries of rejected clients
+                headers={"Retry-After": str(random.randint(1, 5))}
+            )
+
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+
+
+admission_controller = AdmissionController()
+
+MANAGER_ROLES = frozenset({UserRole.ADMIN, UserRole.MANAGER})
+
+# Prebuilt responses for denied requests; raised via with_traceback(None)
+# so a reused instance does not keep growing its traceback
+_EXC_401 = HTTPException(
+    status_code=status.HTTP_401_UNAUTHORIZED,
+    detail="Authentication required",
+    headers={"WWW-Authenticate": "Bearer"},
+)
+_EXC_401_INVALID_TOKEN = HTTPException(
+    status_code=status.HTTP_401_UNAUTHORIZED,
+    detail="Invalid or expired token",
+    headers={"WWW-Authenticate": "Bearer"},
+)
+_EXC_403_ADMIN = HTTPException(
+    status_code=status.HTTP_403_FORBIDDEN,
+    detail="Admin access required"
+)
+_EXC_403_MANAGER = HTTPException(
+    status_code=status.HTTP_403_FORBIDDEN,
+    detail="Manager or admin access required"
+)
+
+
+@lru_cache(maxsize=256)
+def _exc_429(retry_after: int, remaining: int) -> HTTPException:
+    """Get rate limit exception for given Retry-After and remaining attempts."""
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail="Rate limit exceeded",
+        headers={
+            "Retry-After": str(retry_after),
+            "X-RateLimit-Remaining": str(remaining)
+        }
+    )
+
+
 class AuthMiddleware:
     """Authentication middleware for FastAPI dependencies."""
 
@@ -34,10 +137,8 @@ class AuthMiddleware:
         if not credentials:
             return None
 
-        auth_service = AuthService(db)
-
         try:
-            user = await auth_service.get_current_user(credentials.credentials)
+            user = await auth_service.get_current_user(db, credentials.credentials)
             if user:
                 # Add user info to request state for logging
                 request.state.user_id = user.id
@@ -58,41 +159,35 @@ class AuthMiddleware:
         Raises HTTPException if not authenticated.
         """
         if not credentials:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Authentication required",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
+            raise _EXC_401.with_traceback(None)
 
-        auth_service = AuthService(db)
+        # Shed load before touching Redis or the database when overloaded
+        async with admission_controller.admit():
+            try:
+                user = await auth_service.get_current_user(db, credentials.credentials)
+                if not user:
+                    raise _EXC_401_INVALID_TOKEN.with_traceback(None)
 
-        try:
-            user = await auth_service.get_current_user(credentials.credentials)
-            if not user:
+                # Add user info to request state
+                request.state.user_id = user.id
+                request.state.user_role = user.role.value
+
+                return user
+
+            except HTTPException:
+                raise
+            except AuthenticationError as e:
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Invalid or expired token",
+                    detail=str(e),
                     headers={"WWW-Authenticate": "Bearer"},
                 )
-
-            # Add user info to request state
-            request.state.user_id = user.id
-            request.state.user_role = user.role.value
-
-            return user
-
-        except AuthenticationError as e:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail=str(e),
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-        except Exception as e:
-            logger.error(f"Authentication error: {str(e)}")
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Authentication service error"
-            )
+            except Exception as e:
+                logger.error(f"Authentication error: {str(e)}")
+                raise HTTPException(
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail="Authentication service error"
+                )
 
     @staticmethod
     def require_roles(allowed_roles: List[UserRole]):
@@ -105,20 +200,24 @@ class AuthMiddleware:
         Returns:
             FastAPI dependency function
         """
+        # Computed once per dependency instead of on every request
+        allowed_set = frozenset(allowed_roles)
+        allowed_values = [r.value for r in allowed_roles]
+        denied = HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=f"Access denied. Required roles: {allowed_values}"
+        )
+
         async def role_dependency(
             request: Request,
-            user: User = Depends(AuthMiddleware.require_authenticated_user),
-            db: AsyncSession = Depends(get_async_session)
+            user: User = Depends(AuthMiddleware.require_authenticated_user)
         ) -> User:
-            if user.role not in allowed_roles:
+            if user.role not in allowed_set:
                 logger.warning(
                     f"User {user.id} with role {user.role.value} "
-                    f"attempted to access endpoint requiring {[r.value for r in allowed_roles]}"
-                )
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail=f"Access denied. Required roles: {[r.value for r in allowed_roles]}"
+                    f"attempted to access endpoint requiring {allowed_values}"
                 )
+                raise denied.with_traceback(None)
             return user
 
         return role_dependency
@@ -134,16 +233,16 @@ class AuthMiddleware:
         Returns:
             FastAPI dependency function
         """
+        required_permissions = tuple(required_permissions)
+
         async def permission_dependency(
             request: Request,
-            user: User = Depends(AuthMiddleware.require_authenticated_user),
-            db: AsyncSession = Depends(get_async_session)
+            user: User = Depends(AuthMiddleware.require_authenticated_user)
         ) -> User:
-            auth_service = AuthService(db)
-
-            # Check all required permissions
-            for permission in required_permissions:
-                if not await auth_service.check_permission(user, permission):
+            # Check all required permissions in one call
+            granted = await auth_service.check_permissions(user, required_permissions)
+            for permission, allowed in granted.items():
+                if not allowed:
                     logger.warning(
                         f"User {user.id} with role {user.role.value} "
                         f"attempted to access endpoint requiring permission: {permission}"
@@ -160,42 +259,37 @@ class AuthMiddleware:
     @staticmethod
     async def require_admin_user(
         request: Request,
-        user: User = Depends(require_authenticated_user),
-        db: AsyncSession = Depends(get_async_session)
+        user: User = Depends(require_authenticated_user)
     ) -> User:
         """
         Require admin user.
         """
         if user.role != UserRole.ADMIN:
             logger.warning(f"Non-admin user {user.id} attempted to access admin endpoint")
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Admin access required"
-            )
+            raise _EXC_403_ADMIN.with_traceback(None)
         return user
 
     @staticmethod
     async def require_manager_or_admin(
         request: Request,
-        user: User = Depends(require_authenticated_user),
-        db: AsyncSession = Depends(get_async_session)
+        user: User = Depends(require_authenticated_user)
     ) -> User:
         """
         Require manager or admin user.
         """
-        if user.role not in [UserRole.ADMIN, UserRole.MANAGER]:
+        if user.role not in MANAGER_ROLES:
             logger.warning(f"User {user.id} with insufficient privileges attempted to access manager endpoint")
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Manager or admin access required"
-            )
+            raise _EXC_403_MANAGER.with_traceback(None)
         return user
 
     @staticmethod
     def rate_limit_dependency(
         max_attempts: int = 60,
         window_minutes: int = 1,
-        key_func=lambda request: request.client.host
+        key_func=lambda request: request.client.host,
+        sliding_window: bool = False,
+        in_memory: bool = False,
+        scope: str = "api"
     ):
         """
         Create rate limiting dependency.
@@ -204,31 +298,38 @@ class AuthMiddleware:
             max_attempts: Maximum attempts per window
             window_minutes: Time window in minutes
             key_func: Function to extract rate limit key from request
+            sliding_window: Count attempts in an exact sliding window
+            in_memory: Count attempts per worker process instead of in Redis
+            scope: Key prefix, limiters with different windows must not share it
 
         Returns:
             FastAPI dependency function
         """
+        retry_after = window_minutes * 60
+
         async def rate_limit_check(request: Request):
             key = key_func(request)
             if not key:
                 return
+            key = f"{scope}:{key}"
 
-            check = rate_limiter.is_allowed(
-                f"api:{key}",
-                max_attempts=max_attempts,
-                window_minutes=window_minutes
-            )
+            if in_memory:
+                check = await bucket_rate_limiter.is_allowed(
+                    key,
+                    max_attempts=max_attempts,
+                    window_minutes=window_minutes
+                )
+            else:
+                check = await redis_rate_limiter.is_allowed(
+                    key,
+                    max_attempts=max_attempts,
+                    window_minutes=window_minutes,
+                    sliding_window=sliding_window
+                )
 
             if not check["allowed"]:
                 logger.warning(f"Rate limit exceeded for key: {key}")
-                raise HTTPException(
-                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                    detail="Rate limit exceeded",
-                    headers={
-                        "Retry-After": str(window_minutes * 60),
-                        "X-RateLimit-Remaining": str(check["remaining"])
-                    }
-                )
+                raise _exc_429(retry_after, check["remaining"]).with_traceback(None)
 
             # Add rate limit info to response headers
             request.state.rate_limit_remaining = check["remaining"]
@@ -249,27 +350,32 @@ require_manager = AuthMiddleware.require_roles([UserRole.ADMIN, UserRole.MANAGER
 require_user = AuthMiddleware.require_roles([UserRole.ADMIN, UserRole.MANAGER, UserRole.USER])
 
 # Permission-based dependencies
-require_product_write = AuthMiddleware.require_permissions(["product:create", "product:update", "product:delete"])
-require_order_read = AuthMiddleware.require_permissions(["order:view_all"])
-require_order_write = AuthMiddleware.require_permissions(["order:create", "order:update"])
+require_product_write = AuthMiddleware.require_permissions([PRODUCT_CREATE, PRODUCT_UPDATE, PRODUCT_DELETE])
+require_order_read = AuthMiddleware.require_permissions([ORDER_VIEW_ALL])
+require_order_write = AuthMiddleware.require_permissions([ORDER_CREATE, ORDER_UPDATE])
 
 # Rate limiting dependencies
 auth_rate_limit = AuthMiddleware.rate_limit_dependency(
     max_attempts=10,
     window_minutes=15,
-    key_func=lambda req: req.client.host
+    key_func=lambda req: req.client.host,
+    sliding_window=True,
+    scope="auth"
 )
 
 api_rate_limit = AuthMiddleware.rate_limit_dependency(
     max_attempts=100,
     window_minutes=1,
-    key_func=lambda req: req.client.host
+    key_func=lambda req: req.client.host,
+    in_memory=True
 )
 
 strict_rate_limit = AuthMiddleware.rate_limit_dependency(
     max_attempts=5,
     window_minutes=5,
-    key_func=lambda req: req.client.host
+    key_func=lambda req: req.client.host,
+    sliding_window=True,
+    scope="strict"
 )
 
 
@@ -278,28 +384,27 @@ class SecurityHeadersMiddleware:
 
     def __init__(self, app):
         self.app = app
+        # ASGI header names are lowercase bytes
+        self._static_headers = (
+            (b"x-content-type-options", b"nosniff"),
+            (b"x-frame-options", b"DENY"),
+            (b"x-xss-protection", b"1; mode=block"),
+            (b"strict-transport-security", b"max-age=31536000; includeSubDomains"),
+            (b"referrer-policy", b"strict-origin-when-cross-origin"),
+            (b"content-security-policy", b"default-src 'self'"),
+        )
 
     async def __call__(self, scope, receive, send):
         async def send_wrapper(message):
             if message["type"] == "http.response.start":
-                headers = dict(message.get("headers", []))
-
-                # Add security headers
-                security_headers = {
-                    b"X-Content-Type-Options": b"nosniff",
-                    b"X-Frame-Options": b"DENY",
-                    b"X-XSS-Protection": b"1; mode=block",
-                    b"Strict-Transport-Security": b"max-age=31536000; includeSubDomains",
-                    b"Referrer-Policy": b"strict-origin-when-cross-origin",
-                    b"Content-Security-Policy": b"default-src 'self'",
-                }
-
-                for header, value in security_headers.items():
-                    if header not in headers:
-                        headers[header] = value
+                headers = list(message.get("headers", []))
+                present = {name.lower() for name, _ in headers}
 
-                # Convert headers back to list format
-                message["headers"] = [(k, v) for k, v in headers.items()]
+                # Add security headers the response didn't set itself
+                headers.extend(
+                    header for header in self._static_headers if header[0] not in present
+                )
+                message["headers"] = headers
 
             await send(message)
 
@@ -319,43 +424,55 @@ class AuditLogMiddleware:
             await self.app(scope, receive, send)
             return
 
-        request = Request(scope, receive)
+        path = scope.get("path", "")
+        is_auth_path = path.startswith("/api/auth/")
+        started_at = time.perf_counter()
+        # One clock read per request for lockout and login time checks
+        now_token = request_now.set(datetime.utcnow())
 
         async def send_wrapper(message):
             if message["type"] == "http.response.start":
-                # Log authentication events
-                await self._log_auth_event(request, message.get("status", 500))
+                status_code = message.get("status", 500)
+                admission_controller.record(status_code, time.perf_counter() - started_at)
+
+                # Only auth endpoints and denied requests are logged, build the request just for them
+                if is_auth_path or status_code in (401, 403):
+                    await self._log_auth_event(Request(scope), path, is_auth_path, status_code)
 
             await send(message)
 
-        await self.app(scope, receive, send_wrapper)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_now.reset(now_token)
 
-    async def _log_auth_event(self, request: Request, status_code: int):
+    async def _log_auth_event(self, request: Request, path: str, is_auth_path: bool, status_code: int):
         """Log authentication-related events."""
-        path = request.url.path
-
         # Log auth endpoints
-        if path.startswith("/api/auth/"):
-            user_id = getattr(request.state, "user_id", None)
-            user_role = getattr(request.state, "user_role", None)
-            client_ip = request.client.host
+        if is_auth_path:
+            if not self.audit_logger.isEnabledFor(logging.INFO):
+                return
 
             self.audit_logger.info(
-                f"AUTH {request.method} {path} - "
-                f"Status: {status_code} - "
-                f"IP: {client_ip} - "
-                f"User: {user_id} - "
-                f"Role: {user_role}"
+                "AUTH %s %s - Status: %d - IP: %s - User: %s - Role: %s",
+                request.method,
+                path,
+                status_code,
+                request.client.host,
+                getattr(request.state, "user_id", None),
+                getattr(request.state, "user_role", None)
             )
 
         # Log failed authorization attempts
-        elif status_code in [401, 403]:
-            user_id = getattr(request.state, "user_id", None)
-            client_ip = request.client.host
+        else:
+            if not self.audit_logger.isEnabledFor(logging.WARNING):
+                return
 
             self.audit_logger.warning(
-                f"ACCESS_DENIED {request.method} {path} - "
-                f"Status: {status_code} - "
-                f"IP: {client_ip} - "
-                f"User: {user_id}"
+                "ACCESS_DENIED %s %s - Status: %d - IP: %s - User: %s",
+                request.method,
+                path,
+                status_code,
+                request.client.host,
+                getattr(request.state, "user_id", None)
             )
\ No newline at end of file
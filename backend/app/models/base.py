@@ -1,9 +1,13 @@
 """Base model with common fields."""
 
+from contextvars import ContextVar
 from datetime import datetime
-from typing import Any
+from enum import Enum
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Type
 
-from sqlalchemy import Column, Integer, DateTime, Boolean
+from sqlalchemy import Column, Integer, DateTime, Boolean, String
+from sqlalchemy.types import TypeDecorator
 from sqlalchemy.ext.declarative import as_declarative, declared_attr
 
 
@@ -17,6 +21,52 @@ class Base:
         return cls.__name__.lower()
 
 
+# Time of the HTTP request being served, set once by AuditLogMiddleware
+request_now: ContextVar[Optional[datetime]] = ContextVar("request_now", default=None)
+
+
+def utcnow() -> datetime:
+    """Get current UTC time, reusing the request time when serving a request."""
+    return request_now.get() or datetime.utcnow()
+
+
+def enum_values(enum_cls: Type[Enum]) -> List[str]:
+    """Get member values of enum, used to store values instead of names."""
+    return [member.value for member in enum_cls]
+
+
+class FastEnum(TypeDecorator):
+    """Enum stored as its value in VARCHAR, converted back with a plain dict lookup."""
+
+    impl = String
+    cache_ok = True
+
+    def __init__(self, enum_cls: Type[Enum], length: int = 20):
+        super().__init__(length=length)
+        self.enum_cls = enum_cls
+        self._by_value: Dict[str, Enum] = {member.value: member for member in enum_cls}
+
+    def process_bind_param(self, value: Any, dialect) -> Optional[str]:
+        if value is None or isinstance(value, str):
+            return value
+        return value.value
+
+    def process_result_value(self, value: Optional[str], dialect) -> Optional[Enum]:
+        if value is None:
+            return None
+        return self._by_value[value]
+
+    @property
+    def python_type(self) -> Type[Enum]:
+        return self.enum_cls
+
+
+@lru_cache(maxsize=4096)
+def format_rub(amount: int) -> str:
+    """Format whole rubles amount, shared by price properties of all rows."""
+    return f"{amount}₽"
+
+
 class BaseModel(Base):
     """Base model with common fields."""
     __abstract__ = True
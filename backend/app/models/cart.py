@@ -1,10 +1,13 @@
 """Shopping cart models."""
 
-from sqlalchemy import Column, Integer, ForeignKey, DateTime
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, Numeric, Index, event, func, inspect, select, text, update
+from sqlalchemy.orm import Session, object_session, relationship
+from sqlalchemy.orm.util import identity_key
 from datetime import datetime
+from decimal import Decimal
 
 from .base import BaseModel
+from .product import Product
 
 
 class Cart(BaseModel):
@@ -14,6 +17,10 @@ class Cart(BaseModel):
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     expires_at = Column(DateTime, nullable=True)
 
+    # Denormalized totals, kept in sync by CartItem mapper events
+    total_amount_cached = Column(Numeric(12, 2), default=0, nullable=False)
+    total_items_cached = Column(Integer, default=0, nullable=False)
+
     # Relationships
     user = relationship("User", back_populates="carts")
     items = relationship("CartItem", back_populates="cart", cascade="all, delete-orphan")
@@ -22,14 +29,16 @@ class Cart(BaseModel):
         return f"Cart(user_id={self.user_id}, items_count={len(self.items)})"
 
     @property
-    def total_amount(self) -> float:
-        """Calculate total cart amount."""
-        return sum(item.total_price for item in self.items if not item.is_deleted)
+    def total_amount(self) -> Decimal:
+        """Get total cart amount."""
+        if self.total_amount_cached is None:
+            return Decimal("0.00")
+        return self.total_amount_cached
 
     @property
     def total_items(self) -> int:
         """Get total items count."""
-        return sum(item.quantity for item in self.items if not item.is_deleted)
+        return self.total_items_cached or 0
 
     def is_expired(self) -> bool:
         """Check if cart is expired."""
@@ -41,6 +50,10 @@ class Cart(BaseModel):
 class CartItem(BaseModel):
     """Cart item."""
     __tablename__ = "cart_items"
+    __table_args__ = (
+        # Active items of a cart, used to recalculate cart totals
+        Index('ix_cart_items_cart_notdel', 'cart_id', postgresql_where=text("is_deleted = false")),
+    )
 
     cart_id = Column(Integer, ForeignKey("carts.id"), nullable=False)
     product_id = Column(Integer, ForeignKey("products.id"), nullable=False)
@@ -56,4 +69,71 @@ class CartItem(BaseModel):
     @property
     def total_price(self) -> float:
         """Calculate total price for this item."""
-        return self.product.price * self.quantity if self.product else 0
\ No newline at end of file
+        return self.product.price * self.quantity if self.product else 0
+
+
+def cart_totals_update():
+    """Build UPDATE recalculating denormalized totals of the carts it is filtered to."""
+    carts = Cart.__table__
+    items = CartItem.__table__
+    products = Product.__table__
+    active_items = (items.c.cart_id == carts.c.id) & (items.c.is_deleted == False)
+
+    total_amount = (
+        select(func.coalesce(func.sum(items.c.quantity * products.c.price), 0))
+        .select_from(items.join(products, products.c.id == items.c.product_id))
+        .where(active_items)
+        .scalar_subquery()
+    )
+    total_items = (
+        select(func.coalesce(func.sum(items.c.quantity), 0))
+        .where(active_items)
+        .scalar_subquery()
+    )
+
+    return update(carts).values(total_amount_cached=total_amount, total_items_cached=total_items)
+
+
+def carts_with_product(product_id: int):
+    """Select IDs of carts holding an active item of the product."""
+    items = CartItem.__table__
+    return select(items.c.cart_id).where(
+        items.c.product_id == product_id,
+        items.c.is_deleted == False
+    )
+
+
+def _mark_stale_carts(target, cart_ids) -> None:
+    """Remember carts whose totals changed behind the session's back."""
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault("stale_cart_ids", set()).update(cart_ids)
+
+
+@event.listens_for(CartItem, "after_insert")
+@event.listens_for(CartItem, "after_update")
+@event.listens_for(CartItem, "after_delete")
+def _refresh_cart_totals(mapper, connection, target: CartItem) -> None:
+    """Recalculate denormalized cart totals with a single UPDATE."""
+    connection.execute(cart_totals_update().where(Cart.__table__.c.id == target.cart_id))
+    _mark_stale_carts(target, (target.cart_id,))
+
+
+@event.listens_for(Product, "after_update")
+def _refresh_product_cart_totals(mapper, connection, target: Product) -> None:
+    """Recalculate totals of carts holding the product when its price changes."""
+    if not inspect(target).attrs.price.history.has_changes():
+        return
+    cart_ids = connection.execute(carts_with_product(target.id)).scalars().all()
+    if cart_ids:
+        connection.execute(cart_totals_update().where(Cart.__table__.c.id.in_(cart_ids)))
+        _mark_stale_carts(target, cart_ids)
+
+
+@event.listens_for(Session, "after_flush_postexec")
+def _expire_stale_carts(session, flush_context) -> None:
+    """Expire cached totals of loaded carts updated by the listeners above."""
+    for cart_id in session.info.pop("stale_cart_ids", ()):
+        cart = session.identity_map.get(identity_key(Cart, cart_id))
+        if cart is not None:
+            session.expire(cart, ["total_amount_cached", "total_items_cached"])
@@ -2,14 +2,15 @@
 
 from enum import Enum
 from datetime import datetime
-from typing import Optional, Dict, Any
-from sqlalchemy import Column, String, Text, Integer, BigInteger, ForeignKey, Enum as SQLEnum, Boolean, JSON
+from typing import Optional, Dict, Any, Sequence
+from sqlalchemy import Column, String, Text, Integer, BigInteger, ForeignKey, Enum as SQLEnum, Boolean, JSON, Index, text, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import relationship
 
 from .base import BaseModel
 
 
-class NotificationType(Enum):
+class NotificationType(str, Enum):
     """Notification type enum."""
     ORDER_CREATED = "order_created"
     ORDER_CONFIRMED = "order_confirmed"
@@ -25,7 +26,7 @@ class NotificationType(Enum):
     ADMIN_DAILY_STATS = "admin_daily_stats"
 
 
-class NotificationStatus(Enum):
+class NotificationStatus(str, Enum):
     """Notification status enum."""
     PENDING = "pending"
     SENT = "sent"
@@ -34,15 +35,54 @@ class NotificationStatus(Enum):
     SCHEDULED = "scheduled"
 
 
-class NotificationTarget(Enum):
+class NotificationTarget(str, Enum):
     """Notification target enum."""
     USER = "user"
     ADMIN = "admin"
 
 
+# Status flags: one lookup answers every is_*/should_retry check
+_MASK_SENT = 1
+_MASK_FAILED = 2
+_MASK_SCHEDULED = 4
+_MASK_RETRYABLE = 8
+
+_STATUS_MASK: Dict[NotificationStatus, int] = {
+    NotificationStatus.PENDING: 0,
+    NotificationStatus.SENT: _MASK_SENT,
+    NotificationStatus.DELIVERED: _MASK_SENT,
+    NotificationStatus.FAILED: _MASK_FAILED | _MASK_RETRYABLE,
+    NotificationStatus.SCHEDULED: _MASK_SCHEDULED,
+}
+
+RATING_EMOJI = {
+    1: "⭐",
+    2: "⭐⭐",
+    3: "⭐⭐⭐",
+    4: "⭐⭐⭐⭐",
+    5: "⭐⭐⭐⭐⭐"
+}
+
+RATING_TEXT = {
+    1: "Очень плохо",
+    2: "Плохо",
+    3: "Нормально",
+    4: "Хорошо",
+    5: "Отлично"
+}
+
+
 class Notification(BaseModel):
     """Notification model for tracking notification history."""
     __tablename__ = "notifications"
+    __table_args__ = (
+        # Failed notifications to retry
+        Index('ix_notif_status_retry', 'status', 'retry_count'),
+        # Notifications of a user by type
+        Index('ix_notif_user_type_sent', 'user_id', 'notification_type', 'sent_at'),
+        # Scheduler scan covers only notifications still waiting to be sent
+        Index('ix_notif_scheduled', 'scheduled_at', postgresql_where=text("status = 'SCHEDULED'")),
+    )
 
     # Target information
     target_type = Column(SQLEnum(NotificationTarget), nullable=False)
@@ -79,25 +119,41 @@ class Notification(BaseModel):
     def __str__(self) -> str:
         return f"Notification(id={self.id}, type={self.notification_type.value}, status={self.status.value})"
 
+    @property
+    def _flags(self) -> int:
+        """Get status flags of notification."""
+        return _STATUS_MASK.get(self.status, 0)
+
     @property
     def is_sent(self) -> bool:
         """Check if notification was sent."""
-        return self.status in [NotificationStatus.SENT, NotificationStatus.DELIVERED]
+        return bool(self._flags & _MASK_SENT)
 
     @property
     def is_failed(self) -> bool:
         """Check if notification failed."""
-        return self.status == NotificationStatus.FAILED
+        return bool(self._flags & _MASK_FAILED)
 
     @property
     def is_scheduled(self) -> bool:
         """Check if notification is scheduled."""
-        return self.status == NotificationStatus.SCHEDULED and self.scheduled_at is not None
+        return bool(self._flags & _MASK_SCHEDULED) and self.scheduled_at is not None
 
     @property
     def should_retry(self) -> bool:
         """Check if notification should be retried."""
-        return self.status == NotificationStatus.FAILED and self.retry_count < 3
+        return bool(self._flags & _MASK_RETRYABLE) and self.retry_count < 3
+
+    @classmethod
+    async def mark_sent_bulk(cls, session: AsyncSession, ids: Sequence[int]) -> None:
+        """Mark notifications as sent with a single UPDATE."""
+        if not ids:
+            return
+        await session.execute(
+            update(cls)
+            .where(cls.id.in_(ids))
+            .values(status=NotificationStatus.SENT, sent_at=datetime.utcnow())
+        )
 
 
 class NotificationTemplate(BaseModel):
@@ -150,23 +206,9 @@ class FeedbackRating(BaseModel):
     @property
     def rating_emoji(self) -> str:
         """Get emoji representation of rating."""
-        emoji_map = {
-            1: "⭐",
-            2: "⭐⭐",
-            3: "⭐⭐⭐",
-            4: "⭐⭐⭐⭐",
-            5: "⭐⭐⭐⭐⭐"
-        }
-        return emoji_map.get(self.rating, "❓")
+        return RATING_EMOJI.get(self.rating, "❓")
 
     @property
     def rating_text(self) -> str:
         """Get text representation of rating."""
-        rating_map = {
-            1: "Очень плохо",
-            2: "Плохо",
-            3: "Нормально",
-            4: "Хорошо",
-            5: "Отлично"
-        }
-        return rating_map.get(self.rating, "Неизвестно")
\ No newline at end of file
+        return RATING_TEXT.get(self.rating, "Неизвестно")
\ No newline at end of file
@@ -3,10 +3,12 @@
 from enum import Enum
 from datetime import datetime, timedelta
 from typing import Dict, Optional, List
-from sqlalchemy import Column, String, Text, Integer, Float, ForeignKey, Enum as SQLEnum, DateTime, Boolean, JSON
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, Text, Integer, Float, ForeignKey, DateTime, Boolean, JSON, Index, CheckConstraint, Computed, event, func, select, text, update
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.mutable import MutableDict
+from sqlalchemy.orm import relationship, with_loader_criteria
 
-from .base import BaseModel
+from .base import BaseModel, FastEnum, enum_values, format_rub
 
 
 class OrderStatus(Enum):
@@ -21,6 +23,24 @@ class OrderStatus(Enum):
     FAILED = "failed"           # Неудачный
 
 
+ORDER_STATUS_DISPLAY: Dict[OrderStatus, str] = {
+    OrderStatus.PENDING: "Ожидает подтверждения",
+    OrderStatus.CONFIRMED: "Подтвержден",
+    OrderStatus.PREPARING: "Готовится",
+    OrderStatus.READY: "Готов к выдаче",
+    OrderStatus.COMPLETED: "Выполнен",
+    OrderStatus.CANCELLED: "Отменен",
+    OrderStatus.REFUNDED: "Возврат средств",
+    OrderStatus.FAILED: "Ошибка обработки"
+}
+
+# Status groups for the state properties of Order
+_ACTIVE_STATUSES = frozenset({OrderStatus.PENDING, OrderStatus.CONFIRMED, OrderStatus.PREPARING, OrderStatus.READY})
+_FINAL_STATUSES = frozenset({OrderStatus.COMPLETED, OrderStatus.CANCELLED, OrderStatus.FAILED, OrderStatus.REFUNDED})
+_CANCELLABLE_STATUSES = frozenset({OrderStatus.PENDING, OrderStatus.CONFIRMED, OrderStatus.PREPARING})
+_REFUNDABLE_STATUSES = frozenset({OrderStatus.COMPLETED, OrderStatus.CANCELLED})
+
+
 class OrderPriority(Enum):
     """Order priority levels."""
     LOW = "low"
@@ -29,14 +49,41 @@ class OrderPriority(Enum):
     VIP = "vip"
 
 
+ORDER_PRIORITY_DISPLAY: Dict[OrderPriority, str] = {
+    OrderPriority.LOW: "Низкий",
+    OrderPriority.NORMAL: "Обычный",
+    OrderPriority.HIGH: "Высокий",
+    OrderPriority.VIP: "VIP"
+}
+
+
+def _status_timestamp_property(status: OrderStatus) -> property:
+    """Create attribute for the time order entered status, kept in status_timestamps."""
+    def getter(self) -> Optional[datetime]:
+        return self.get_status_timestamp(status)
+
+    def setter(self, value: Optional[datetime]) -> None:
+        self.set_status_timestamp(status, value)
+
+    return property(getter, setter, doc=f"Time order became {status.value}")
+
+
 class Order(BaseModel):
     """Enhanced order model with status management."""
     __tablename__ = "orders"
 
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    status = Column(SQLEnum(OrderStatus), default=OrderStatus.PENDING, nullable=False)
+    status = Column(
+        FastEnum(OrderStatus),
+        default=OrderStatus.PENDING,
+        nullable=False
+    )
     total_amount = Column(Float, nullable=False)
 
+    # Denormalized item aggregates, kept in sync by OrderItem mapper events
+    items_count = Column(Integer, default=0, nullable=False, comment="Number of order item rows")
+    items_subtotal = Column(Float, default=0, nullable=False, comment="Sum of price * quantity over items")
+
     # Customer contact info
     customer_name = Column(String(255), nullable=False)
     customer_phone = Column(String(20), nullable=False)
@@ -47,7 +94,11 @@ class Order(BaseModel):
     payment_method = Column(String(50), default="card", nullable=False)
 
     # Enhanced fields for status management
-    priority = Column(SQLEnum(OrderPriority), default=OrderPriority.NORMAL, nullable=False)
+    priority = Column(
+        FastEnum(OrderPriority),
+        default=OrderPriority.NORMAL,
+        nullable=False
+    )
     estimated_preparation_time = Column(Integer, nullable=True, comment="Estimated preparation time in minutes")
     estimated_delivery_time = Column(DateTime, nullable=True)
     actual_preparation_start = Column(DateTime, nullable=True)
@@ -55,13 +106,20 @@ class Order(BaseModel):
     delivery_scheduled_at = Column(DateTime, nullable=True)
     delivery_completed_at = Column(DateTime, nullable=True)
 
-    # Status timestamps
-    status_pending_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    status_confirmed_at = Column(DateTime, nullable=True)
-    status_preparing_at = Column(DateTime, nullable=True)
-    status_ready_at = Column(DateTime, nullable=True)
-    status_completed_at = Column(DateTime, nullable=True)
-    status_cancelled_at = Column(DateTime, nullable=True)
+    # Status timestamps as {status value: ISO datetime}; one column instead
+    # of a mostly NULL timestamp column per status
+    status_timestamps = Column(
+        MutableDict.as_mutable(JSON().with_variant(JSONB(), "postgresql")),
+        default=dict,
+        server_default=text("'{}'"),
+        nullable=False
+    )
+    status_pending_at = _status_timestamp_property(OrderStatus.PENDING)
+    status_confirmed_at = _status_timestamp_property(OrderStatus.CONFIRMED)
+    status_preparing_at = _status_timestamp_property(OrderStatus.PREPARING)
+    status_ready_at = _status_timestamp_property(OrderStatus.READY)
+    status_completed_at = _status_timestamp_property(OrderStatus.COMPLETED)
+    status_cancelled_at = _status_timestamp_property(OrderStatus.CANCELLED)
 
     # Kitchen integration
     kitchen_notes = Column(Text, nullable=True)
@@ -78,74 +136,104 @@ class Order(BaseModel):
     refund_amount = Column(Float, nullable=True)
     refund_reason = Column(String(255), nullable=True)
 
-    # Business metrics
-    preparation_duration = Column(Integer, nullable=True, comment="Actual preparation time in minutes")
-    total_duration = Column(Integer, nullable=True, comment="Total order completion time in minutes")
+    # Business metrics, generated by the database from the timestamps above
+    preparation_duration = Column(
+        Integer,
+        Computed(
+            "CAST(FLOOR(EXTRACT(EPOCH FROM (actual_preparation_end - actual_preparation_start)) / 60) AS INTEGER)",
+            persisted=True
+        ),
+        nullable=True,
+        comment="Actual preparation time in minutes"
+    )
+    total_duration = Column(
+        Integer,
+        Computed(
+            "CAST(FLOOR(EXTRACT(EPOCH FROM (jsonb_timestamp(status_timestamps, 'completed') - created_at)) / 60) AS INTEGER)",
+            persisted=True
+        ),
+        nullable=True,
+        comment="Total order completion time in minutes"
+    )
 
     # Metadata for automation
-    automation_flags = Column(JSON, default=dict, nullable=False)
-    workflow_metadata = Column(JSON, default=dict, nullable=False)
+    # MutableDict tracks in-place changes, so set_* helpers are persisted
+    automation_flags = Column(MutableDict.as_mutable(JSON), default=dict, nullable=False)
+    workflow_metadata = Column(MutableDict.as_mutable(JSON), default=dict, nullable=False)
 
     # Relationships
-    user = relationship("User", back_populates="orders")
-    items = relationship("OrderItem", back_populates="order", cascade="all, delete-orphan")
-    payment = relationship("Payment", back_populates="order", uselist=False, cascade="all, delete-orphan")
+    # items and payment are rendered with almost every order, so they are
+    # loaded in one batched SELECT per relationship instead of per order
+    user = relationship("User", back_populates="orders", foreign_keys=[user_id])
+    items = relationship("OrderItem", back_populates="order", cascade="all, delete-orphan", lazy="selectin")
+    payment = relationship("Payment", back_populates="order", uselist=False, cascade="all, delete-orphan", lazy="selectin")
     status_history = relationship("OrderStatusHistory", back_populates="order", cascade="all, delete-orphan")
     cancelled_by = relationship("User", foreign_keys=[cancelled_by_user_id])
 
+    # Database indexes for performance
+    __table_args__ = (
+        Index('ix_orders_user_status_created', 'user_id', 'is_deleted', 'status', text('created_at DESC')),
+        Index(
+            'ix_orders_user_pending', 'user_id', text('created_at DESC'),
+            postgresql_where=text("status = 'pending' AND is_deleted = false")
+        ),
+        # Orders by status, newest first (status listings, dashboard)
+        Index('ix_orders_status_created', 'status', 'created_at'),
+        # Active orders only; small because finished orders are excluded
+        Index(
+            'ix_orders_active', 'created_at',
+            postgresql_where=text(
+                "status IN ('pending', 'confirmed', 'preparing', 'ready') AND is_deleted = false"
+            )
+        ),
+        # Enum columns are plain VARCHAR holding enum values
+        CheckConstraint(
+            f"status IN ({', '.join(repr(v) for v in enum_values(OrderStatus))})",
+            name='ck_orders_status'
+        ),
+        CheckConstraint(
+            f"priority IN ({', '.join(repr(v) for v in enum_values(OrderPriority))})",
+            name='ck_orders_priority'
+        ),
+    )
+
     def __str__(self) -> str:
         return f"Order(id={self.id}, status={self.status.value}, total={self.total_amount})"
 
     @property
     def formatted_total(self) -> str:
         """Get formatted total amount."""
-        return f"{int(self.total_amount)}₽"
+        return format_rub(int(self.total_amount))
 
     @property
     def status_display(self) -> str:
         """Get human-readable status."""
-        status_map = {
-            OrderStatus.PENDING: "Ожидает подтверждения",
-            OrderStatus.CONFIRMED: "Подтвержден",
-            OrderStatus.PREPARING: "Готовится",
-            OrderStatus.READY: "Готов к выдаче",
-            OrderStatus.COMPLETED: "Выполнен",
-            OrderStatus.CANCELLED: "Отменен",
-            OrderStatus.REFUNDED: "Возврат средств",
-            OrderStatus.FAILED: "Ошибка обработки"
-        }
-        return status_map.get(self.status, self.status.value)
+        return ORDER_STATUS_DISPLAY.get(self.status, self.status.value)
 
     @property
     def priority_display(self) -> str:
         """Get human-readable priority."""
-        priority_map = {
-            OrderPriority.LOW: "Низкий",
-            OrderPriority.NORMAL: "Обычный",
-            OrderPriority.HIGH: "Высокий",
-            OrderPriority.VIP: "VIP"
-        }
-        return priority_map.get(self.priority, self.priority.value)
+        return ORDER_PRIORITY_DISPLAY.get(self.priority, self.priority.value)
 
     @property
     def is_active(self) -> bool:
         """Check if order is active (not completed, cancelled, failed, or refunded)."""
-        return self.status in [OrderStatus.PENDING, OrderStatus.CONFIRMED, OrderStatus.PREPARING, OrderStatus.READY]
+        return self.status in _ACTIVE_STATUSES
 
     @property
     def is_completed_state(self) -> bool:
         """Check if order is in a final state."""
-        return self.status in [OrderStatus.COMPLETED, OrderStatus.CANCELLED, OrderStatus.FAILED, OrderStatus.REFUNDED]
+        return self.status in _FINAL_STATUSES
 
     @property
     def can_be_cancelled(self) -> bool:
         """Check if order can be cancelled."""
-        return self.status in [OrderStatus.PENDING, OrderStatus.CONFIRMED, OrderStatus.PREPARING]
+        return self.status in _CANCELLABLE_STATUSES
 
     @property
     def can_be_refunded(self) -> bool:
         """Check if order can be refunded."""
-        return self.status in [OrderStatus.COMPLETED, OrderStatus.CANCELLED]
+        return self.status in _REFUNDABLE_STATUSES
 
     @property
     def delivery_type_display(self) -> str:
@@ -154,15 +242,23 @@ class Order(BaseModel):
 
     def get_status_timestamp(self, status: OrderStatus) -> Optional[datetime]:
         """Get timestamp for specific status."""
-        timestamp_map = {
-            OrderStatus.PENDING: self.status_pending_at,
-            OrderStatus.CONFIRMED: self.status_confirmed_at,
-            OrderStatus.PREPARING: self.status_preparing_at,
-            OrderStatus.READY: self.status_ready_at,
-            OrderStatus.COMPLETED: self.status_completed_at,
-            OrderStatus.CANCELLED: self.status_cancelled_at,
-        }
-        return timestamp_map.get(status)
+        value = (self.status_timestamps or {}).get(status.value)
+        if value:
+            return datetime.fromisoformat(value)
+        # Orders are created pending, so creation time is not duplicated in the map
+        if status == OrderStatus.PENDING:
+            return self.created_at
+        return None
+
+    def set_status_timestamp(self, status: OrderStatus, value: Optional[datetime]) -> None:
+        """Set timestamp for specific status."""
+        if self.status_timestamps is None:
+            self.status_timestamps = {}
+
+        if value is None:
+            self.status_timestamps.pop(status.value, None)
+        else:
+            self.status_timestamps[status.value] = value.isoformat()
 
     def get_estimated_completion_time(self) -> Optional[datetime]:
         """Calculate estimated completion time based on preparation time."""
@@ -202,8 +298,6 @@ class Order(BaseModel):
 
     def set_workflow_metadata_value(self, key: str, value):
         """Set value in workflow metadata."""
-        if self.workflow_metadata is None:
-            self.workflow_metadata = {}
         self.workflow_metadata[key] = value
 
     def get_automation_flag(self, flag: str, default: bool = False) -> bool:
@@ -212,8 +306,6 @@ class Order(BaseModel):
 
     def set_automation_flag(self, flag: str, value: bool):
         """Set automation flag value."""
-        if self.automation_flags is None:
-            self.automation_flags = {}
         self.automation_flags[flag] = value
 
 
@@ -228,7 +320,7 @@ class OrderItem(BaseModel):
 
     # Relationships
     order = relationship("Order", back_populates="items")
-    product = relationship("Product", back_populates="order_items")
+    product = relationship("Product", back_populates="order_items", lazy="selectin")
 
     def __str__(self) -> str:
         return f"OrderItem(product_id={self.product_id}, quantity={self.quantity}, price={self.price})"
@@ -241,9 +333,40 @@ class OrderItem(BaseModel):
     @property
     def formatted_price(self) -> str:
         """Get formatted price."""
-        return f"{int(self.price)}₽"
+        return format_rub(int(self.price))
 
     @property
     def formatted_total(self) -> str:
         """Get formatted total price."""
-        return f"{int(self.total_price)}₽"
\ No newline at end of file
+        return format_rub(int(self.total_price))
+
+
+# Loader option for queries loading Order.items, so soft-deleted items are
+# filtered by the database instead of being sent over and skipped in Python
+ACTIVE_ORDER_ITEMS = with_loader_criteria(OrderItem, lambda item: item.is_deleted == False, include_aliases=True)
+
+
+@event.listens_for(OrderItem, "after_insert")
+@event.listens_for(OrderItem, "after_update")
+@event.listens_for(OrderItem, "after_delete")
+def _refresh_order_item_totals(mapper, connection, target: OrderItem) -> None:
+    """Recalculate denormalized order item aggregates with a single UPDATE."""
+    items = OrderItem.__table__
+    active_items = (items.c.order_id == target.order_id) & (items.c.is_deleted == False)
+
+    items_count = (
+        select(func.count())
+        .where(active_items)
+        .scalar_subquery()
+    )
+    items_subtotal = (
+        select(func.coalesce(func.sum(items.c.quantity * items.c.price), 0))
+        .where(active_items)
+        .scalar_subquery()
+    )
+
+    connection.execute(
+        update(Order.__table__)
+        .where(Order.__table__.c.id == target.order_id)
+        .values(items_count=items_count, items_subtotal=items_subtotal)
+    )
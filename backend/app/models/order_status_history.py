@@ -1,9 +1,11 @@
 """Order status history model for audit trail."""
 
 from enum import Enum
-from datetime import datetime
-from typing import Optional, Dict, Any
-from sqlalchemy import Column, String, Text, Integer, Float, ForeignKey, DateTime, JSON
+from functools import lru_cache
+from typing import Optional, Dict, Any, List
+from sqlalchemy import Column, String, Text, Integer, Float, ForeignKey, DateTime, JSON, Index, cast, func, insert, select, text, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.mutable import MutableDict
 from sqlalchemy.orm import relationship
 
 from .base import BaseModel
@@ -26,11 +28,53 @@ class StatusChangeReason(Enum):
     CANCELLED_BY_CUSTOMER = "cancelled_by_customer"  # Customer cancelled
 
 
+STATUS_CHANGE_REASON_DISPLAY: Dict[StatusChangeReason, str] = {
+    StatusChangeReason.AUTOMATIC: "Автоматический переход",
+    StatusChangeReason.MANUAL_ADMIN: "Изменено администратором",
+    StatusChangeReason.PAYMENT_SUCCESS: "Оплата подтверждена",
+    StatusChangeReason.PAYMENT_FAILED: "Ошибка оплаты",
+    StatusChangeReason.CUSTOMER_REQUEST: "По запросу клиента",
+    StatusChangeReason.KITCHEN_READY: "Готово на кухне",
+    StatusChangeReason.DELIVERY_COMPLETED: "Доставка завершена",
+    StatusChangeReason.TIMEOUT: "Превышено время ожидания",
+    StatusChangeReason.ERROR: "Системная ошибка",
+    StatusChangeReason.REFUND_PROCESSED: "Возврат обработан",
+    StatusChangeReason.CANCELLED_BY_ADMIN: "Отменено администратором",
+    StatusChangeReason.CANCELLED_BY_CUSTOMER: "Отменено клиентом"
+}
+
+# Value lookups instead of Enum(value) calls for every rendered row
+_ORDER_STATUS_NAME_TITLE: Dict[str, str] = {
+    s.value: s.name.replace('_', ' ').title() for s in OrderStatus
+}
+_REASON_DISPLAY_BY_VALUE: Dict[str, str] = {
+    reason.value: display for reason, display in STATUS_CHANGE_REASON_DISPLAY.items()
+}
+
+
+@lru_cache(maxsize=1024)
+def _format_duration(minutes: int) -> str:
+    """Format minutes as duration, shared by all history rows with the same value."""
+    if minutes < 60:
+        return f"{minutes} мин."
+    hours, rest_minutes = divmod(minutes, 60)
+    if hours < 24:
+        return f"{hours} ч." if rest_minutes == 0 else f"{hours} ч. {rest_minutes} мин."
+    days, rest_hours = divmod(hours, 24)
+    return f"{days} д." if rest_hours == 0 else f"{days} д. {rest_hours} ч."
+
+
 class OrderStatusHistory(BaseModel):
     """Order status history for audit trail."""
     __tablename__ = "order_status_history"
+    __table_args__ = (
+        # Audit trail of an order in time order; also serves order_id lookups
+        Index('ix_history_order_changed', 'order_id', 'changed_at'),
+    )
+    # Read server generated changed_at back in the INSERT ... RETURNING
+    __mapper_args__ = {"eager_defaults": True}
 
-    order_id = Column(Integer, ForeignKey("orders.id"), nullable=False, index=True)
+    order_id = Column(Integer, ForeignKey("orders.id"), nullable=False)
 
     # Status change details
     from_status = Column(String(20), nullable=True)  # Previous status (null for first record)
@@ -39,14 +83,15 @@ class OrderStatusHistory(BaseModel):
     # Change metadata
     reason = Column(String(50), nullable=False, default=StatusChangeReason.MANUAL_ADMIN.value)
     changed_by_user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
-    changed_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+    # Generated by the database, no timestamp is sent with each inserted row
+    changed_at = Column(DateTime, server_default=text("timezone('utc', now())"), nullable=False, index=True)
 
     # Additional context
     notes = Column(Text, nullable=True)
     system_message = Column(Text, nullable=True)
 
     # Metadata for automation and workflow
-    workflow_data = Column(JSON, default=dict, nullable=False)
+    workflow_data = Column(MutableDict.as_mutable(JSON), default=dict, nullable=False)
     duration_from_previous = Column(Integer, nullable=True, comment="Duration from previous status in minutes")
 
     # Integration context
@@ -70,44 +115,17 @@ class OrderStatusHistory(BaseModel):
         if not self.from_status:
             return None
 
-        try:
-            status = OrderStatus(self.from_status)
-            return status.name.replace('_', ' ').title()
-        except ValueError:
-            return self.from_status
+        return _ORDER_STATUS_NAME_TITLE.get(self.from_status, self.from_status)
 
     @property
     def to_status_display(self) -> str:
         """Get human-readable to status."""
-        try:
-            status = OrderStatus(self.to_status)
-            return status.name.replace('_', ' ').title()
-        except ValueError:
-            return self.to_status
+        return _ORDER_STATUS_NAME_TITLE.get(self.to_status, self.to_status)
 
     @property
     def reason_display(self) -> str:
         """Get human-readable reason."""
-        reason_map = {
-            StatusChangeReason.AUTOMATIC: "Автоматический переход",
-            StatusChangeReason.MANUAL_ADMIN: "Изменено администратором",
-            StatusChangeReason.PAYMENT_SUCCESS: "Оплата подтверждена",
-            StatusChangeReason.PAYMENT_FAILED: "Ошибка оплаты",
-            StatusChangeReason.CUSTOMER_REQUEST: "По запросу клиента",
-            StatusChangeReason.KITCHEN_READY: "Готово на кухне",
-            StatusChangeReason.DELIVERY_COMPLETED: "Доставка завершена",
-            StatusChangeReason.TIMEOUT: "Превышено время ожидания",
-            StatusChangeReason.ERROR: "Системная ошибка",
-            StatusChangeReason.REFUND_PROCESSED: "Возврат обработан",
-            StatusChangeReason.CANCELLED_BY_ADMIN: "Отменено администратором",
-            StatusChangeReason.CANCELLED_BY_CUSTOMER: "Отменено клиентом"
-        }
-
-        try:
-            reason_enum = StatusChangeReason(self.reason)
-            return reason_map.get(reason_enum, self.reason)
-        except ValueError:
-            return self.reason
+        return _REASON_DISPLAY_BY_VALUE.get(self.reason, self.reason)
 
     @property
     def duration_display(self) -> Optional[str]:
@@ -115,21 +133,7 @@ class OrderStatusHistory(BaseModel):
         if not self.duration_from_previous:
             return None
 
-        minutes = self.duration_from_previous
-        if minutes < 60:
-            return f"{minutes} мин."
-        elif minutes < 1440:  # Less than 24 hours
-            hours = minutes // 60
-            remaining_minutes = minutes % 60
-            if remaining_minutes == 0:
-                return f"{hours} ч."
-            return f"{hours} ч. {remaining_minutes} мин."
-        else:  # More than 24 hours
-            days = minutes // 1440
-            remaining_hours = (minutes % 1440) // 60
-            if remaining_hours == 0:
-                return f"{days} д."
-            return f"{days} д. {remaining_hours} ч."
+        return _format_duration(self.duration_from_previous)
 
     def get_workflow_data(self, key: str, default=None):
         """Get workflow data value."""
@@ -137,12 +141,10 @@ class OrderStatusHistory(BaseModel):
 
     def set_workflow_data(self, key: str, value):
         """Set workflow data value."""
-        if self.workflow_data is None:
-            self.workflow_data = {}
         self.workflow_data[key] = value
 
     @classmethod
-    def create_status_change(
+    def status_change_values(
         cls,
         order_id: int,
         from_status: Optional[str],
@@ -156,9 +158,9 @@ class OrderStatusHistory(BaseModel):
         external_reference_id: Optional[str] = None,
         ip_address: Optional[str] = None,
         user_agent: Optional[str] = None
-    ) -> 'OrderStatusHistory':
+    ) -> Dict[str, Any]:
         """
-        Create a new status history record.
+        Build column values of a status history record.
 
         Args:
             order_id: Order ID
@@ -175,9 +177,9 @@ class OrderStatusHistory(BaseModel):
             user_agent: User agent (for manual changes)
 
         Returns:
-            OrderStatusHistory instance
+            Dictionary of column values
         """
-        return cls(
+        return dict(
             order_id=order_id,
             from_status=from_status,
             to_status=to_status,
@@ -190,4 +192,86 @@ class OrderStatusHistory(BaseModel):
             external_reference_id=external_reference_id,
             ip_address=ip_address,
             user_agent=user_agent
-        )
\ No newline at end of file
+        )
+
+    @classmethod
+    def create_status_change(cls, *args, **kwargs) -> 'OrderStatusHistory':
+        """
+        Create a new status history record.
+
+        Takes the same arguments as status_change_values.
+
+        Returns:
+            OrderStatusHistory instance
+        """
+        return cls(**cls.status_change_values(*args, **kwargs))
+
+    @classmethod
+    async def create_status_changes_bulk(
+        cls,
+        session: AsyncSession,
+        rows: List[Dict[str, Any]]
+    ) -> List[int]:
+        """
+        Insert several status history records in one statement.
+
+        Args:
+            session: Database session
+            rows: Column values built by status_change_values
+
+        Returns:
+            IDs of created records, in the order of rows
+        """
+        if not rows:
+            return []
+
+        result = await session.execute(
+            insert(cls).returning(cls.id, sort_by_parameter_order=True),
+            rows
+        )
+        return list(result.scalars())
+
+    @classmethod
+    async def backfill_durations(
+        cls,
+        session: AsyncSession,
+        order_id: Optional[int] = None,
+        only_missing: bool = False
+    ) -> int:
+        """
+        Recalculate duration_from_previous with a single UPDATE using LAG().
+
+        Args:
+            session: Database session
+            order_id: Limit to one order (all orders if None)
+            only_missing: Only fill records without a stored duration
+
+        Returns:
+            Number of updated records
+        """
+        previous = select(
+            cls.id,
+            func.lag(cls.changed_at).over(
+                partition_by=cls.order_id,
+                order_by=cls.changed_at
+            ).label('previous_changed_at')
+        )
+        if order_id is not None:
+            previous = previous.where(cls.order_id == order_id)
+        previous = previous.subquery()
+
+        minutes = cast(
+            func.floor(func.extract('epoch', cls.changed_at - previous.c.previous_changed_at) / 60),
+            Integer
+        )
+        statement = (
+            update(cls)
+            .where(cls.id == previous.c.id, previous.c.previous_changed_at.is_not(None))
+            .values(duration_from_previous=minutes)
+            .execution_options(synchronize_session=False)
+        )
+        if only_missing:
+            statement = statement.where(cls.duration_from_previous.is_(None))
+
+        result = await session.execute(statement)
+        return result.rowcount
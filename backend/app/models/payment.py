@@ -1,10 +1,11 @@
 """Payment models."""
 
 from enum import Enum
-from sqlalchemy import Column, String, Text, Integer, Float, ForeignKey, Enum as SQLEnum, JSON
+from typing import Dict
+from sqlalchemy import Column, String, Text, Integer, Float, ForeignKey, JSON, CheckConstraint
 from sqlalchemy.orm import relationship
 
-from .base import BaseModel
+from .base import BaseModel, FastEnum, enum_values, format_rub
 
 
 class PaymentStatus(Enum):
@@ -15,6 +16,14 @@ class PaymentStatus(Enum):
     REFUNDED = "refunded"
 
 
+PAYMENT_STATUS_DISPLAY: Dict[PaymentStatus, str] = {
+    PaymentStatus.PENDING: "Ожидает оплаты",
+    PaymentStatus.SUCCESS: "Оплачено",
+    PaymentStatus.FAILED: "Ошибка оплаты",
+    PaymentStatus.REFUNDED: "Возвращено"
+}
+
+
 class PaymentMethod(Enum):
     """Payment method enum."""
     TELEGRAM = "telegram"
@@ -22,17 +31,44 @@ class PaymentMethod(Enum):
     CASH = "cash"
 
 
+PAYMENT_METHOD_DISPLAY: Dict[PaymentMethod, str] = {
+    PaymentMethod.TELEGRAM: "Telegram Payments",
+    PaymentMethod.CARD: "Банковская карта",
+    PaymentMethod.CASH: "Наличные"
+}
+
+
 class Payment(BaseModel):
     """Payment model."""
     __tablename__ = "payments"
+    __table_args__ = (
+        # Enum columns are plain VARCHAR holding enum values
+        CheckConstraint(
+            f"status IN ({', '.join(repr(v) for v in enum_values(PaymentStatus))})",
+            name='ck_payments_status'
+        ),
+        CheckConstraint(
+            f"payment_method IN ({', '.join(repr(v) for v in enum_values(PaymentMethod))})",
+            name='ck_payments_payment_method'
+        ),
+    )
 
     # Order relationship
     order_id = Column(Integer, ForeignKey("orders.id"), nullable=False, unique=True)
 
     # Payment details
-    status = Column(SQLEnum(PaymentStatus), default=PaymentStatus.PENDING, nullable=False)
+    status = Column(
+        FastEnum(PaymentStatus),
+        default=PaymentStatus.PENDING,
+        nullable=False
+    )
     amount = Column(Float, nullable=False, comment="Payment amount in rubles")
-    payment_method = Column(SQLEnum(PaymentMethod), default=PaymentMethod.TELEGRAM, nullable=False)
+    amount_kopecks = Column(Integer, nullable=False, comment="Payment amount in kopecks")
+    payment_method = Column(
+        FastEnum(PaymentMethod),
+        default=PaymentMethod.TELEGRAM,
+        nullable=False
+    )
 
     # Telegram Payments specific fields
     telegram_payment_charge_id = Column(String(255), nullable=True, comment="Telegram payment charge ID")
@@ -57,28 +93,17 @@ class Payment(BaseModel):
     @property
     def formatted_amount(self) -> str:
         """Get formatted payment amount."""
-        return f"{int(self.amount)}₽"
+        return format_rub(int(self.amount))
 
     @property
     def status_display(self) -> str:
         """Get human-readable payment status."""
-        status_map = {
-            PaymentStatus.PENDING: "Ожидает оплаты",
-            PaymentStatus.SUCCESS: "Оплачено",
-            PaymentStatus.FAILED: "Ошибка оплаты",
-            PaymentStatus.REFUNDED: "Возвращено"
-        }
-        return status_map.get(self.status, self.status.value)
+        return PAYMENT_STATUS_DISPLAY.get(self.status, self.status.value)
 
     @property
     def method_display(self) -> str:
         """Get human-readable payment method."""
-        method_map = {
-            PaymentMethod.TELEGRAM: "Telegram Payments",
-            PaymentMethod.CARD: "Банковская карта",
-            PaymentMethod.CASH: "Наличные"
-        }
-        return method_map.get(self.payment_method, self.payment_method.value)
+        return PAYMENT_METHOD_DISPLAY.get(self.payment_method, self.payment_method.value)
 
     def is_completed(self) -> bool:
         """Check if payment is completed successfully."""
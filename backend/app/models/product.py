@@ -1,9 +1,55 @@
 """Product model."""
 
-from sqlalchemy import Column, String, Text, Integer, Float, Boolean, ForeignKey, Index
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Optional
+
+from sqlalchemy import Column, String, Text, Integer, Float, SmallInteger, ForeignKey, Index
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import relationship
 
-from .base import BaseModel
+from .base import BaseModel, format_rub
+
+
+_SLUG_STRIP_RE = re.compile(r'[^\w\s-]')
+_SLUG_COLLAPSE_RE = re.compile(r'[-\s]+')
+
+# Bits of Product.flags
+FLAG_ACTIVE = 1
+FLAG_IN_STOCK = 2
+FLAG_FEATURED = 4
+DEFAULT_FLAGS = FLAG_ACTIVE | FLAG_IN_STOCK
+
+
+@lru_cache(maxsize=2048)
+def _format_weight(weight: Optional[int]) -> str:
+    """Format weight in grams, shared by all products with the same weight."""
+    if not weight:
+        return ""
+    return f"{weight // 1000}кг" if weight >= 1000 else f"{weight}г"
+
+
+def _flag_property(flag: int, doc: str) -> hybrid_property:
+    """Create boolean attribute stored as a bit of Product.flags."""
+    def fget(self) -> bool:
+        flags = DEFAULT_FLAGS if self.flags is None else self.flags
+        return bool(flags & flag)
+
+    def fset(self, value: bool) -> None:
+        flags = DEFAULT_FLAGS if self.flags is None else self.flags
+        self.flags = flags | flag if value else flags & ~flag
+
+    def expr(cls):
+        return cls.flags.op('&')(flag) != 0
+
+    def update_expr(cls, value: bool):
+        # Keeps update(Product).values(is_active=...) working
+        return [(cls.flags, cls.flags.op('|')(flag) if value else cls.flags.op('&')(~flag))]
+
+    prop = hybrid_property(fget, fset, expr=expr, update_expr=update_expr)
+    prop.__doc__ = doc
+    return prop
 
 
 class Product(BaseModel):
@@ -15,8 +61,13 @@ class Product(BaseModel):
     price = Column(Float, nullable=False, index=True)
     discount_price = Column(Float, nullable=True, comment="Discounted price if applicable")
     image_url = Column(String(500), nullable=True)
-    is_active = Column(Boolean, default=True, nullable=False, index=True)
-    in_stock = Column(Boolean, default=True, nullable=False, index=True)
+
+    # Active / in stock / featured packed into one column, see FLAG_* bits
+    flags = Column(SmallInteger, default=DEFAULT_FLAGS, nullable=False, comment="Product flag bits")
+    is_active = _flag_property(FLAG_ACTIVE, "Product is shown in catalog")
+    in_stock = _flag_property(FLAG_IN_STOCK, "Product is available for order")
+    is_featured = _flag_property(FLAG_FEATURED, "Featured product flag")
+
     weight = Column(Integer, nullable=True, comment="Weight in grams")
     sort_order = Column(Integer, default=0, nullable=False)
 
@@ -30,7 +81,6 @@ class Product(BaseModel):
     stock_quantity = Column(Integer, default=0, nullable=False, comment="Available stock quantity")
     min_stock_level = Column(Integer, default=0, nullable=False, comment="Minimum stock level")
     popularity_score = Column(Integer, default=0, nullable=False, comment="Product popularity for sorting")
-    is_featured = Column(Boolean, default=False, nullable=False, comment="Featured product flag")
 
     # Nutritional information
     calories_per_100g = Column(Integer, nullable=True, comment="Calories per 100 grams")
@@ -48,9 +98,7 @@ class Product(BaseModel):
 
     # Database indexes for performance
     __table_args__ = (
-        Index('ix_product_category_active', 'category_id', 'is_active'),
-        Index('ix_product_stock_active', 'in_stock', 'is_active'),
-        Index('ix_product_featured_active', 'is_featured', 'is_active'),
+        Index('ix_product_category_flags', 'category_id', 'flags'),
         Index('ix_product_popularity_order', 'popularity_score', 'sort_order'),
     )
 
@@ -60,13 +108,13 @@ class Product(BaseModel):
     @property
     def formatted_price(self) -> str:
         """Get formatted price with currency."""
-        return f"{int(self.price)}₽"
+        return format_rub(int(self.price))
 
     @property
     def formatted_discount_price(self) -> str:
         """Get formatted discount price with currency."""
         if self.discount_price:
-            return f"{int(self.discount_price)}₽"
+            return format_rub(int(self.discount_price))
         return ""
 
     @property
@@ -77,7 +125,7 @@ class Product(BaseModel):
     @property
     def formatted_effective_price(self) -> str:
         """Get formatted effective price with currency."""
-        return f"{int(self.effective_price)}₽"
+        return format_rub(int(self.effective_price))
 
     @property
     def discount_percentage(self) -> int:
@@ -89,11 +137,7 @@ class Product(BaseModel):
     @property
     def formatted_weight(self) -> str:
         """Get formatted weight."""
-        if self.weight:
-            if self.weight >= 1000:
-                return f"{self.weight // 1000}кг"
-            return f"{self.weight}г"
-        return ""
+        return _format_weight(self.weight)
 
     @property
     def is_on_sale(self) -> bool:
@@ -116,15 +160,11 @@ class Product(BaseModel):
 
     def generate_slug(self) -> str:
         """Generate SEO-friendly slug from product name."""
-        import re
-        import unicodedata
-
         # Normalize unicode characters
         slug = unicodedata.normalize('NFKD', self.name)
         # Convert to lowercase and replace spaces with hyphens
-        slug = re.sub(r'[^\w\s-]', '', slug.lower())
-        slug = re.sub(r'[-\s]+', '-', slug).strip('-')
-        return slug
+        slug = _SLUG_STRIP_RE.sub('', slug.lower())
+        return _SLUG_COLLAPSE_RE.sub('-', slug).strip('-')
 
     def update_slug(self):
         """Update slug if not set."""
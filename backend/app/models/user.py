@@ -1,20 +1,108 @@
 """User model for Telegram users."""
 
-from sqlalchemy import Column, BigInteger, String, Boolean, DateTime, Enum as SqlEnum
+from sqlalchemy import (
+    Column, BigInteger, SmallInteger, String, Boolean, Computed, DateTime, Enum as SqlEnum, Index, event, text
+)
 from sqlalchemy.orm import relationship
-from datetime import datetime
+from datetime import timedelta
+from functools import cached_property
+from typing import Callable, Dict, FrozenSet, Union
 import enum
+import sys
 
-from .base import BaseModel
+from .base import BaseModel, enum_values, utcnow as _now
 
 
-class UserRole(enum.Enum):
+class UserRole(str, enum.Enum):
     """User role enumeration."""
     USER = "user"  # Basic user - can place orders, view catalog
     MANAGER = "manager"  # Can manage products, orders
     ADMIN = "admin"  # Full access to everything
 
 
+# Permission identifiers. ":" keeps literals from being interned automatically,
+# interning them lets set lookups succeed on the identity check
+ORDER_CREATE = sys.intern("order:create")
+ORDER_VIEW_OWN = sys.intern("order:view_own")
+ORDER_VIEW_ALL = sys.intern("order:view_all")
+ORDER_UPDATE = sys.intern("order:update")
+PRODUCT_VIEW = sys.intern("product:view")
+PRODUCT_CREATE = sys.intern("product:create")
+PRODUCT_UPDATE = sys.intern("product:update")
+PRODUCT_DELETE = sys.intern("product:delete")
+CATEGORY_VIEW = sys.intern("category:view")
+CATEGORY_CREATE = sys.intern("category:create")
+CATEGORY_UPDATE = sys.intern("category:update")
+CATEGORY_DELETE = sys.intern("category:delete")
+USER_VIEW_BASIC = sys.intern("user:view_basic")
+
+# Built once at import instead of on every permission check
+_ROLE_PERMISSIONS: Dict[UserRole, FrozenSet[str]] = {
+    UserRole.USER: frozenset({
+        ORDER_CREATE, ORDER_VIEW_OWN, PRODUCT_VIEW, CATEGORY_VIEW
+    }),
+    UserRole.MANAGER: frozenset({
+        ORDER_CREATE, ORDER_VIEW_OWN, ORDER_VIEW_ALL, ORDER_UPDATE,
+        PRODUCT_VIEW, PRODUCT_CREATE, PRODUCT_UPDATE, PRODUCT_DELETE,
+        CATEGORY_VIEW, CATEGORY_CREATE, CATEGORY_UPDATE, CATEGORY_DELETE,
+        USER_VIEW_BASIC
+    }),
+    UserRole.ADMIN: frozenset({"*"})  # Admin has all permissions
+}
+_NO_PERMISSIONS: FrozenSet[str] = frozenset()
+
+
+class Permission(enum.IntFlag):
+    """Permission bits, one per permission string of _ROLE_PERMISSIONS."""
+    ORDER_CREATE = 1 << 0
+    ORDER_VIEW_OWN = 1 << 1
+    ORDER_VIEW_ALL = 1 << 2
+    ORDER_UPDATE = 1 << 3
+    PRODUCT_VIEW = 1 << 4
+    PRODUCT_CREATE = 1 << 5
+    PRODUCT_UPDATE = 1 << 6
+    PRODUCT_DELETE = 1 << 7
+    CATEGORY_VIEW = 1 << 8
+    CATEGORY_CREATE = 1 << 9
+    CATEGORY_UPDATE = 1 << 10
+    CATEGORY_DELETE = 1 << 11
+    USER_VIEW_BASIC = 1 << 12
+    OTHER = 1 << 13  # Permissions without own bit, granted only by "*"
+    ALL = (1 << 14) - 1
+
+
+# "order:view_own" -> Permission.ORDER_VIEW_OWN, as plain ints for cheap checks
+_STR_TO_PERM: Dict[str, int] = {
+    sys.intern(permission.name.lower().replace('_', ':', 1)): int(permission)
+    for permission in Permission
+    if permission is not Permission.OTHER
+}
+
+
+def get_role_permissions(role: UserRole) -> FrozenSet[str]:
+    """Get permissions granted by role ("*" grants all)."""
+    return _ROLE_PERMISSIONS.get(role, _NO_PERMISSIONS)
+
+
+def _grant_all(permission: Union[str, Permission]) -> bool:
+    return True
+
+
+def _role_check(permissions: FrozenSet[str]) -> Callable[[Union[str, Permission]], bool]:
+    """Build the permission check of a role as a frozenset membership test."""
+    if "*" in permissions:
+        return _grant_all
+    # Permission members hash like their int values, so both forms are members
+    granted = permissions | {_STR_TO_PERM[permission] for permission in permissions}
+    return frozenset(granted).__contains__
+
+
+_ROLE_CHECK: Dict[UserRole, Callable[[Union[str, Permission]], bool]] = {
+    role: _role_check(permissions) for role, permissions in _ROLE_PERMISSIONS.items()
+}
+_DENY_ALL = _NO_PERMISSIONS.__contains__
+
+
 class User(BaseModel):
     """Telegram user model."""
     __tablename__ = "users"
@@ -28,28 +116,41 @@ class User(BaseModel):
 
     # Authentication fields
     password_hash = Column(String(255), nullable=True)  # For admin/manager users
-    role = Column(SqlEnum(UserRole), default=UserRole.USER, nullable=False, index=True)
-
-    # Legacy field for backward compatibility
-    is_admin = Column(Boolean, default=False, nullable=False)
+    # Native user_role enum holding the lowercase values used in permission checks
+    role = Column(
+        SqlEnum(UserRole, name="user_role", native_enum=True, values_callable=enum_values),
+        default=UserRole.USER, nullable=False, index=True
+    )
+
+    # Legacy field for backward compatibility, derived from role by the database
+    is_admin = Column(Boolean, Computed("role = 'admin'", persisted=True), nullable=False)
     is_active = Column(Boolean, default=True, nullable=False)
 
     # Security fields
     last_login_at = Column(DateTime, nullable=True)
-    failed_login_attempts = Column(BigInteger, default=0, nullable=False)
+    failed_login_attempts = Column(SmallInteger, default=0, nullable=False)
     locked_until = Column(DateTime, nullable=True)
     password_changed_at = Column(DateTime, nullable=True)
 
     # Relationships
-    carts = relationship("Cart", back_populates="user", cascade="all, delete-orphan")
-    orders = relationship("Order", back_populates="user", cascade="all, delete-orphan")
+    # Never loaded implicitly, queries needing them must use selectinload()
+    carts = relationship("Cart", back_populates="user", cascade="all, delete-orphan", lazy="raise_on_sql")
+    orders = relationship(
+        "Order", back_populates="user", foreign_keys="Order.user_id",
+        cascade="all, delete-orphan", lazy="raise_on_sql"
+    )
+
+    __table_args__ = (
+        # Active users by role: admin panel access and dashboard user counts
+        Index('ix_users_role_active', 'role', 'is_active', postgresql_where=text("is_active = true")),
+    )
 
     def __str__(self) -> str:
         return f"User(telegram_id={self.telegram_id}, username={self.username})"
 
-    @property
+    @cached_property
     def full_name(self) -> str:
-        """Get user's full name."""
+        """Get user's full name, cached until first_name/last_name change or reload."""
         if self.last_name:
             return f"{self.first_name} {self.last_name}"
         return self.first_name
@@ -57,31 +158,20 @@ class User(BaseModel):
     @property
     def is_locked(self) -> bool:
         """Check if user account is locked."""
-        if self.locked_until:
-            return datetime.utcnow() < self.locked_until
-        return False
+        return self.locked_until is not None and _now() < self.locked_until
 
     def has_role(self, role: UserRole) -> bool:
         """Check if user has specific role."""
         return self.role == role
 
-    def has_permission(self, permission: str) -> bool:
-        """Check if user has specific permission based on role."""
-        permissions = {
-            UserRole.USER: [
-                "order:create", "order:view_own", "product:view", "category:view"
-            ],
-            UserRole.MANAGER: [
-                "order:create", "order:view_own", "order:view_all", "order:update",
-                "product:view", "product:create", "product:update", "product:delete",
-                "category:view", "category:create", "category:update", "category:delete",
-                "user:view_basic"
-            ],
-            UserRole.ADMIN: ["*"]  # Admin has all permissions
-        }
-
-        role_permissions = permissions.get(self.role, [])
-        return "*" in role_permissions or permission in role_permissions
+    @property
+    def permissions(self) -> FrozenSet[str]:
+        """Get permissions granted by user's role ("*" grants all)."""
+        return get_role_permissions(self.role)
+
+    def has_permission(self, permission: Union[str, Permission]) -> bool:
+        """Check if user has specific permission (a single Permission flag) based on role."""
+        return _ROLE_CHECK.get(self.role, _DENY_ALL)(permission)
 
     def can_access_admin_panel(self) -> bool:
         """Check if user can access admin panel."""
@@ -96,9 +186,17 @@ class User(BaseModel):
         """Increment failed login attempts and lock if necessary."""
         self.failed_login_attempts += 1
         if self.failed_login_attempts >= max_attempts:
-            from datetime import timedelta
-            self.locked_until = datetime.utcnow() + timedelta(minutes=lockout_minutes)
+            self.locked_until = _now() + timedelta(minutes=lockout_minutes)
 
     def update_last_login(self):
         """Update last login timestamp."""
-        self.last_login_at = datetime.utcnow()
\ No newline at end of file
+        self.last_login_at = _now()
+
+
+@event.listens_for(User.first_name, "set")
+@event.listens_for(User.last_name, "set")
+@event.listens_for(User, "expire")
+@event.listens_for(User, "refresh")
+def _reset_full_name(target: User, *args) -> None:
+    """Drop the cached full_name when the name columns change or are reloaded."""
+    target.__dict__.pop("full_name", None)
@@ -1,12 +1,68 @@
-"""Pydantic schemas for API request/response models."""
-
-from .auth import *
-from .user import *
-from .product import *
-from .category import *
-from .cart import *
-from .order import *
-from .admin import *
-from .notification import *
-from .payment import *
-from .common import *
\ No newline at end of file
+"""Pydantic schemas for API request/response models.
+
+Schema modules are imported on first access of their names (PEP 562), so
+importing one of them does not build every model of the package.
+"""
+
+import importlib
+from typing import Any, Dict, List
+
+_SCHEMA_NAMES = {
+    "auth": (
+        "LoginRequest", "TokenResponse", "LoginResponse", "RefreshRequest", "TelegramInitData",
+        "PasswordValidationResponse", "AuthStatusResponse",
+    ),
+    "user": ("UserCreateRequest", "UserUpdateRequest", "UserResponse", "UserListResponse"),
+    "product": (
+        "SortOrder", "ProductSortBy", "StockStatus", "ProductFilters", "ProductSort", "PaginationParams",
+        "BulkOperationType", "BulkOperationRequest", "BulkOperationResult", "ProductCreateRequest",
+        "ProductUpdateRequest", "ProductResponse", "ProductListResponse",
+    ),
+    "category": ("CategoryCreateRequest", "CategoryUpdateRequest", "CategoryResponse", "CategoryListResponse"),
+    "cart": (
+        "CartItemCreateRequest", "CartItemUpdateRequest", "CartItemResponse", "CartResponse", "EmptyCartResponse",
+    ),
+    "order": (
+        "OrderStatus", "OrderPriority", "OrderPaymentMethod", "StatusChangeReason", "OrderCreateRequest",
+        "OrderStatusUpdateRequest", "OrderPriorityUpdateRequest", "OrderCancelRequest", "BulkStatusUpdateRequest",
+        "CourierAssignRequest",
+        "DeliveryScheduleRequest", "OrderItemResponse", "OrderStatusHistoryResponse", "OrderTimelineEvent",
+        "OrderResponse", "OrderListResponse", "BulkUpdateResponse", "OrderStatsResponse", "DashboardResponse",
+        "OrderTimelineResponse", "AutomationProcessingResponse",
+    ),
+    "admin": (
+        "DashboardStats", "PopularProduct", "OrderAnalytics", "ChartDataPoint", "OrderChartDataPoint",
+        "ProductAnalytics", "TopProduct", "CategoryPerformance", "InventoryStatus",
+    ),
+    "notification": (
+        "NotificationType", "ParseMode", "TargetUserGroup", "NotificationRequest", "BroadcastNotificationRequest",
+        "NotificationResponse", "NotificationStatus",
+    ),
+    "payment": (
+        "PaymentStatus", "PaymentMethod", "PaymentWebhookRequest", "PaymentCreateRequest", "PaymentResponse",
+        "PaymentStatusResponse", "RefundRequest", "RefundResponse",
+    ),
+    "common": (
+        "ErrorResponse", "ValidationErrorDetail", "ValidationErrorResponse", "PaginationMeta",
+        "PaginatedResponse", "SuccessResponse",
+    ),
+}
+
+# Schema name -> module defining it
+_LAZY: Dict[str, str] = {name: module for module, names in _SCHEMA_NAMES.items() for name in names}
+
+__all__ = list(_LAZY)
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value  # Later lookups skip __getattr__
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_LAZY))
@@ -0,0 +1,543 @@
+"""OpenAPI examples of schemas, attached only when the API schema is generated."""
+
+import importlib
+from typing import Any, Dict
+
+# Schema module -> schema name -> example
+SCHEMA_EXAMPLES: Dict[str, Dict[str, Dict[str, Any]]] = {
+    "admin": {
+        "DashboardStats": {
+            "total_orders": 1250,
+            "total_revenue": 125000.0,
+            "active_users": 450,
+            "pending_orders": 5,
+            "today_orders": 15,
+            "today_revenue": 1500.0,
+            "popular_products": [
+                {
+                    "product": {
+                        "id": 1,
+                        "name": "Брокколи замороженная",
+                        "price": 150.0,
+                        "formatted_price": "150₽"
+                    },
+                    "orders_count": 25,
+                    "total_revenue": 3750.0
+                }
+            ],
+            "recent_orders": []
+        },
+        "OrderAnalytics": {
+            "period": "month",
+            "total_orders": 150,
+            "total_revenue": 15000.0,
+            "average_order_value": 100.0,
+            "orders_by_status": {
+                "pending": 5,
+                "confirmed": 10,
+                "completed": 135
+            },
+            "revenue_chart": [
+                {
+                    "date": "2024-01-01",
+                    "revenue": 1500.0
+                }
+            ],
+            "orders_chart": [
+                {
+                    "date": "2024-01-01",
+                    "count": 15
+                }
+            ]
+        },
+        "ProductAnalytics": {
+            "period": "month",
+            "top_products": [
+                {
+                    "product": {
+                        "id": 1,
+                        "name": "Брокколи замороженная",
+                        "price": 150.0
+                    },
+                    "orders_count": 25,
+                    "revenue": 3750.0
+                }
+            ],
+            "categories_performance": [
+                {
+                    "category": {
+                        "id": 1,
+                        "name": "Замороженные овощи"
+                    },
+                    "orders_count": 50,
+                    "revenue": 7500.0
+                }
+            ],
+            "inventory_status": {
+                "total_products": 100,
+                "active_products": 95,
+                "out_of_stock": 5
+            }
+        },
+        "InventoryStatus": {
+            "total_products": 100,
+            "active_products": 95,
+            "out_of_stock": 5
+        }
+    },
+    "auth": {
+        "LoginRequest": {
+            "username": "admin",
+            "password": "password123"
+        },
+        "TokenResponse": {
+            "access_token": "eyJ0eXAiOiJKV1QiLCJhbGciOiJIUzI1NiJ9...",
+            "token_type": "bearer",
+            "expires_in": 1800
+        },
+        "LoginResponse": {
+            "access_token": "eyJ0eXAiOiJKV1QiLCJhbGciOiJIUzI1NiJ9...",
+            "refresh_token": "eyJ0eXAiOiJKV1QiLCJhbGciOiJIUzI1NiJ9...",
+            "token_type": "bearer",
+            "expires_in": 1800,
+            "user": {
+                "id": 1,
+                "telegram_id": 123456789,
+                "username": "admin",
+                "first_name": "Admin",
+                "last_name": "User",
+                "phone": None,
+                "is_admin": True,
+                "is_active": True,
+                "full_name": "Admin User",
+                "created_at": "2024-01-01T00:00:00Z",
+                "updated_at": "2024-01-01T00:00:00Z"
+            }
+        },
+        "RefreshRequest": {
+            "refresh_token": "eyJ0eXAiOiJKV1QiLCJhbGciOiJIUzI1NiJ9..."
+        },
+        "TelegramInitData": {
+            "init_data": "query_id=AAH...&user=%7B%22id%22%3A123456789..."
+        },
+        "PasswordValidationResponse": {
+            "valid": True,
+            "strength": "strong",
+            "score": 5,
+            "errors": []
+        },
+        "AuthStatusResponse": {
+            "authenticated": True,
+            "user": {
+                "id": 1,
+                "telegram_id": 123456789,
+                "username": "admin",
+                "first_name": "Admin",
+                "role": "admin"
+            },
+            "permissions": [
+                "*"
+            ],
+            "expires_at": "2024-01-01T01:30:00Z"
+        }
+    },
+    "cart": {
+        "CartItemCreateRequest": {
+            "telegram_id": 123456789,
+            "product_id": 1,
+            "quantity": 2
+        },
+        "CartItemUpdateRequest": {
+            "quantity": 3
+        },
+        "CartItemResponse": {
+            "id": 1,
+            "cart_id": 1,
+            "product_id": 1,
+            "quantity": 2,
+            "product": {
+                "id": 1,
+                "name": "Брокколи замороженная",
+                "description": "Свежая замороженная брокколи",
+                "price": 150.0,
+                "formatted_price": "150₽",
+                "image_url": "https://example.com/broccoli.jpg",
+                "is_active": True,
+                "in_stock": True,
+                "weight": 500,
+                "formatted_weight": "500г",
+                "sort_order": 0,
+                "category_id": 1,
+                "category": {
+                    "id": 1,
+                    "name": "Замороженные овощи",
+                    "description": "Свежие замороженные овощи",
+                    "image_url": "https://example.com/vegetables.jpg",
+                    "is_active": True,
+                    "sort_order": 0,
+                    "products_count": 15,
+                    "created_at": "2024-01-01T00:00:00Z",
+                    "updated_at": "2024-01-01T00:00:00Z"
+                },
+                "created_at": "2024-01-01T00:00:00Z",
+                "updated_at": "2024-01-01T00:00:00Z"
+            },
+            "total_price": 300.0,
+            "created_at": "2024-01-01T00:00:00Z",
+            "updated_at": "2024-01-01T00:00:00Z"
+        },
+        "CartResponse": {
+            "id": 1,
+            "user_id": 1,
+            "items": [
+                {
+                    "id": 1,
+                    "cart_id": 1,
+                    "product_id": 1,
+                    "quantity": 2,
+                    "product": {
+                        "id": 1,
+                        "name": "Брокколи замороженная",
+                        "price": 150.0,
+                        "formatted_price": "150₽"
+                    },
+                    "total_price": 300.0,
+                    "created_at": "2024-01-01T00:00:00Z",
+                    "updated_at": "2024-01-01T00:00:00Z"
+                }
+            ],
+            "total_amount": 450.0,
+            "total_items": 3,
+            "expires_at": None,
+            "created_at": "2024-01-01T00:00:00Z",
+            "updated_at": "2024-01-01T00:00:00Z"
+        },
+        "EmptyCartResponse": {
+            "items": [],
+            "total_amount": 0.0,
+            "total_items": 0
+        }
+    },
+    "category": {
+        "CategoryCreateRequest": {
+            "name": "Замороженные овощи",
+            "description": "Свежие замороженные овощи высокого качества",
+            "image_url": "https://example.com/vegetables.jpg",
+            "is_active": True,
+            "sort_order": 0
+        },
+        "CategoryUpdateRequest": {
+            "name": "Замороженные овощи",
+            "description": "Свежие замороженные овощи высокого качества",
+            "image_url": "https://example.com/vegetables.jpg",
+            "is_active": True,
+            "sort_order": 1
+        },
+        "CategoryResponse": {
+            "id": 1,
+            "name": "Замороженные овощи",
+            "description": "Свежие замороженные овощи высокого качества",
+            "image_url": "https://example.com/vegetables.jpg",
+            "is_active": True,
+            "sort_order": 0,
+            "products_count": 15,
+            "created_at": "2024-01-01T00:00:00Z",
+            "updated_at": "2024-01-01T00:00:00Z"
+        },
+        "CategoryListResponse": {
+            "items": [
+                {
+                    "id": 1,
+                    "name": "Замороженные овощи",
+                    "description": "Свежие замороженные овощи высокого качества",
+                    "image_url": "https://example.com/vegetables.jpg",
+                    "is_active": True,
+                    "sort_order": 0,
+                    "products_count": 15,
+                    "created_at": "2024-01-01T00:00:00Z",
+                    "updated_at": "2024-01-01T00:00:00Z"
+                }
+            ]
+        }
+    },
+    "common": {
+        "ErrorResponse": {
+            "error": "not_found",
+            "message": "Resource not found",
+            "details": {
+                "resource_id": 123
+            }
+        },
+        "ValidationErrorResponse": {
+            "error": "validation_error",
+            "message": "Validation failed",
+            "details": [
+                {
+                    "field": "price",
+                    "message": "Price must be greater than 0",
+                    "code": "value_error.number.not_gt"
+                }
+            ]
+        },
+        "SuccessResponse": {
+            "success": True,
+            "message": "Operation completed successfully"
+        }
+    },
+    "order": {
+        "OrderCreateRequest": {
+            "telegram_id": 123456789,
+            "customer_name": "Иван Иванов",
+            "customer_phone": "+7900123456",
+            "delivery_address": "ул. Пушкина, д. 1, кв. 1",
+            "notes": "Позвонить за 10 минут до доставки",
+            "payment_method": "card"
+        },
+        "OrderStatusUpdateRequest": {
+            "status": "confirmed",
+            "reason": "manual_admin",
+            "notes": "Подтверждено администратором"
+        },
+        "OrderPriorityUpdateRequest": {
+            "priority": "high",
+            "reason": "VIP клиент"
+        },
+        "OrderCancelRequest": {
+            "reason": "По запросу клиента",
+            "refund_amount": 450.0
+        },
+        "BulkStatusUpdateRequest": {
+            "order_ids": [1, 2, 3],
+            "status": "confirmed",
+            "reason": "manual_admin",
+            "notes": "Подтверждены групповой операцией"
+        },
+        "CourierAssignRequest": {
+            "courier_name": "Иван Петров"
+        },
+        "DeliveryScheduleRequest": {
+            "scheduled_time": "2024-01-02T15:30:00Z"
+        },
+        "OrderItemResponse": {
+            "id": 1,
+            "order_id": 1,
+            "product_id": 1,
+            "quantity": 2,
+            "price": 150.0,
+            "formatted_price": "150₽",
+            "total_price": 300.0,
+            "formatted_total": "300₽",
+            "product": {
+                "id": 1,
+                "name": "Брокколи замороженная",
+                "description": "Свежая замороженная брокколи",
+                "price": 150.0,
+                "formatted_price": "150₽",
+                "image_url": "https://example.com/broccoli.jpg",
+                "is_active": True,
+                "in_stock": True,
+                "weight": 500,
+                "formatted_weight": "500г",
+                "sort_order": 0,
+                "category_id": 1,
+                "created_at": "2024-01-01T00:00:00Z",
+                "updated_at": "2024-01-01T00:00:00Z"
+            }
+        },
+        "OrderTimelineEvent": {
+            "timestamp": "2024-01-01T10:00:00Z",
+            "event_type": "status_change",
+            "status": "confirmed",
+            "description": "Статус изменен на \"Подтвержден\"",
+            "user": "admin",
+            "duration": "5 мин.",
+            "notes": "Подтверждено администратором",
+            "reason": "Изменено администратором"
+        },
+        "OrderResponse": {
+            "id": 1,
+            "user_id": 1,
+            "status": "pending",
+            "status_display": "Ожидает подтверждения",
+            "total_amount": 450.0,
+            "formatted_total": "450₽",
+            "customer_name": "Иван Иванов",
+            "customer_phone": "+7900123456",
+            "delivery_address": "ул. Пушкина, д. 1, кв. 1",
+            "notes": "Позвонить за 10 минут до доставки",
+            "payment_method": "card",
+            "items": [
+                {
+                    "id": 1,
+                    "order_id": 1,
+                    "product_id": 1,
+                    "quantity": 2,
+                    "price": 150.0,
+                    "formatted_price": "150₽",
+                    "total_price": 300.0,
+                    "formatted_total": "300₽",
+                    "product": {
+                        "id": 1,
+                        "name": "Брокколи замороженная",
+                        "price": 150.0,
+                        "formatted_price": "150₽"
+                    }
+                }
+            ],
+            "user": {
+                "id": 1,
+                "telegram_id": 123456789,
+                "username": "johndoe",
+                "first_name": "John",
+                "last_name": "Doe",
+                "is_admin": False,
+                "is_active": True,
+                "full_name": "John Doe",
+                "created_at": "2024-01-01T00:00:00Z",
+                "updated_at": "2024-01-01T00:00:00Z"
+            },
+            "created_at": "2024-01-01T00:00:00Z",
+            "updated_at": "2024-01-01T00:00:00Z"
+        },
+        "OrderListResponse": {
+            "items": [
+                {
+                    "id": 1,
+                    "user_id": 1,
+                    "status": "pending",
+                    "status_display": "Ожидает подтверждения",
+                    "total_amount": 450.0,
+                    "formatted_total": "450₽",
+                    "customer_name": "Иван Иванов",
+                    "customer_phone": "+7900123456",
+                    "delivery_address": "ул. Пушкина, д. 1, кв. 1",
+                    "notes": "Позвонить за 10 минут до доставки",
+                    "payment_method": "card",
+                    "items": [],
+                    "user": {
+                        "id": 1,
+                        "telegram_id": 123456789,
+                        "first_name": "John",
+                        "last_name": "Doe",
+                        "full_name": "John Doe"
+                    },
+                    "created_at": "2024-01-01T00:00:00Z",
+                    "updated_at": "2024-01-01T00:00:00Z"
+                }
+            ],
+            "total": 50,
+            "page": 1,
+            "pages": 3,
+            "per_page": 20
+        },
+        "BulkUpdateResponse": {
+            "successful": [
+                {
+                    "order_id": 1,
+                    "old_status": "pending",
+                    "new_status": "confirmed",
+                    "history_id": 123
+                }
+            ],
+            "failed": [
+                {
+                    "order_id": 2,
+                    "error": "Invalid status transition"
+                }
+            ],
+            "total_processed": 2,
+            "success_count": 1,
+            "failure_count": 1
+        },
+        "OrderStatsResponse": {
+            "total": 150,
+            "pending": 5,
+            "processing": 12,
+            "completed": 120,
+            "cancelled": 8,
+            "failed": 3,
+            "refunded": 2,
+            "status_counts": {
+                "pending": 5,
+                "confirmed": 4,
+                "preparing": 5,
+                "ready": 3,
+                "completed": 120,
+                "cancelled": 8,
+                "failed": 3,
+                "refunded": 2
+            },
+            "priority_counts": {
+                "low": 2,
+                "normal": 15,
+                "high": 8,
+                "vip": 3
+            },
+            "overdue_count": 2,
+            "today_orders": 15
+        },
+        "DashboardResponse": {
+            "stats": {
+                "total": 150,
+                "pending": 5,
+                "processing": 12,
+                "completed": 120
+            },
+            "overdue_orders": [
+                {
+                    "id": 1,
+                    "customer_name": "Иван Иванов",
+                    "total_amount": 450.0,
+                    "status": "preparing",
+                    "created_at": "2024-01-01T10:00:00Z",
+                    "priority": "normal"
+                }
+            ],
+            "vip_orders": [],
+            "recent_orders": [],
+            "performance": {
+                "avg_preparation_time_today": 32.5,
+                "overdue_count": 1,
+                "vip_count": 0
+            }
+        },
+        "OrderTimelineResponse": {
+            "order_id": 1,
+            "timeline": [
+                {
+                    "timestamp": "2024-01-01T10:00:00Z",
+                    "event_type": "order_created",
+                    "status": "pending",
+                    "description": "Заказ создан",
+                    "user": None,
+                    "duration": None,
+                    "notes": None
+                },
+                {
+                    "timestamp": "2024-01-01T10:05:00Z",
+                    "event_type": "status_change",
+                    "status": "confirmed",
+                    "description": "Статус изменен на \"Подтвержден\"",
+                    "user": "admin",
+                    "duration": "5 мин.",
+                    "notes": "Подтверждено администратором",
+                    "reason": "Изменено администратором"
+                }
+            ]
+        },
+        "AutomationProcessingResponse": {
+            "processed_orders": 25,
+            "transitions_made": 3,
+            "errors": []
+        }
+    }
+}
+
+
+def attach_schema_examples() -> None:
+    """Set examples as json_schema_extra of schemas, called once before OpenAPI generation."""
+    for module_name, examples in SCHEMA_EXAMPLES.items():
+        module = importlib.import_module(f"app.schemas.{module_name}")
+        for schema_name, example in examples.items():
+            schema = getattr(module, schema_name)
+            schema.model_config["json_schema_extra"] = {"example": example}
@@ -1,63 +1,31 @@
 """Category schemas."""
 
 from datetime import datetime
-from typing import Optional
-from pydantic import BaseModel, Field, validator
+from typing import Annotated, Optional
+from pydantic import BaseModel, ConfigDict, Field, StringConstraints
+
+
+# Kept as str for the model column, the scheme is checked by pydantic-core
+ImageUrl = Annotated[str, StringConstraints(max_length=500, pattern=r'^https?://')]
 
 
 class CategoryCreateRequest(BaseModel):
     """Category creation request schema."""
     name: str = Field(..., min_length=1, max_length=255, description="Category name")
     description: Optional[str] = Field(None, max_length=1000, description="Category description")
-    image_url: Optional[str] = Field(None, max_length=500, description="Category image URL")
+    image_url: Optional[ImageUrl] = Field(None, description="Category image URL")
     is_active: bool = Field(True, description="Category active status")
     sort_order: int = Field(0, description="Sort order")
 
-    @validator('image_url')
-    def validate_image_url(cls, v):
-        """Validate image URL format."""
-        if v and not (v.startswith('http://') or v.startswith('https://')):
-            raise ValueError('Image URL must start with http:// or https://')
-        return v
-
-    class Config:
-        schema_extra = {
-            "example": {
-                "name": "Замороженные овощи",
-                "description": "Свежие замороженные овощи высокого качества",
-                "image_url": "https://example.com/vegetables.jpg",
-                "is_active": True,
-                "sort_order": 0
-            }
-        }
-
 
 class CategoryUpdateRequest(BaseModel):
     """Category update request schema."""
     name: Optional[str] = Field(None, min_length=1, max_length=255, description="Category name")
     description: Optional[str] = Field(None, max_length=1000, description="Category description")
-    image_url: Optional[str] = Field(None, max_length=500, description="Category image URL")
+    image_url: Optional[ImageUrl] = Field(None, description="Category image URL")
     is_active: Optional[bool] = Field(None, description="Category active status")
     sort_order: Optional[int] = Field(None, description="Sort order")
 
-    @validator('image_url')
-    def validate_image_url(cls, v):
-        """Validate image URL format."""
-        if v and not (v.startswith('http://') or v.startswith('https://')):
-            raise ValueError('Image URL must start with http:// or https://')
-        return v
-
-    class Config:
-        schema_extra = {
-            "example": {
-                "name": "Замороженные овощи",
-                "description": "Свежие замороженные овощи высокого качества",
-                "image_url": "https://example.com/vegetables.jpg",
-                "is_active": True,
-                "sort_order": 1
-            }
-        }
-
 
 class CategoryResponse(BaseModel):
     """Category response schema."""
@@ -71,42 +39,9 @@ class CategoryResponse(BaseModel):
     created_at: datetime = Field(..., description="Creation timestamp")
     updated_at: datetime = Field(..., description="Last update timestamp")
 
-    class Config:
-        from_attributes = True
-        schema_extra = {
-            "example": {
-                "id": 1,
-                "name": "Замороженные овощи",
-                "description": "Свежие замороженные овощи высокого качества",
-                "image_url": "https://example.com/vegetables.jpg",
-                "is_active": True,
-                "sort_order": 0,
-                "products_count": 15,
-                "created_at": "2024-01-01T00:00:00Z",
-                "updated_at": "2024-01-01T00:00:00Z"
-            }
-        }
+    model_config = ConfigDict(from_attributes=True)
 
 
 class CategoryListResponse(BaseModel):
     """Category list response schema."""
     items: list[CategoryResponse] = Field(..., description="List of categories")
-
-    class Config:
-        schema_extra = {
-            "example": {
-                "items": [
-                    {
-                        "id": 1,
-                        "name": "Замороженные овощи",
-                        "description": "Свежие замороженные овощи высокого качества",
-                        "image_url": "https://example.com/vegetables.jpg",
-                        "is_active": True,
-                        "sort_order": 0,
-                        "products_count": 15,
-                        "created_at": "2024-01-01T00:00:00Z",
-                        "updated_at": "2024-01-01T00:00:00Z"
-                    }
-                ]
-            }
-        }
\ No newline at end of file
@@ -1,7 +1,7 @@
 """Common schemas and utilities."""
 
-from typing import Any, Dict, List, Optional
-from pydantic import BaseModel, Field
+from typing import Any, Dict, Optional, Tuple
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class ErrorResponse(BaseModel):
@@ -10,15 +10,6 @@ class ErrorResponse(BaseModel):
     message: str = Field(..., description="Human-readable error message")
     details: Optional[Dict[str, Any]] = Field(None, description="Additional error details")
 
-    class Config:
-        schema_extra = {
-            "example": {
-                "error": "not_found",
-                "message": "Resource not found",
-                "details": {"resource_id": 123}
-            }
-        }
-
 
 class ValidationErrorDetail(BaseModel):
     """Validation error detail."""
@@ -31,22 +22,7 @@ class ValidationErrorResponse(BaseModel):
     """Validation error response schema."""
     error: str = Field("validation_error", description="Error type")
     message: str = Field("Validation failed", description="Error message")
-    details: List[ValidationErrorDetail] = Field(..., description="Validation errors")
-
-    class Config:
-        schema_extra = {
-            "example": {
-                "error": "validation_error",
-                "message": "Validation failed",
-                "details": [
-                    {
-                        "field": "price",
-                        "message": "Price must be greater than 0",
-                        "code": "value_error.number.not_gt"
-                    }
-                ]
-            }
-        }
+    details: Tuple[ValidationErrorDetail, ...] = Field(..., description="Validation errors")
 
 
 class PaginationMeta(BaseModel):
@@ -56,6 +32,8 @@ class PaginationMeta(BaseModel):
     pages: int = Field(..., description="Total number of pages")
     per_page: int = Field(..., description="Items per page")
 
+    model_config = ConfigDict(frozen=True, from_attributes=True)
+
 
 class PaginatedResponse(BaseModel):
     """Base paginated response."""
@@ -69,11 +47,3 @@ class SuccessResponse(BaseModel):
     """Generic success response."""
     success: bool = Field(True, description="Operation success status")
     message: str = Field(..., description="Success message")
-
-    class Config:
-        schema_extra = {
-            "example": {
-                "success": True,
-                "message": "Operation completed successfully"
-            }
-        }
\ No newline at end of file
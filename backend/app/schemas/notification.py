@@ -2,7 +2,7 @@
 
 from enum import Enum
 from typing import Optional
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
 
 
 class NotificationType(str, Enum):
@@ -17,31 +17,37 @@ class ParseMode(str, Enum):
     MARKDOWN = "Markdown"
 
 
+class TargetUserGroup(str, Enum):
+    """Broadcast target user group enumeration."""
+    ALL = "all"
+    ACTIVE = "active"
+    ADMIN = "admin"
+
+
 class NotificationRequest(BaseModel):
     """Notification request schema."""
     type: NotificationType = Field(..., description="Notification type")
-    telegram_id: Optional[int] = Field(None, description="Telegram user ID (required for user type)")
+    telegram_id: Optional[int] = Field(None, gt=0, description="Telegram user ID (required for user type)")
     message: str = Field(..., min_length=1, max_length=4000, description="Notification message")
     parse_mode: Optional[ParseMode] = Field(None, description="Message parse mode")
 
-    @validator('telegram_id')
-    def validate_telegram_id(cls, v, values):
+    @model_validator(mode='after')
+    def validate_telegram_id(self) -> 'NotificationRequest':
         """Validate telegram_id is provided for user notifications."""
-        if values.get('type') == NotificationType.USER and not v:
+        if self.type == NotificationType.USER and not self.telegram_id:
             raise ValueError('telegram_id is required for user notifications')
-        if v is not None and v <= 0:
-            raise ValueError('telegram_id must be positive')
-        return v
+        return self
 
-    @validator('message')
+    @field_validator('message')
+    @classmethod
     def validate_message(cls, v):
         """Validate message content."""
         if not v.strip():
             raise ValueError('Message cannot be empty')
         return v.strip()
 
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "type": "user",
                 "telegram_id": 123456789,
@@ -49,6 +55,7 @@ class NotificationRequest(BaseModel):
                 "parse_mode": "HTML"
             }
         }
+    )
 
 
 class BroadcastNotificationRequest(BaseModel):
@@ -56,26 +63,18 @@ class BroadcastNotificationRequest(BaseModel):
     type: NotificationType = Field(NotificationType.BROADCAST, description="Notification type")
     message: str = Field(..., min_length=1, max_length=4000, description="Broadcast message")
     parse_mode: Optional[ParseMode] = Field(None, description="Message parse mode")
-    target_users: Optional[str] = Field(None, description="Target user group (all, active, admin)")
+    target_users: Optional[TargetUserGroup] = Field(None, description="Target user group (all, active, admin)")
 
-    @validator('message')
+    @field_validator('message')
+    @classmethod
     def validate_message(cls, v):
         """Validate message content."""
         if not v.strip():
             raise ValueError('Message cannot be empty')
         return v.strip()
 
-    @validator('target_users')
-    def validate_target_users(cls, v):
-        """Validate target users."""
-        if v is not None:
-            allowed_targets = ['all', 'active', 'admin']
-            if v not in allowed_targets:
-                raise ValueError(f'target_users must be one of: {", ".join(allowed_targets)}')
-        return v
-
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "type": "broadcast",
                 "message": "Новинки в каталоге! Скидка 10% на все замороженные овощи!",
@@ -83,6 +82,7 @@ class BroadcastNotificationRequest(BaseModel):
                 "target_users": "active"
             }
         }
+    )
 
 
 class NotificationResponse(BaseModel):
@@ -92,8 +92,8 @@ class NotificationResponse(BaseModel):
     sent_count: Optional[int] = Field(None, description="Number of notifications sent (for broadcast)")
     failed_count: Optional[int] = Field(None, description="Number of failed sends (for broadcast)")
 
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "success": True,
                 "message": "Notification sent successfully",
@@ -101,6 +101,7 @@ class NotificationResponse(BaseModel):
                 "failed_count": 0
             }
         }
+    )
 
 
 class NotificationStatus(BaseModel):
@@ -113,8 +114,8 @@ class NotificationStatus(BaseModel):
     delivered_at: Optional[str] = Field(None, description="Delivery timestamp")
     error_message: Optional[str] = Field(None, description="Error message if failed")
 
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "notification_id": "notif_123456",
                 "status": "delivered",
@@ -124,4 +125,5 @@ class NotificationStatus(BaseModel):
                 "delivered_at": "2024-01-01T12:00:01Z",
                 "error_message": None
             }
-        }
\ No newline at end of file
+        }
+    )
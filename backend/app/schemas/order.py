@@ -1,9 +1,11 @@
 """Enhanced order schemas with status management."""
 
-from datetime import datetime
+from datetime import datetime, timezone
 from enum import Enum
-from typing import Optional, List, Dict, Any
-from pydantic import BaseModel, Field, validator
+from typing import Optional, List, Dict, Any, Iterable, Type
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+from app.models.base import utcnow
 from .user import UserResponse
 from .product import ProductResponse
 
@@ -28,6 +30,13 @@ class OrderPriority(str, Enum):
     VIP = "vip"
 
 
+class OrderPaymentMethod(str, Enum):
+    """Payment methods accepted when creating an order."""
+    CARD = "card"
+    CASH = "cash"
+    TRANSFER = "transfer"
+
+
 class StatusChangeReason(str, Enum):
     """Status change reason enumeration."""
     AUTOMATIC = "automatic"
@@ -44,49 +53,28 @@ class StatusChangeReason(str, Enum):
     CANCELLED_BY_CUSTOMER = "cancelled_by_customer"
 
 
+def _trusted_values(schema: Type[BaseModel], obj: Any) -> Dict[str, Any]:
+    """Read schema fields from a trusted object, skipping attributes it does not have."""
+    return {name: getattr(obj, name) for name in schema.model_fields if hasattr(obj, name)}
+
+
 class OrderCreateRequest(BaseModel):
     """Order creation request schema."""
-    telegram_id: int = Field(..., description="Telegram user ID")
+    telegram_id: int = Field(..., gt=0, description="Telegram user ID")
     customer_name: str = Field(..., min_length=1, max_length=255, description="Customer name")
     customer_phone: str = Field(..., min_length=10, max_length=20, description="Customer phone")
     delivery_address: Optional[str] = Field(None, max_length=500, description="Delivery address")
     notes: Optional[str] = Field(None, max_length=1000, description="Order notes")
-    payment_method: str = Field("card", description="Payment method")
-
-    @validator('telegram_id')
-    def validate_telegram_id(cls, v):
-        """Validate Telegram ID is positive."""
-        if v <= 0:
-            raise ValueError('Telegram ID must be positive')
-        return v
+    payment_method: OrderPaymentMethod = Field(OrderPaymentMethod.CARD, description="Payment method")
 
-    @validator('customer_phone')
+    @field_validator('customer_phone')
+    @classmethod
     def validate_phone(cls, v):
         """Validate phone number format."""
         if not v.startswith('+'):
             raise ValueError('Phone number must start with +')
         return v
 
-    @validator('payment_method')
-    def validate_payment_method(cls, v):
-        """Validate payment method."""
-        allowed_methods = ['card', 'cash', 'transfer']
-        if v not in allowed_methods:
-            raise ValueError(f'Payment method must be one of: {", ".join(allowed_methods)}')
-        return v
-
-    class Config:
-        schema_extra = {
-            "example": {
-                "telegram_id": 123456789,
-                "customer_name": "Иван Иванов",
-                "customer_phone": "+7900123456",
-                "delivery_address": "ул. Пушкина, д. 1, кв. 1",
-                "notes": "Позвонить за 10 минут до доставки",
-                "payment_method": "card"
-            }
-        }
-
 
 class OrderStatusUpdateRequest(BaseModel):
     """Enhanced order status update request schema."""
@@ -94,92 +82,47 @@ class OrderStatusUpdateRequest(BaseModel):
     reason: Optional[StatusChangeReason] = Field(StatusChangeReason.MANUAL_ADMIN, description="Reason for status change")
     notes: Optional[str] = Field(None, max_length=1000, description="Additional notes")
 
-    class Config:
-        schema_extra = {
-            "example": {
-                "status": "confirmed",
-                "reason": "manual_admin",
-                "notes": "Подтверждено администратором"
-            }
-        }
-
 
 class OrderPriorityUpdateRequest(BaseModel):
     """Order priority update request schema."""
     priority: OrderPriority = Field(..., description="New order priority")
     reason: Optional[str] = Field(None, max_length=500, description="Reason for priority change")
 
-    class Config:
-        schema_extra = {
-            "example": {
-                "priority": "high",
-                "reason": "VIP клиент"
-            }
-        }
-
 
 class OrderCancelRequest(BaseModel):
     """Order cancellation request schema."""
     reason: Optional[str] = Field(None, max_length=500, description="Cancellation reason")
     refund_amount: Optional[float] = Field(None, gt=0, description="Refund amount")
 
-    class Config:
-        schema_extra = {
-            "example": {
-                "reason": "По запросу клиента",
-                "refund_amount": 450.0
-            }
-        }
-
 
 class BulkStatusUpdateRequest(BaseModel):
     """Bulk status update request schema."""
-    order_ids: List[int] = Field(..., min_items=1, description="List of order IDs to update")
+    order_ids: List[int] = Field(..., min_length=1, description="List of order IDs to update")
     status: OrderStatus = Field(..., description="New status for all orders")
     reason: Optional[StatusChangeReason] = Field(StatusChangeReason.MANUAL_ADMIN, description="Reason for status change")
     notes: Optional[str] = Field(None, max_length=1000, description="Additional notes")
 
-    class Config:
-        schema_extra = {
-            "example": {
-                "order_ids": [1, 2, 3],
-                "status": "confirmed",
-                "reason": "manual_admin",
-                "notes": "Подтверждены групповой операцией"
-            }
-        }
-
 
 class CourierAssignRequest(BaseModel):
     """Courier assignment request schema."""
     courier_name: str = Field(..., min_length=1, max_length=100, description="Courier name")
 
-    class Config:
-        schema_extra = {
-            "example": {
-                "courier_name": "Иван Петров"
-            }
-        }
-
 
 class DeliveryScheduleRequest(BaseModel):
     """Delivery scheduling request schema."""
     scheduled_time: datetime = Field(..., description="Scheduled delivery time")
 
-    @validator('scheduled_time')
+    @field_validator('scheduled_time')
+    @classmethod
     def validate_scheduled_time(cls, v):
-        """Validate scheduled time is in the future."""
-        if v <= datetime.utcnow():
+        """Validate scheduled time is in the future, as naive UTC like stored timestamps."""
+        if v.tzinfo is not None:
+            v = v.astimezone(timezone.utc).replace(tzinfo=None)
+        # Compared with the request clock, read once per request
+        if v <= utcnow():
             raise ValueError('Scheduled time must be in the future')
         return v
 
-    class Config:
-        schema_extra = {
-            "example": {
-                "scheduled_time": "2024-01-02T15:30:00Z"
-            }
-        }
-
 
 class OrderItemResponse(BaseModel):
     """Order item response schema."""
@@ -193,36 +136,20 @@ class OrderItemResponse(BaseModel):
     formatted_total: str = Field(..., description="Formatted total price")
     product: ProductResponse = Field(..., description="Product information")
 
-    class Config:
-        from_attributes = True
-        schema_extra = {
-            "example": {
-                "id": 1,
-                "order_id": 1,
-                "product_id": 1,
-                "quantity": 2,
-                "price": 150.0,
-                "formatted_price": "150₽",
-                "total_price": 300.0,
-                "formatted_total": "300₽",
-                "product": {
-                    "id": 1,
-                    "name": "Брокколи замороженная",
-                    "description": "Свежая замороженная брокколи",
-                    "price": 150.0,
-                    "formatted_price": "150₽",
-                    "image_url": "https://example.com/broccoli.jpg",
-                    "is_active": True,
-                    "in_stock": True,
-                    "weight": 500,
-                    "formatted_weight": "500г",
-                    "sort_order": 0,
-                    "category_id": 1,
-                    "created_at": "2024-01-01T00:00:00Z",
-                    "updated_at": "2024-01-01T00:00:00Z"
-                }
-            }
-        }
+    # Core schema is built on first use, not when the module is imported
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
+
+    @classmethod
+    def from_orm_trusted(cls, item: Any) -> 'OrderItemResponse':
+        """
+        Build response from an OrderItem row without validating its fields.
+
+        Only for trusted sources (ORM rows, cached rows), HTTP input must go
+        through model_validate.
+        """
+        data = _trusted_values(cls, item)
+        data["product"] = ProductResponse.model_validate(item.product)
+        return cls.model_construct(**data)
 
 
 class OrderStatusHistoryResponse(BaseModel):
@@ -239,8 +166,15 @@ class OrderStatusHistoryResponse(BaseModel):
     duration_from_previous: Optional[int] = Field(None, description="Duration from previous status in minutes")
     duration_display: Optional[str] = Field(None, description="Human-readable duration")
 
-    class Config:
-        from_attributes = True
+    # Core schema is built on first use, not when the module is imported
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
+
+    @classmethod
+    def from_orm_trusted(cls, history: Any) -> 'OrderStatusHistoryResponse':
+        """Build response from an OrderStatusHistory row without validating its fields."""
+        data = _trusted_values(cls, history)
+        data["changed_by_id"] = history.changed_by_user_id
+        return cls.model_construct(**data)
 
 
 class OrderTimelineEvent(BaseModel):
@@ -255,20 +189,6 @@ class OrderTimelineEvent(BaseModel):
     reason: Optional[str] = Field(None, description="Reason for change")
     system_message: Optional[str] = Field(None, description="System message")
 
-    class Config:
-        schema_extra = {
-            "example": {
-                "timestamp": "2024-01-01T10:00:00Z",
-                "event_type": "status_change",
-                "status": "confirmed",
-                "description": "Статус изменен на \"Подтвержден\"",
-                "user": "admin",
-                "duration": "5 мин.",
-                "notes": "Подтверждено администратором",
-                "reason": "Изменено администратором"
-            }
-        }
-
 
 class OrderResponse(BaseModel):
     """Enhanced order response schema."""
@@ -280,6 +200,7 @@ class OrderResponse(BaseModel):
     priority_display: str = Field(..., description="Human-readable priority")
     total_amount: float = Field(..., description="Total order amount")
     formatted_total: str = Field(..., description="Formatted total amount")
+    items_count: int = Field(0, description="Number of order items")
     customer_name: str = Field(..., description="Customer name")
     customer_phone: str = Field(..., description="Customer phone")
     delivery_address: Optional[str] = Field(None, description="Delivery address")
@@ -326,55 +247,25 @@ class OrderResponse(BaseModel):
     created_at: datetime = Field(..., description="Creation timestamp")
     updated_at: datetime = Field(..., description="Last update timestamp")
 
-    class Config:
-        from_attributes = True
-        schema_extra = {
-            "example": {
-                "id": 1,
-                "user_id": 1,
-                "status": "pending",
-                "status_display": "Ожидает подтверждения",
-                "total_amount": 450.0,
-                "formatted_total": "450₽",
-                "customer_name": "Иван Иванов",
-                "customer_phone": "+7900123456",
-                "delivery_address": "ул. Пушкина, д. 1, кв. 1",
-                "notes": "Позвонить за 10 минут до доставки",
-                "payment_method": "card",
-                "items": [
-                    {
-                        "id": 1,
-                        "order_id": 1,
-                        "product_id": 1,
-                        "quantity": 2,
-                        "price": 150.0,
-                        "formatted_price": "150₽",
-                        "total_price": 300.0,
-                        "formatted_total": "300₽",
-                        "product": {
-                            "id": 1,
-                            "name": "Брокколи замороженная",
-                            "price": 150.0,
-                            "formatted_price": "150₽"
-                        }
-                    }
-                ],
-                "user": {
-                    "id": 1,
-                    "telegram_id": 123456789,
-                    "username": "johndoe",
-                    "first_name": "John",
-                    "last_name": "Doe",
-                    "is_admin": False,
-                    "is_active": True,
-                    "full_name": "John Doe",
-                    "created_at": "2024-01-01T00:00:00Z",
-                    "updated_at": "2024-01-01T00:00:00Z"
-                },
-                "created_at": "2024-01-01T00:00:00Z",
-                "updated_at": "2024-01-01T00:00:00Z"
-            }
-        }
+    # Core schema is built on first use, not when the module is imported
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
+
+    @classmethod
+    def from_orm_trusted(cls, order: Any) -> 'OrderResponse':
+        """
+        Build response from an Order row without validating its fields.
+
+        Only for trusted sources (ORM rows, cached rows), HTTP input must go
+        through model_validate. Items and user must already be loaded.
+        """
+        data = _trusted_values(cls, order)
+        # Model enums are not the str enums of the schema
+        data["status"] = OrderStatus(order.status.value)
+        data["priority"] = OrderPriority(order.priority.value)
+        data["is_overdue"] = order.is_overdue()
+        data["items"] = [OrderItemResponse.from_orm_trusted(item) for item in order.items]
+        data["user"] = UserResponse.model_validate(order.user)
+        return cls.model_construct(**data)
 
 
 class OrderListResponse(BaseModel):
@@ -385,40 +276,20 @@ class OrderListResponse(BaseModel):
     pages: int = Field(..., description="Total number of pages")
     per_page: int = Field(..., description="Items per page")
 
-    class Config:
-        schema_extra = {
-            "example": {
-                "items": [
-                    {
-                        "id": 1,
-                        "user_id": 1,
-                        "status": "pending",
-                        "status_display": "Ожидает подтверждения",
-                        "total_amount": 450.0,
-                        "formatted_total": "450₽",
-                        "customer_name": "Иван Иванов",
-                        "customer_phone": "+7900123456",
-                        "delivery_address": "ул. Пушкина, д. 1, кв. 1",
-                        "notes": "Позвонить за 10 минут до доставки",
-                        "payment_method": "card",
-                        "items": [],
-                        "user": {
-                            "id": 1,
-                            "telegram_id": 123456789,
-                            "first_name": "John",
-                            "last_name": "Doe",
-                            "full_name": "John Doe"
-                        },
-                        "created_at": "2024-01-01T00:00:00Z",
-                        "updated_at": "2024-01-01T00:00:00Z"
-                    }
-                ],
-                "total": 50,
-                "page": 1,
-                "pages": 3,
-                "per_page": 20
-            }
-        }
+    model_config = ConfigDict(defer_build=True)
+
+    @classmethod
+    def from_orm_trusted(
+        cls, orders: Iterable[Any], total: int, page: int, per_page: int
+    ) -> 'OrderListResponse':
+        """Build a page of orders from trusted Order rows without validation."""
+        return cls.model_construct(
+            items=[OrderResponse.from_orm_trusted(order) for order in orders],
+            total=total,
+            page=page,
+            pages=(total + per_page - 1) // per_page if per_page else 0,
+            per_page=per_page
+        )
 
 
 class BulkUpdateResponse(BaseModel):
@@ -429,29 +300,6 @@ class BulkUpdateResponse(BaseModel):
     success_count: int = Field(..., description="Number of successful updates")
     failure_count: int = Field(..., description="Number of failed updates")
 
-    class Config:
-        schema_extra = {
-            "example": {
-                "successful": [
-                    {
-                        "order_id": 1,
-                        "old_status": "pending",
-                        "new_status": "confirmed",
-                        "history_id": 123
-                    }
-                ],
-                "failed": [
-                    {
-                        "order_id": 2,
-                        "error": "Invalid status transition"
-                    }
-                ],
-                "total_processed": 2,
-                "success_count": 1,
-                "failure_count": 1
-            }
-        }
-
 
 class OrderStatsResponse(BaseModel):
     """Order statistics response schema."""
@@ -467,37 +315,6 @@ class OrderStatsResponse(BaseModel):
     overdue_count: int = Field(..., description="Overdue orders count")
     today_orders: int = Field(..., description="Today's orders count")
 
-    class Config:
-        schema_extra = {
-            "example": {
-                "total": 150,
-                "pending": 5,
-                "processing": 12,
-                "completed": 120,
-                "cancelled": 8,
-                "failed": 3,
-                "refunded": 2,
-                "status_counts": {
-                    "pending": 5,
-                    "confirmed": 4,
-                    "preparing": 5,
-                    "ready": 3,
-                    "completed": 120,
-                    "cancelled": 8,
-                    "failed": 3,
-                    "refunded": 2
-                },
-                "priority_counts": {
-                    "low": 2,
-                    "normal": 15,
-                    "high": 8,
-                    "vip": 3
-                },
-                "overdue_count": 2,
-                "today_orders": 15
-            }
-        }
-
 
 class DashboardResponse(BaseModel):
     """Dashboard response schema."""
@@ -507,81 +324,15 @@ class DashboardResponse(BaseModel):
     recent_orders: List[Dict[str, Any]] = Field(..., description="Recent orders")
     performance: Dict[str, Any] = Field(..., description="Performance metrics")
 
-    class Config:
-        schema_extra = {
-            "example": {
-                "stats": {
-                    "total": 150,
-                    "pending": 5,
-                    "processing": 12,
-                    "completed": 120
-                },
-                "overdue_orders": [
-                    {
-                        "id": 1,
-                        "customer_name": "Иван Иванов",
-                        "total_amount": 450.0,
-                        "status": "preparing",
-                        "created_at": "2024-01-01T10:00:00Z",
-                        "priority": "normal"
-                    }
-                ],
-                "vip_orders": [],
-                "recent_orders": [],
-                "performance": {
-                    "avg_preparation_time_today": 32.5,
-                    "overdue_count": 1,
-                    "vip_count": 0
-                }
-            }
-        }
-
 
 class OrderTimelineResponse(BaseModel):
     """Order timeline response schema."""
     order_id: int = Field(..., description="Order ID")
     timeline: List[OrderTimelineEvent] = Field(..., description="Timeline events")
 
-    class Config:
-        schema_extra = {
-            "example": {
-                "order_id": 1,
-                "timeline": [
-                    {
-                        "timestamp": "2024-01-01T10:00:00Z",
-                        "event_type": "order_created",
-                        "status": "pending",
-                        "description": "Заказ создан",
-                        "user": None,
-                        "duration": None,
-                        "notes": None
-                    },
-                    {
-                        "timestamp": "2024-01-01T10:05:00Z",
-                        "event_type": "status_change",
-                        "status": "confirmed",
-                        "description": "Статус изменен на \"Подтвержден\"",
-                        "user": "admin",
-                        "duration": "5 мин.",
-                        "notes": "Подтверждено администратором",
-                        "reason": "Изменено администратором"
-                    }
-                ]
-            }
-        }
-
 
 class AutomationProcessingResponse(BaseModel):
     """Automation processing response schema."""
     processed_orders: int = Field(..., description="Number of orders processed")
     transitions_made: int = Field(..., description="Number of transitions made")
     errors: List[str] = Field(..., description="Processing errors")
-
-    class Config:
-        schema_extra = {
-            "example": {
-                "processed_orders": 25,
-                "transitions_made": 3,
-                "errors": []
-            }
-        }
\ No newline at end of file
@@ -1,9 +1,13 @@
 """Payment schemas."""
 
+import re
 from datetime import datetime
 from enum import Enum
 from typing import Optional, Dict, Any
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, ConfigDict, Field, validator
+
+
+_HTTP_URL_RE = re.compile(r'^https?://')
 
 
 class PaymentStatus(str, Enum):
@@ -35,14 +39,12 @@ class PaymentWebhookRequest(BaseModel):
     @validator('amount')
     def validate_amount(cls, v):
         """Validate payment amount."""
-        if v <= 0:
-            raise ValueError('Amount must be greater than 0')
         if v > 1000000:
             raise ValueError('Amount seems too high')
         return round(v, 2)
 
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "order_id": 1,
                 "status": "success",
@@ -56,6 +58,7 @@ class PaymentWebhookRequest(BaseModel):
                 }
             }
         }
+    )
 
 
 class PaymentCreateRequest(BaseModel):
@@ -69,8 +72,6 @@ class PaymentCreateRequest(BaseModel):
     @validator('amount')
     def validate_amount(cls, v):
         """Validate payment amount."""
-        if v <= 0:
-            raise ValueError('Amount must be greater than 0')
         if v > 1000000:
             raise ValueError('Amount seems too high')
         return round(v, 2)
@@ -78,12 +79,12 @@ class PaymentCreateRequest(BaseModel):
     @validator('return_url', 'cancel_url')
     def validate_urls(cls, v):
         """Validate URLs format."""
-        if v and not (v.startswith('http://') or v.startswith('https://')):
+        if v and not _HTTP_URL_RE.match(v):
             raise ValueError('URL must start with http:// or https://')
         return v
 
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "order_id": 1,
                 "amount": 450.0,
@@ -92,6 +93,7 @@ class PaymentCreateRequest(BaseModel):
                 "cancel_url": "https://example.com/payment/cancel"
             }
         }
+    )
 
 
 class PaymentResponse(BaseModel):
@@ -107,9 +109,9 @@ class PaymentResponse(BaseModel):
     created_at: datetime = Field(..., description="Creation timestamp")
     updated_at: datetime = Field(..., description="Last update timestamp")
 
-    class Config:
-        from_attributes = True
-        schema_extra = {
+    model_config = ConfigDict(
+        from_attributes=True,
+        json_schema_extra={
             "example": {
                 "id": "pay_123456789",
                 "order_id": 1,
@@ -123,6 +125,7 @@ class PaymentResponse(BaseModel):
                 "updated_at": "2024-01-01T12:00:00Z"
             }
         }
+    )
 
 
 class PaymentStatusResponse(BaseModel):
@@ -136,9 +139,9 @@ class PaymentStatusResponse(BaseModel):
     updated_at: str = Field(..., description="Last status update timestamp (ISO format)")
     paid_at: Optional[str] = Field(None, description="Payment completion timestamp (ISO format)")
 
-    class Config:
-        from_attributes = True
-        schema_extra = {
+    model_config = ConfigDict(
+        from_attributes=True,
+        json_schema_extra={
             "example": {
                 "order_id": 1,
                 "status": "success",
@@ -150,6 +153,7 @@ class PaymentStatusResponse(BaseModel):
                 "paid_at": "2024-01-01T12:05:00Z"
             }
         }
+    )
 
 
 class RefundRequest(BaseModel):
@@ -160,21 +164,20 @@ class RefundRequest(BaseModel):
 
     @validator('amount')
     def validate_amount(cls, v):
-        """Validate refund amount."""
+        """Round refund amount."""
         if v is not None:
-            if v <= 0:
-                raise ValueError('Refund amount must be greater than 0')
             return round(v, 2)
         return v
 
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "payment_id": "pay_123456789",
                 "amount": 450.0,
                 "reason": "Customer cancellation"
             }
         }
+    )
 
 
 class RefundResponse(BaseModel):
@@ -189,9 +192,9 @@ class RefundResponse(BaseModel):
     created_at: datetime = Field(..., description="Refund creation timestamp")
     processed_at: Optional[datetime] = Field(None, description="Refund processing timestamp")
 
-    class Config:
-        from_attributes = True
-        schema_extra = {
+    model_config = ConfigDict(
+        from_attributes=True,
+        json_schema_extra={
             "example": {
                 "id": "ref_123456789",
                 "payment_id": "pay_123456789",
@@ -203,4 +206,5 @@ class RefundResponse(BaseModel):
                 "created_at": "2024-01-01T14:00:00Z",
                 "processed_at": "2024-01-01T14:05:00Z"
             }
-        }
\ No newline at end of file
+        }
+    )
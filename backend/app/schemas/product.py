@@ -1,12 +1,16 @@
 """Product schemas."""
 
+import re
 from datetime import datetime
 from typing import Optional, List
 from enum import Enum
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, ConfigDict, Field, validator
 from .category import CategoryResponse
 
 
+_HTTP_URL_RE = re.compile(r'^https?://')
+
+
 class SortOrder(str, Enum):
     """Sort order options."""
     ASC = "asc"
@@ -147,9 +151,7 @@ class ProductCreateRequest(BaseModel):
 
     @validator('price')
     def validate_price(cls, v):
-        """Validate price is positive and reasonable."""
-        if v <= 0:
-            raise ValueError('Price must be greater than 0')
+        """Validate price is reasonable."""
         if v > 100000:
             raise ValueError('Price seems too high')
         return round(v, 2)
@@ -158,8 +160,6 @@ class ProductCreateRequest(BaseModel):
     def validate_discount_price(cls, v, values):
         """Validate discount price is less than regular price."""
         if v is not None:
-            if v <= 0:
-                raise ValueError('Discount price must be greater than 0')
             if v > 100000:
                 raise ValueError('Discount price seems too high')
             if 'price' in values and v >= values['price']:
@@ -170,7 +170,7 @@ class ProductCreateRequest(BaseModel):
     @validator('image_url')
     def validate_image_url(cls, v):
         """Validate image URL format."""
-        if v and not (v.startswith('http://') or v.startswith('https://')):
+        if v and not _HTTP_URL_RE.match(v):
             raise ValueError('Image URL must start with http:// or https://')
         return v
 
@@ -192,8 +192,8 @@ class ProductCreateRequest(BaseModel):
                 raise ValueError('SKU must be at least 3 characters long')
         return v
 
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "name": "Брокколи замороженная",
                 "description": "Свежая замороженная брокколи высокого качества",
@@ -218,6 +218,7 @@ class ProductCreateRequest(BaseModel):
                 "carbs_per_100g": 7.0
             }
         }
+    )
 
 
 class ProductUpdateRequest(BaseModel):
@@ -225,7 +226,7 @@ class ProductUpdateRequest(BaseModel):
     name: Optional[str] = Field(None, min_length=1, max_length=255, description="Product name")
     description: Optional[str] = Field(None, max_length=2000, description="Product description")
     price: Optional[float] = Field(None, gt=0, description="Product price in rubles")
-    discount_price: Optional[float] = Field(None, description="Discounted price in rubles")
+    discount_price: Optional[float] = Field(None, gt=0, description="Discounted price in rubles")
     image_url: Optional[str] = Field(None, max_length=500, description="Product image URL")
     is_active: Optional[bool] = Field(None, description="Product active status")
     in_stock: Optional[bool] = Field(None, description="Product stock availability")
@@ -252,10 +253,8 @@ class ProductUpdateRequest(BaseModel):
 
     @validator('price')
     def validate_price(cls, v):
-        """Validate price is positive and reasonable."""
+        """Validate price is reasonable."""
         if v is not None:
-            if v <= 0:
-                raise ValueError('Price must be greater than 0')
             if v > 100000:
                 raise ValueError('Price seems too high')
             return round(v, 2)
@@ -263,10 +262,8 @@ class ProductUpdateRequest(BaseModel):
 
     @validator('discount_price')
     def validate_discount_price(cls, v):
-        """Validate discount price is positive."""
+        """Validate discount price is reasonable."""
         if v is not None:
-            if v <= 0:
-                raise ValueError('Discount price must be greater than 0')
             if v > 100000:
                 raise ValueError('Discount price seems too high')
             return round(v, 2)
@@ -275,7 +272,7 @@ class ProductUpdateRequest(BaseModel):
     @validator('image_url')
     def validate_image_url(cls, v):
         """Validate image URL format."""
-        if v and not (v.startswith('http://') or v.startswith('https://')):
+        if v and not _HTTP_URL_RE.match(v):
             raise ValueError('Image URL must start with http:// or https://')
         return v
 
@@ -297,8 +294,8 @@ class ProductUpdateRequest(BaseModel):
                 raise ValueError('SKU must be at least 3 characters long')
         return v
 
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "name": "Брокколи замороженная премиум",
                 "description": "Свежая замороженная брокколи высшего качества",
@@ -311,6 +308,7 @@ class ProductUpdateRequest(BaseModel):
                 "category_id": 1
             }
         }
+    )
 
 
 class ProductResponse(BaseModel):
@@ -358,9 +356,9 @@ class ProductResponse(BaseModel):
     created_at: datetime = Field(..., description="Creation timestamp")
     updated_at: datetime = Field(..., description="Last update timestamp")
 
-    class Config:
-        from_attributes = True
-        schema_extra = {
+    model_config = ConfigDict(
+        from_attributes=True,
+        json_schema_extra={
             "example": {
                 "id": 1,
                 "name": "Брокколи замороженная",
@@ -389,6 +387,7 @@ class ProductResponse(BaseModel):
                 "updated_at": "2024-01-01T00:00:00Z"
             }
         }
+    )
 
 
 class ProductListResponse(BaseModel):
@@ -399,8 +398,8 @@ class ProductListResponse(BaseModel):
     pages: int = Field(..., description="Total number of pages")
     per_page: int = Field(..., description="Items per page")
 
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "items": [
                     {
@@ -436,4 +435,5 @@ class ProductListResponse(BaseModel):
                 "pages": 8,
                 "per_page": 20
             }
-        }
\ No newline at end of file
+        }
+    )
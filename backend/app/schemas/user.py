@@ -2,24 +2,17 @@
 
 from datetime import datetime
 from typing import Optional
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, ConfigDict, Field, validator
 
 
 class UserCreateRequest(BaseModel):
     """User creation request schema."""
-    telegram_id: int = Field(..., description="Telegram user ID")
+    telegram_id: int = Field(..., gt=0, description="Telegram user ID")
     username: Optional[str] = Field(None, max_length=255, description="Telegram username")
     first_name: str = Field(..., min_length=1, max_length=255, description="First name")
     last_name: Optional[str] = Field(None, max_length=255, description="Last name")
     phone: Optional[str] = Field(None, max_length=20, description="Phone number")
 
-    @validator('telegram_id')
-    def validate_telegram_id(cls, v):
-        """Validate Telegram ID is positive."""
-        if v <= 0:
-            raise ValueError('Telegram ID must be positive')
-        return v
-
     @validator('phone')
     def validate_phone(cls, v):
         """Validate phone number format."""
@@ -27,8 +20,8 @@ class UserCreateRequest(BaseModel):
             raise ValueError('Phone number must start with +')
         return v
 
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "telegram_id": 123456789,
                 "username": "johndoe",
@@ -37,6 +30,7 @@ class UserCreateRequest(BaseModel):
                 "phone": "+1234567890"
             }
         }
+    )
 
 
 class UserUpdateRequest(BaseModel):
@@ -54,8 +48,8 @@ class UserUpdateRequest(BaseModel):
             raise ValueError('Phone number must start with +')
         return v
 
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "username": "johndoe_new",
                 "first_name": "John",
@@ -64,6 +58,7 @@ class UserUpdateRequest(BaseModel):
                 "is_active": True
             }
         }
+    )
 
 
 class UserResponse(BaseModel):
@@ -80,9 +75,9 @@ class UserResponse(BaseModel):
     created_at: datetime = Field(..., description="Creation timestamp")
     updated_at: datetime = Field(..., description="Last update timestamp")
 
-    class Config:
-        from_attributes = True
-        schema_extra = {
+    model_config = ConfigDict(
+        from_attributes=True,
+        json_schema_extra={
             "example": {
                 "id": 1,
                 "telegram_id": 123456789,
@@ -97,6 +92,7 @@ class UserResponse(BaseModel):
                 "updated_at": "2024-01-01T00:00:00Z"
             }
         }
+    )
 
 
 class UserListResponse(BaseModel):
@@ -107,8 +103,8 @@ class UserListResponse(BaseModel):
     pages: int = Field(..., description="Total number of pages")
     per_page: int = Field(..., description="Items per page")
 
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "items": [
                     {
@@ -130,4 +126,5 @@ class UserListResponse(BaseModel):
                 "pages": 1,
                 "per_page": 20
             }
-        }
\ No newline at end of file
+        }
+    )
@@ -1,8 +1,11 @@
 """Authentication service with comprehensive business logic."""
 
+import hashlib
 import logging
+import time
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, Tuple
+from typing import Optional, Dict, Any, Sequence, Tuple
+from cachetools import TTLCache
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, update
 from fastapi import HTTPException, status
@@ -18,6 +21,15 @@ from app.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Verified access tokens: token digest -> (user_id, exp). Only successful
+# verifications are cached, and never past the token's own expiry.
+TOKEN_CACHE_TTL = 30  # seconds
+_token_cache: TTLCache = TTLCache(maxsize=10000, ttl=TOKEN_CACHE_TTL)
+
+
+def _token_cache_key(token: str) -> str:
+    return hashlib.blake2b(token.encode(), digest_size=16).hexdigest()
+
 
 class AuthenticationError(Exception):
     """Custom authentication error."""
@@ -30,19 +42,22 @@ class AuthorizationError(Exception):
 
 
 class AuthService:
-    """Authentication service with comprehensive business logic."""
+    """
+    Authentication service with comprehensive business logic.
 
-    def __init__(self, db: AsyncSession):
-        """Initialize authentication service."""
-        self.db = db
-        self.max_failed_attempts = 5
-        self.lockout_minutes = 30
+    The service holds no per-request state: database session is passed
+    to each method that needs it, so one instance serves all requests.
+    """
 
-    async def authenticate_user(self, username: str, password: str, client_ip: str = None) -> Dict[str, Any]:
+    max_failed_attempts = 5
+    lockout_minutes = 30
+
+    async def authenticate_user(self, db: AsyncSession, username: str, password: str, client_ip: str = None) -> Dict[str, Any]:
         """
         Authenticate user with comprehensive security checks.
 
         Args:
+            db: Database session
             username: Username or email
             password: Plain password
             client_ip: Client IP for rate limiting
@@ -65,7 +80,7 @@ class AuthService:
                 raise AuthenticationError("Too many authentication attempts. Please try again later.")
 
         # Find user by username or email
-        user = await self._find_user_by_credentials(username)
+        user = await self._find_user_by_credentials(db, username)
         if not user:
             logger.warning(f"Authentication attempt for non-existent user: {username}")
 
@@ -87,12 +102,12 @@ class AuthService:
 
         # Verify password
         if not user.password_hash or not verify_password(password, user.password_hash):
-            await self._handle_failed_login(user, client_ip)
+            await self._handle_failed_login(db, user, client_ip)
             logger.warning(f"Invalid password for user: {user.id}")
             raise AuthenticationError("Invalid credentials")
 
         # Successful authentication
-        await self._handle_successful_login(user)
+        await self._handle_successful_login(db, user)
         logger.info(f"Successful authentication for user: {user.id}")
 
         # Generate tokens
@@ -104,11 +119,12 @@ class AuthService:
             "message": "Authentication successful"
         }
 
-    async def authenticate_telegram_user(self, telegram_data: Dict[str, Any]) -> Dict[str, Any]:
+    async def authenticate_telegram_user(self, db: AsyncSession, telegram_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Authenticate user via Telegram WebApp initData.
 
         Args:
+            db: Database session
             telegram_data: Parsed Telegram user data
 
         Returns:
@@ -119,13 +135,13 @@ class AuthService:
             raise AuthenticationError("Invalid Telegram data")
 
         # Find or create user
-        user = await self._find_user_by_telegram_id(telegram_id)
+        user = await self._find_user_by_telegram_id(db, telegram_id)
         if not user:
             # Create new user from Telegram data
-            user = await self._create_telegram_user(telegram_data)
+            user = await self._create_telegram_user(db, telegram_data)
 
         # Update user info from Telegram
-        await self._update_user_from_telegram(user, telegram_data)
+        await self._update_user_from_telegram(db, user, telegram_data)
 
         # Check if user is active
         if not user.is_active:
@@ -134,7 +150,7 @@ class AuthService:
 
         # Update last login
         user.update_last_login()
-        await self.db.commit()
+        await db.commit()
 
         logger.info(f"Successful Telegram authentication for user: {user.id}")
 
@@ -147,11 +163,12 @@ class AuthService:
             "message": "Telegram authentication successful"
         }
 
-    async def refresh_tokens(self, refresh_token: str) -> Dict[str, Any]:
+    async def refresh_tokens(self, db: AsyncSession, refresh_token: str) -> Dict[str, Any]:
         """
         Refresh access token using refresh token.
 
         Args:
+            db: Database session
             refresh_token: Refresh token
 
         Returns:
@@ -170,7 +187,7 @@ class AuthService:
         if not payload:
             raise AuthenticationError("Failed to generate valid tokens")
 
-        user = await self._find_user_by_id(payload.get("user_id"))
+        user = await self._find_user_by_id(db, payload.get("user_id"))
         if not user or not user.is_active:
             # Blacklist the new tokens
             jwt_manager.blacklist_token(tokens["access_token"])
@@ -193,6 +210,8 @@ class AuthService:
         """
         success = True
 
+        _token_cache.pop(_token_cache_key(access_token), None)
+
         # Blacklist access token
         if not jwt_manager.blacklist_token(access_token):
             success = False
@@ -220,11 +239,18 @@ class AuthService:
             Success status
         """
         jwt_manager.blacklist_user_tokens(user_id)
+
+        # Drop cached verifications of the user's tokens
+        for key, (cached_user_id, _) in list(_token_cache.items()):
+            if cached_user_id == user_id:
+                _token_cache.pop(key, None)
+
         logger.info(f"All sessions terminated for user: {user_id}")
         return True
 
     async def change_password(
         self,
+        db: AsyncSession,
         user_id: int,
         current_password: str,
         new_password: str
@@ -233,6 +259,7 @@ class AuthService:
         Change user password with validation.
 
         Args:
+            db: Database session
             user_id: User ID
             current_password: Current password
             new_password: New password
@@ -243,7 +270,7 @@ class AuthService:
         Raises:
             AuthenticationError: Password change failed
         """
-        user = await self._find_user_by_id(user_id)
+        user = await self._find_user_by_id(db, user_id)
         if not user:
             raise AuthenticationError("User not found")
 
@@ -263,7 +290,7 @@ class AuthService:
         # Update password
         user.password_hash = new_hash
         user.password_changed_at = datetime.utcnow()
-        await self.db.commit()
+        await db.commit()
 
         # Blacklist all existing sessions
         await self.logout_all_user_sessions(user.id)
@@ -273,6 +300,7 @@ class AuthService:
 
     async def register_admin_user(
         self,
+        db: AsyncSession,
         username: str,
         password: str,
         first_name: str,
@@ -284,6 +312,7 @@ class AuthService:
         Register new admin/manager user.
 
         Args:
+            db: Database session
             username: Username
             password: Plain password
             first_name: First name
@@ -305,13 +334,13 @@ class AuthService:
             raise AuthenticationError("Invalid email format")
 
         # Check if username already exists
-        existing_user = await self._find_user_by_credentials(username)
+        existing_user = await self._find_user_by_credentials(db, username)
         if existing_user:
             raise AuthenticationError("Username already exists")
 
         # Check if email already exists
         if email:
-            existing_email = await self._find_user_by_email(email)
+            existing_email = await self._find_user_by_email(db, email)
             if existing_email:
                 raise AuthenticationError("Email already exists")
 
@@ -332,41 +361,49 @@ class AuthService:
             email=email,
             password_hash=password_hash,
             role=role,
-            is_admin=role == UserRole.ADMIN,
             password_changed_at=datetime.utcnow()
         )
 
-        self.db.add(user)
-        await self.db.commit()
-        await self.db.refresh(user)
+        db.add(user)
+        await db.commit()
+        await db.refresh(user)
 
         logger.info(f"New admin user registered: {user.id} ({username})")
         return user
 
-    async def get_current_user(self, token: str) -> Optional[User]:
+    async def get_current_user(self, db: AsyncSession, token: str) -> Optional[User]:
         """
         Get current user from token.
 
         Args:
+            db: Database session
             token: Access token
 
         Returns:
             User if valid, None otherwise
         """
-        payload = jwt_manager.verify_token(token)
-        if not payload:
-            return None
+        cache_key = _token_cache_key(token)
+        cached = _token_cache.get(cache_key)
 
-        user_id = payload.get("user_id")
-        if not user_id:
-            return None
+        if cached and cached[1] > time.time():
+            user_id = cached[0]
+        else:
+            payload = jwt_manager.verify_token(token)
+            if not payload:
+                return None
 
-        # Check user blacklist
-        token_iat = payload.get("iat", 0)
-        if jwt_manager.is_user_blacklisted(user_id, token_iat):
-            return None
+            user_id = payload.get("user_id")
+            if not user_id:
+                return None
+
+            # Check user blacklist
+            token_iat = payload.get("iat", 0)
+            if jwt_manager.is_user_blacklisted(user_id, token_iat):
+                return None
 
-        user = await self._find_user_by_id(user_id)
+            _token_cache[cache_key] = (user_id, payload["exp"])
+
+        user = await self._find_user_by_id(db, user_id)
         if not user or not user.is_active:
             return None
 
@@ -385,6 +422,19 @@ class AuthService:
         """
         return user.has_permission(permission)
 
+    async def check_permissions(self, user: User, permissions: Sequence[str]) -> Dict[str, bool]:
+        """
+        Check several permissions at once.
+
+        Args:
+            user: User object
+            permissions: Permission strings
+
+        Returns:
+            Dictionary mapping each permission to whether user has it
+        """
+        return {permission: user.has_permission(permission) for permission in permissions}
+
     async def require_permission(self, user: User, permission: str) -> None:
         """
         Require user to have specific permission.
@@ -400,30 +450,30 @@ class AuthService:
             raise AuthorizationError(f"Permission required: {permission}")
 
     # Private methods
-    async def _find_user_by_credentials(self, username: str) -> Optional[User]:
+    async def _find_user_by_credentials(self, db: AsyncSession, username: str) -> Optional[User]:
         """Find user by username or email."""
         stmt = select(User).where(
             (User.username == username) | (User.email == username)
         )
-        result = await self.db.execute(stmt)
+        result = await db.execute(stmt)
         return result.scalar_one_or_none()
 
-    async def _find_user_by_telegram_id(self, telegram_id: int) -> Optional[User]:
+    async def _find_user_by_telegram_id(self, db: AsyncSession, telegram_id: int) -> Optional[User]:
         """Find user by Telegram ID."""
         stmt = select(User).where(User.telegram_id == telegram_id)
-        result = await self.db.execute(stmt)
+        result = await db.execute(stmt)
         return result.scalar_one_or_none()
 
-    async def _find_user_by_id(self, user_id: int) -> Optional[User]:
+    async def _find_user_by_id(self, db: AsyncSession, user_id: int) -> Optional[User]:
         """Find user by ID."""
         stmt = select(User).where(User.id == user_id)
-        result = await self.db.execute(stmt)
+        result = await db.execute(stmt)
         return result.scalar_one_or_none()
 
-    async def _find_user_by_email(self, email: str) -> Optional[User]:
+    async def _find_user_by_email(self, db: AsyncSession, email: str) -> Optional[User]:
         """Find user by email."""
         stmt = select(User).where(User.email == email)
-        result = await self.db.execute(stmt)
+        result = await db.execute(stmt)
         return result.scalar_one_or_none()
 
     async def _generate_tokens(self, user: User) -> Dict[str, Any]:
@@ -445,21 +495,21 @@ class AuthService:
             "expires_in": settings.access_token_expire_minutes * 60
         }
 
-    async def _handle_failed_login(self, user: User, client_ip: Optional[str] = None):
+    async def _handle_failed_login(self, db: AsyncSession, user: User, client_ip: Optional[str] = None):
         """Handle failed login attempt."""
         user.increment_failed_attempts(self.max_failed_attempts, self.lockout_minutes)
-        await self.db.commit()
+        await db.commit()
 
         if client_ip:
             rate_limiter.record_attempt(f"auth:{client_ip}")
 
-    async def _handle_successful_login(self, user: User):
+    async def _handle_successful_login(self, db: AsyncSession, user: User):
         """Handle successful login."""
         user.reset_failed_attempts()
         user.update_last_login()
-        await self.db.commit()
+        await db.commit()
 
-    async def _create_telegram_user(self, telegram_data: Dict[str, Any]) -> User:
+    async def _create_telegram_user(self, db: AsyncSession, telegram_data: Dict[str, Any]) -> User:
         """Create new user from Telegram data."""
         user = User(
             telegram_id=telegram_data["id"],
@@ -469,14 +519,14 @@ class AuthService:
             role=UserRole.USER
         )
 
-        self.db.add(user)
-        await self.db.commit()
-        await self.db.refresh(user)
+        db.add(user)
+        await db.commit()
+        await db.refresh(user)
 
         logger.info(f"New Telegram user created: {user.id} (telegram_id: {user.telegram_id})")
         return user
 
-    async def _update_user_from_telegram(self, user: User, telegram_data: Dict[str, Any]):
+    async def _update_user_from_telegram(self, db: AsyncSession, user: User, telegram_data: Dict[str, Any]):
         """Update user information from Telegram data."""
         updated = False
 
@@ -494,10 +544,13 @@ class AuthService:
             updated = True
 
         if updated:
-            await self.db.commit()
+            await db.commit()
+
+
+auth_service = AuthService()
 
 
 # Convenience functions for dependency injection
-async def get_auth_service(db: AsyncSession) -> AuthService:
+async def get_auth_service() -> AuthService:
     """Get authentication service instance."""
-    return AuthService(db)
\ No newline at end of file
+    return auth_service
\ No newline at end of file
@@ -0,0 +1,56 @@
+"""Cart service."""
+
+from decimal import Decimal
+from typing import Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func
+
+from app.models.cart import Cart, CartItem
+from app.models.product import Product
+
+
+class CartService:
+    """Cart service for managing shopping carts."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def cart_totals(self, cart_id: int) -> Tuple[Decimal, int]:
+        """
+        Calculate cart totals in the database.
+
+        Args:
+            cart_id: Cart ID
+
+        Returns:
+            Tuple of total amount and total items count
+        """
+        result = await self.db.execute(
+            select(
+                func.coalesce(func.sum(CartItem.quantity * Product.price), 0),
+                func.coalesce(func.sum(CartItem.quantity), 0)
+            )
+            .join(Product, Product.id == CartItem.product_id)
+            .where(
+                CartItem.cart_id == cart_id,
+                CartItem.is_deleted == False
+            )
+        )
+        total_amount, total_items = result.one()
+        return Decimal(str(total_amount)).quantize(Decimal("0.01")), int(total_items)
+
+    async def get_cart_totals(self, cart: Cart) -> Tuple[Decimal, int]:
+        """
+        Get cart totals, preferring the denormalized columns.
+
+        Falls back to cart_totals when the cart has no cached totals yet.
+
+        Args:
+            cart: Cart
+
+        Returns:
+            Tuple of total amount and total items count
+        """
+        if cart.total_amount_cached is not None and cart.total_items_cached is not None:
+            return cart.total_amount, cart.total_items
+        return await self.cart_totals(cart.id)
@@ -3,7 +3,7 @@
 import asyncio
 import logging
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Set
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_
 from sqlalchemy.orm import selectinload
@@ -20,10 +20,18 @@ from app.models.notification import (
 
 logger = logging.getLogger(__name__)
 
+# Maximum notifications handled per scheduler run
+NOTIFICATION_BATCH_SIZE = 500
+# Sent statuses are committed this often, a crash resends at most one chunk
+NOTIFICATION_COMMIT_CHUNK = 50
+
 
 class NotificationService:
     """Enhanced service for sending Telegram notifications with comprehensive tracking."""
 
+    # Strong references to fire-and-forget admin notifications until they finish
+    _background_tasks: Set[asyncio.Task] = set()
+
     def __init__(self, db: AsyncSession):
         self.db = db
 
@@ -73,33 +81,36 @@ class NotificationService:
             await self.db.rollback()
             return None
 
+    async def _deliver_telegram_message(self, notification: Notification) -> None:
+        """Send Telegram message without touching notification status."""
+        # Prepare inline keyboard if provided
+        reply_markup = None
+        if notification.inline_keyboard:
+            from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
+            keyboard = InlineKeyboardMarkup()
+            for row in notification.inline_keyboard.get('inline_keyboard', []):
+                keyboard_row = []
+                for button in row:
+                    keyboard_row.append(
+                        InlineKeyboardButton(
+                            text=button['text'],
+                            callback_data=button.get('callback_data')
+                        )
+                    )
+                keyboard.row(*keyboard_row)
+            reply_markup = keyboard
+
+        await bot.send_message(
+            chat_id=notification.target_telegram_id,
+            text=notification.message,
+            parse_mode="HTML",
+            reply_markup=reply_markup
+        )
+
     async def _send_telegram_message(self, notification: Notification) -> bool:
         """Send actual Telegram message."""
         try:
-            # Prepare inline keyboard if provided
-            reply_markup = None
-            if notification.inline_keyboard:
-                from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
-                keyboard = InlineKeyboardMarkup()
-                for row in notification.inline_keyboard.get('inline_keyboard', []):
-                    keyboard_row = []
-                    for button in row:
-                        keyboard_row.append(
-                            InlineKeyboardButton(
-                                text=button['text'],
-                                callback_data=button.get('callback_data')
-                            )
-                        )
-                    keyboard.row(*keyboard_row)
-                reply_markup = keyboard
-
-            # Send message
-            message_result = await bot.send_message(
-                chat_id=notification.target_telegram_id,
-                text=notification.message,
-                parse_mode="HTML",
-                reply_markup=reply_markup
-            )
+            await self._deliver_telegram_message(notification)
 
             # Update notification status
             notification.status = NotificationStatus.SENT
@@ -120,6 +131,32 @@ class NotificationService:
 
             return False
 
+    async def _send_telegram_messages(self, notifications: List[Notification]) -> int:
+        """
+        Send batch of notifications, committing status changes in chunks.
+
+        Returns:
+            Number of notifications sent
+        """
+        sent_count = 0
+        for start in range(0, len(notifications), NOTIFICATION_COMMIT_CHUNK):
+            sent_ids = []
+            for notification in notifications[start:start + NOTIFICATION_COMMIT_CHUNK]:
+                try:
+                    await self._deliver_telegram_message(notification)
+                    sent_ids.append(notification.id)
+                except Exception as e:
+                    logger.error(f"Error sending notification {notification.id}: {e}")
+                    notification.status = NotificationStatus.FAILED
+                    notification.error_message = str(e)
+                    notification.retry_count += 1
+
+            await Notification.mark_sent_bulk(self.db, sent_ids)
+            await self.db.commit()
+            sent_count += len(sent_ids)
+
+        return sent_count
+
     # Order notification methods
     async def notify_order_created(self, order: Order) -> bool:
         """Notify user and admin about new order."""
@@ -577,19 +614,10 @@ class NotificationService:
                         Notification.scheduled_at <= current_time,
                         Notification.is_deleted == False
                     )
-                )
+                ).limit(NOTIFICATION_BATCH_SIZE)
             )
 
-            notifications = result.scalars().all()
-            sent_count = 0
-
-            for notification in notifications:
-                try:
-                    success = await self._send_telegram_message(notification)
-                    if success:
-                        sent_count += 1
-                except Exception as e:
-                    logger.error(f"Error processing notification {notification.id}: {e}")
+            sent_count = await self._send_telegram_messages(result.scalars().all())
 
             logger.info(f"Processed {sent_count} scheduled notifications")
             return sent_count
@@ -608,19 +636,10 @@ class NotificationService:
                         Notification.retry_count < max_retries,
                         Notification.is_deleted == False
                     )
-                )
+                ).limit(NOTIFICATION_BATCH_SIZE)
             )
 
-            notifications = result.scalars().all()
-            retried_count = 0
-
-            for notification in notifications:
-                try:
-                    success = await self._send_telegram_message(notification)
-                    if success:
-                        retried_count += 1
-                except Exception as e:
-                    logger.error(f"Error retrying notification {notification.id}: {e}")
+            retried_count = await self._send_telegram_messages(result.scalars().all())
 
             logger.info(f"Retried {retried_count} failed notifications")
             return retried_count
@@ -688,7 +707,7 @@ class NotificationService:
     # Legacy compatibility methods (kept for backward compatibility)
     @staticmethod
     async def send_admin_notification(message: str) -> bool:
-        """Legacy method - send notification to admin."""
+        """Send notification to admin. Uses only the bot, no database session."""
         try:
             await bot.send_message(
                 chat_id=settings.admin_id,
@@ -700,6 +719,14 @@ class NotificationService:
             logger.error(f"Error sending admin notification: {e}")
             return False
 
+    @classmethod
+    def schedule_admin_notification(cls, message: str) -> asyncio.Task:
+        """Send admin notification in the background so the caller can release its DB session."""
+        task = asyncio.create_task(cls.send_admin_notification(message))
+        cls._background_tasks.add(task)
+        task.add_done_callback(cls._background_tasks.discard)
+        return task
+
     @staticmethod
     async def send_user_notification(telegram_id: int, message: str) -> bool:
         """Legacy method - send notification to user."""
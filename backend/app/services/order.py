@@ -1,14 +1,14 @@
 """Enhanced order service with workflow integration."""
 
 import logging
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime, timedelta
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_, or_
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select, func, and_, or_, text
+from sqlalchemy.orm import selectinload, joinedload, raiseload
 
 from app.database import get_async_session
-from app.models.order import Order, OrderStatus, OrderItem, OrderPriority
+from app.models.order import Order, OrderStatus, OrderItem, OrderPriority, ACTIVE_ORDER_ITEMS, ORDER_STATUS_DISPLAY
 from app.models.order_status_history import OrderStatusHistory, StatusChangeReason
 from app.models.user import User
 from app.services.notification import NotificationService
@@ -221,6 +221,7 @@ class OrderService:
                 select(Order)
                 .options(
                     selectinload(Order.items).selectinload(OrderItem.product),
+                    ACTIVE_ORDER_ITEMS,
                     selectinload(Order.user),
                     selectinload(Order.payment)
                 )
@@ -235,6 +236,38 @@ class OrderService:
             logger.error(f"Error getting order {order_id}: {e}")
             return None
 
+    async def get_order_with_owner(
+        self,
+        order_id: int,
+        telegram_id: int,
+        db: Optional[AsyncSession] = None
+    ) -> Tuple[Optional[Order], bool]:
+        """Get order with its owner in one query and check ownership by Telegram ID."""
+        session = db or self.db
+        try:
+            result = await session.execute(
+                select(Order)
+                .options(
+                    selectinload(Order.items).selectinload(OrderItem.product),
+                    ACTIVE_ORDER_ITEMS,
+                    joinedload(Order.user)
+                )
+                .where(
+                    Order.id == order_id,
+                    Order.is_deleted == False
+                )
+            )
+            order = result.scalar_one_or_none()
+            if not order:
+                return None, False
+
+            is_owner = order.user is not None and order.user.telegram_id == telegram_id
+            return order, is_owner
+
+        except Exception as e:
+            logger.error(f"Error getting order {order_id} with owner: {e}")
+            return None, False
+
     async def cancel_order(
         self,
         order_id: int,
@@ -293,7 +326,11 @@ class OrderService:
                 select(Order)
                 .options(
                     selectinload(Order.items).selectinload(OrderItem.product),
-                    selectinload(Order.user)
+                    ACTIVE_ORDER_ITEMS,
+                    selectinload(Order.user),
+                    selectinload(Order.payment),
+                    # Fail loudly on relationships the listing did not load
+                    raiseload('*')
                 )
                 .where(
                     Order.status.in_([
@@ -322,7 +359,10 @@ class OrderService:
         try:
             query = select(Order).options(
                 selectinload(Order.items).selectinload(OrderItem.product),
-                selectinload(Order.user)
+                ACTIVE_ORDER_ITEMS,
+                selectinload(Order.user),
+                selectinload(Order.payment),
+                raiseload('*')
             ).where(
                 Order.status == status,
                 Order.is_deleted == False
@@ -424,7 +464,10 @@ class OrderService:
         try:
             query = select(Order).options(
                 selectinload(Order.items).selectinload(OrderItem.product),
-                selectinload(Order.user)
+                ACTIVE_ORDER_ITEMS,
+                selectinload(Order.user),
+                selectinload(Order.payment),
+                raiseload('*')
             ).where(
                 Order.priority == priority,
                 Order.is_deleted == False
@@ -581,6 +624,33 @@ class OrderService:
             logger.error(f"Error scheduling delivery for order {order_id}: {e}")
             raise
 
+    async def get_daily_kpis(self, db: AsyncSession, days: int = 7) -> List[Dict[str, Any]]:
+        """Get per-day order KPIs from the mv_order_kpis_daily roll-up view."""
+        try:
+            result = await db.execute(
+                text(
+                    "SELECT day, status, orders_count, avg_preparation_duration, "
+                    "avg_total_duration, overdue_count "
+                    "FROM mv_order_kpis_daily WHERE day >= :since ORDER BY day DESC, status"
+                ),
+                {"since": datetime.utcnow().date() - timedelta(days=days)}
+            )
+            return [
+                {
+                    'day': row.day.date().isoformat(),
+                    'status': row.status,
+                    'orders_count': row.orders_count,
+                    'avg_preparation_duration': round(float(row.avg_preparation_duration), 1) if row.avg_preparation_duration is not None else None,
+                    'avg_total_duration': round(float(row.avg_total_duration), 1) if row.avg_total_duration is not None else None,
+                    'overdue_count': row.overdue_count
+                }
+                for row in result.all()
+            ]
+
+        except Exception as e:
+            logger.error(f"Error getting daily order KPIs: {e}")
+            return []
+
     async def get_dashboard_data(self, db: AsyncSession) -> Dict[str, Any]:
         """Get comprehensive dashboard data for admin interface."""
         try:
@@ -598,15 +668,21 @@ class OrderService:
                 limit=10
             )
 
-            # Recent orders
+            # Recent orders; plain rows, the card needs no ORM instances or user
             recent_result = await db.execute(
-                select(Order)
-                .options(selectinload(Order.user))
+                select(
+                    Order.id,
+                    Order.customer_name,
+                    Order.total_amount,
+                    Order.status,
+                    Order.created_at,
+                    Order.priority
+                )
                 .where(Order.is_deleted == False)
                 .order_by(Order.created_at.desc())
                 .limit(20)
             )
-            recent_orders = recent_result.scalars().all()
+            recent_orders = recent_result.all()
 
             # Performance metrics
             today = datetime.utcnow().date()
@@ -654,7 +730,7 @@ class OrderService:
                         'customer_name': order.customer_name,
                         'total_amount': order.total_amount,
                         'status': order.status.value,
-                        'status_display': order.status_display,
+                        'status_display': ORDER_STATUS_DISPLAY.get(order.status, order.status.value),
                         'created_at': order.created_at.isoformat(),
                         'priority': order.priority.value
                     }
@@ -664,7 +740,8 @@ class OrderService:
                     'avg_preparation_time_today': round(avg_prep_time, 1) if avg_prep_time else 0,
                     'overdue_count': len(overdue_orders),
                     'vip_count': len(vip_orders)
-                }
+                },
+                'daily_kpis': await self.get_daily_kpis(db)
             }
 
         except Exception as e:
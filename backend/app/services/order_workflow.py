@@ -161,7 +161,7 @@ class OrderWorkflow:
         await self._send_status_change_notifications(order, old_status, new_status)
 
         # Execute post-transition hooks
-        await self._execute_post_transition_hooks(order, old_status, new_status, history)
+        await self._execute_post_transition_hooks(order, old_status, new_status, history.id)
 
         logger.info(f"Order {order.id} status changed from {old_status.value} to {new_status.value}")
 
@@ -181,20 +181,7 @@ class OrderWorkflow:
 
     async def _update_status_timestamps(self, order: Order, status: OrderStatus, auto_calculate: bool) -> None:
         """Update status-specific timestamp fields."""
-        now = datetime.utcnow()
-
-        timestamp_fields = {
-            OrderStatus.PENDING: 'status_pending_at',
-            OrderStatus.CONFIRMED: 'status_confirmed_at',
-            OrderStatus.PREPARING: 'status_preparing_at',
-            OrderStatus.READY: 'status_ready_at',
-            OrderStatus.COMPLETED: 'status_completed_at',
-            OrderStatus.CANCELLED: 'status_cancelled_at',
-        }
-
-        field_name = timestamp_fields.get(status)
-        if field_name:
-            setattr(order, field_name, now)
+        order.set_status_timestamp(status, datetime.utcnow())
 
         # Auto-calculate timing fields if requested
         if auto_calculate:
@@ -222,20 +209,11 @@ class OrderWorkflow:
                 order.actual_preparation_start = now
 
         elif status == OrderStatus.READY:
-            # Mark actual preparation end and calculate duration
+            # Mark actual preparation end; preparation_duration is generated from it
             if not order.actual_preparation_end:
                 order.actual_preparation_end = now
 
-            if order.actual_preparation_start and not order.preparation_duration:
-                duration = now - order.actual_preparation_start
-                order.preparation_duration = int(duration.total_seconds() / 60)
-
         elif status == OrderStatus.COMPLETED:
-            # Calculate total duration
-            if not order.total_duration:
-                duration = now - order.created_at
-                order.total_duration = int(duration.total_seconds() / 60)
-
             # Mark delivery completed
             if order.delivery_type == "delivery":
                 order.delivery_completed_at = now
@@ -268,7 +246,7 @@ class OrderWorkflow:
         order: Order,
         old_status: OrderStatus,
         new_status: OrderStatus,
-        history: OrderStatusHistory
+        history_id: int
     ) -> None:
         """Execute post-transition hooks and automation."""
         try:
@@ -276,7 +254,7 @@ class OrderWorkflow:
             await self._schedule_automatic_transitions(order, new_status)
 
             # Update workflow metadata
-            await self._update_workflow_metadata(order, new_status, history)
+            await self._update_workflow_metadata(order, new_status, history_id)
 
             # Execute status-specific hooks
             if new_status == OrderStatus.CONFIRMED:
@@ -303,11 +281,11 @@ class OrderWorkflow:
         self,
         order: Order,
         new_status: OrderStatus,
-        history: OrderStatusHistory
+        history_id: int
     ) -> None:
         """Update workflow metadata after status change."""
         order.set_workflow_metadata_value(f'status_{new_status.value}_at', datetime.utcnow().isoformat())
-        order.set_workflow_metadata_value('last_status_change_id', history.id)
+        order.set_workflow_metadata_value('last_status_change_id', history_id)
         order.set_workflow_metadata_value('workflow_version', '1.0')
 
     # Status-specific hooks
@@ -406,42 +384,57 @@ class OrderWorkflow:
             'failure_count': 0
         }
 
+        # Load orders and their last status change time in two queries
+        orders_result = await self.db.execute(
+            select(Order)
+            .where(Order.id.in_(order_ids), Order.is_deleted == False)
+        )
+        orders = {order.id: order for order in orders_result.scalars().all()}
+
+        last_changes_result = await self.db.execute(
+            select(OrderStatusHistory.order_id, func.max(OrderStatusHistory.changed_at))
+            .where(OrderStatusHistory.order_id.in_(list(orders)))
+            .group_by(OrderStatusHistory.order_id)
+        )
+        last_changes = dict(last_changes_result.all())
+
+        transitioned = []
+        history_rows = []
+
         for order_id in order_ids:
             results['total_processed'] += 1
 
+            order = orders.get(order_id)
+            if not order:
+                results['failed'].append({
+                    'order_id': order_id,
+                    'error': 'Order not found'
+                })
+                results['failure_count'] += 1
+                continue
+
             try:
-                # Get order
-                order_result = await self.db.execute(
-                    select(Order)
-                    .where(Order.id == order_id, Order.is_deleted == False)
-                )
-                order = order_result.scalar_one_or_none()
-
-                if not order:
-                    results['failed'].append({
-                        'order_id': order_id,
-                        'error': 'Order not found'
-                    })
-                    results['failure_count'] += 1
-                    continue
-
-                # Transition status
-                updated_order, history = await self.transition_status(
-                    order=order,
-                    new_status=new_status,
+                old_status = order.status
+                self._validate_transition(old_status, new_status)
+
+                row = OrderStatusHistory.status_change_values(
+                    order_id=order.id,
+                    from_status=old_status.value if old_status else None,
+                    to_status=new_status.value,
                     reason=reason,
                     changed_by_user_id=changed_by_user_id,
-                    notes=notes,
-                    validate=True
+                    notes=notes
                 )
+                last_changed_at = last_changes.get(order.id)
+                if old_status != new_status and last_changed_at:
+                    duration = datetime.utcnow() - last_changed_at
+                    row['duration_from_previous'] = int(duration.total_seconds() / 60)
 
-                results['successful'].append({
-                    'order_id': order_id,
-                    'old_status': history.from_status,
-                    'new_status': history.to_status,
-                    'history_id': history.id
-                })
-                results['success_count'] += 1
+                order.status = new_status
+                await self._update_status_timestamps(order, new_status, True)
+
+                transitioned.append((order, old_status))
+                history_rows.append(row)
 
             except Exception as e:
                 results['failed'].append({
@@ -451,6 +444,43 @@ class OrderWorkflow:
                 results['failure_count'] += 1
                 logger.error(f"Failed to transition order {order_id}: {e}")
 
+        # Write all history records in one round-trip
+        try:
+            history_ids = await OrderStatusHistory.create_status_changes_bulk(self.db, history_rows)
+            await self.db.commit()
+        except Exception as e:
+            # Nothing was saved, undo the status changes of every validated order.
+            # IDs are read first, rollback expires the orders
+            failed_ids = [order.id for order, _ in transitioned]
+            await self.db.rollback()
+            logger.error(f"Failed to save bulk status transition: {e}")
+            for order_id in failed_ids:
+                results['failed'].append({
+                    'order_id': order_id,
+                    'error': str(e)
+                })
+                results['failure_count'] += 1
+            transitioned, history_ids = [], []
+
+        for (order, old_status), history_id in zip(transitioned, history_ids):
+            await self._send_status_change_notifications(order, old_status, new_status)
+            await self._execute_post_transition_hooks(order, old_status, new_status, history_id)
+
+            results['successful'].append({
+                'order_id': order.id,
+                'old_status': old_status.value,
+                'new_status': new_status.value,
+                'history_id': history_id
+            })
+            results['success_count'] += 1
+
+        # Persist metadata and flags set by the hooks, status changes are already saved
+        try:
+            await self.db.commit()
+        except Exception as e:
+            await self.db.rollback()
+            logger.error(f"Failed to save post-transition metadata of bulk status transition: {e}")
+
         logger.info(
             f"Bulk status transition completed: {results['success_count']} successful, "
             f"{results['failure_count']} failed"
@@ -1,19 +1,37 @@
 """Payment service for handling payment business logic."""
 
+import json
 import logging
 from datetime import datetime
 from typing import Optional, Dict, Any
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, text
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.orm import selectinload
 
 from app.models.payment import Payment, PaymentStatus, PaymentMethod
 from app.models.order import Order, OrderStatus
 from app.models.user import User
 from app.services.notification import NotificationService
+from app.utils.cache import redis_client
 
 logger = logging.getLogger(__name__)
 
+# Pre-checkout snapshot of a payment kept in Redis
+PAYMENT_CACHE_TTL = 3600  # seconds
+
+# SQLSTATE raised by FOR UPDATE NOWAIT on a row locked by another transaction
+LOCK_NOT_AVAILABLE = "55P03"
+
+
+def _payment_cache_key(payment_id: int) -> str:
+    return f"pay:{payment_id}"
+
+
+class PaymentLockedError(Exception):
+    """Payment row is locked by a concurrent handler."""
+    pass
+
 
 class PaymentService:
     """Service for handling payment operations."""
@@ -42,6 +60,7 @@ class PaymentService:
             payment = Payment(
                 order_id=order.id,
                 amount=order.total_amount,
+                amount_kopecks=round(order.total_amount * 100),
                 payment_method=payment_method,
                 payment_metadata=metadata or {}
             )
@@ -50,6 +69,8 @@ class PaymentService:
             await self.db.commit()
             await self.db.refresh(payment)
 
+            await self.cache_payment(payment)
+
             logger.info(f"Payment created: {payment.id} for order {order.id}")
             return payment
 
@@ -58,15 +79,101 @@ class PaymentService:
             logger.error(f"Failed to create payment for order {order.id}: {e}")
             raise
 
-    async def get_payment_by_id(self, payment_id: int) -> Optional[Payment]:
-        """Get payment by ID with order details."""
-        result = await self.db.execute(
+    async def get_payment_by_id(self, payment_id: int, for_update: bool = False) -> Optional[Payment]:
+        """
+        Get payment by ID with order details.
+
+        Args:
+            payment_id: Payment ID
+            for_update: Lock the payment row until the transaction ends.
+
+        Returns:
+            Payment instance or None
+
+        Raises:
+            PaymentLockedError: Row is locked by another transaction (for_update only)
+        """
+        query = (
             select(Payment)
             .options(selectinload(Payment.order))
             .where(Payment.id == payment_id, Payment.is_deleted == False)
         )
+        if not for_update:
+            result = await self.db.execute(query)
+            return result.scalar_one_or_none()
+
+        # Fail fast instead of waiting for a concurrent handler to finish
+        try:
+            result = await self.db.execute(query.with_for_update(nowait=True))
+        except DBAPIError as e:
+            if getattr(e.orig, "sqlstate", None) == LOCK_NOT_AVAILABLE:
+                raise PaymentLockedError(f"Payment {payment_id} is locked") from e
+            raise
         return result.scalar_one_or_none()
 
+    @staticmethod
+    async def cache_payment(payment: Payment) -> None:
+        """Cache the payment fields checked by the pre-checkout handler."""
+        snapshot = {
+            "s": payment.status.value,
+            "a": payment.amount_kopecks,
+            "o": payment.order_id
+        }
+        try:
+            await redis_client.setex(
+                _payment_cache_key(payment.id), PAYMENT_CACHE_TTL, json.dumps(snapshot)
+            )
+        except Exception as e:
+            logger.warning(f"Failed to cache payment {payment.id}: {e}")
+
+    @staticmethod
+    async def get_cached_payment(payment_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Get cached payment snapshot.
+
+        Returns:
+            Dictionary with status ("s"), amount in kopecks ("a") and order ID ("o"),
+            or None on a cache miss or Redis error
+        """
+        try:
+            cached = await redis_client.get(_payment_cache_key(payment_id))
+        except Exception as e:
+            logger.warning(f"Failed to read cached payment {payment_id}: {e}")
+            return None
+        return json.loads(cached) if cached else None
+
+    @staticmethod
+    async def invalidate_cached_payment(payment_id: int) -> None:
+        """Drop cached payment snapshot."""
+        try:
+            await redis_client.delete(_payment_cache_key(payment_id))
+        except Exception as e:
+            logger.warning(f"Failed to invalidate cached payment {payment_id}: {e}")
+
+    async def try_lock_order(self, order_id: int) -> bool:
+        """
+        Take a transaction-scoped advisory lock for an order.
+
+        Serializes concurrent processing of the same order, e.g. when Telegram
+        redelivers a successful_payment update. The lock is released when the
+        current transaction ends.
+
+        Args:
+            order_id: Order ID to lock
+
+        Returns:
+            True if the lock was acquired (always on non-PostgreSQL databases),
+            False if another transaction holds it
+        """
+        if self.db.get_bind().dialect.name != "postgresql":
+            return True
+
+        result = await self.db.execute(
+            text("SELECT pg_try_advisory_xact_lock(:key)"),
+            {"key": order_id}
+        )
+        return bool(result.scalar())
+
     async def get_payment_by_order_id(self, order_id: int) -> Optional[Payment]:
         """Get payment by order ID."""
         result = await self.db.execute(
@@ -123,6 +230,9 @@ class PaymentService:
             await self.db.commit()
             await self.db.refresh(payment)
 
+            # Payment is no longer pending, pre-checkout must not approve it from cache
+            await self.invalidate_cached_payment(payment.id)
+
             # Update order status based on payment status
             await self._update_order_status_based_on_payment(payment)
 
@@ -155,16 +265,12 @@ class PaymentService:
                 # Payment successful - confirm order if it's pending
                 if order.status == OrderStatus.PENDING:
                     order.status = OrderStatus.CONFIRMED
-                    # Set confirmation timestamp
-                    if hasattr(order, 'status_confirmed_at'):
-                        order.status_confirmed_at = datetime.utcnow()
+                    order.set_status_timestamp(OrderStatus.CONFIRMED, datetime.utcnow())
             elif payment.status == PaymentStatus.FAILED:
                 # Payment failed - mark order as failed instead of cancelled for better tracking
                 if order.status == OrderStatus.PENDING:
                     order.status = OrderStatus.FAILED
-                    # Set failure timestamp if available
-                    if hasattr(order, 'status_failed_at'):
-                        order.status_failed_at = datetime.utcnow()
+                    order.set_status_timestamp(OrderStatus.FAILED, datetime.utcnow())
 
             # Save changes if status changed
             if order.status != old_status:
@@ -235,7 +341,7 @@ class PaymentService:
         telegram_payment_charge_id: str,
         provider_payment_charge_id: str,
         provider_data: Optional[Dict[str, Any]] = None
-    ) -> bool:
+    ) -> Optional[Payment]:
         """
         Process successful payment from Telegram.
 
@@ -247,24 +353,24 @@ class PaymentService:
             provider_data: Provider specific data
 
         Returns:
-            True if processed successfully, False otherwise
+            Updated payment with its order loaded, or None if not processed
         """
         try:
             payment = await self.get_payment_by_id(payment_id)
             if not payment:
                 logger.error(f"Payment {payment_id} not found")
-                return False
+                return None
 
             if payment.order_id != order_id:
                 logger.error(f"Payment {payment_id} does not belong to order {order_id}")
-                return False
+                return None
 
             if payment.status != PaymentStatus.PENDING:
                 logger.warning(f"Payment {payment_id} is not pending, current status: {payment.status}")
-                return False
+                return None
 
             # Update payment as successful
-            await self.update_payment_status(
+            payment = await self.update_payment_status(
                 payment=payment,
                 status=PaymentStatus.SUCCESS,
                 telegram_payment_charge_id=telegram_payment_charge_id,
@@ -273,11 +379,11 @@ class PaymentService:
             )
 
             logger.info(f"Payment {payment_id} processed successfully")
-            return True
+            return payment
 
         except Exception as e:
             logger.error(f"Failed to process successful payment {payment_id}: {e}")
-            return False
+            return None
 
     async def process_failed_payment(
         self,
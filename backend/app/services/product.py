@@ -1,13 +1,15 @@
 """Product service."""
 
+import logging
 from typing import List, Optional, Dict, Any, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, update, delete, or_, and_, desc, asc
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select, func, update, delete, or_, and_, desc, asc, text
+from sqlalchemy.orm import selectinload, raiseload
 from math import ceil
 
 from app.database import get_async_session
 from app.models.product import Product
+from app.models.cart import Cart, cart_totals_update, carts_with_product
 from app.models.category import Category
 from app.schemas.product import (
     ProductCreateRequest, ProductUpdateRequest, ProductFilters,
@@ -16,6 +18,8 @@ from app.schemas.product import (
     StockStatus
 )
 
+logger = logging.getLogger(__name__)
+
 
 class ProductService:
     """Product service for managing products."""
@@ -176,8 +180,9 @@ class ProductService:
             pagination = PaginationParams()
 
         async for db in self._get_session():
-            # Build base query
-            query = select(Product).options(selectinload(Product.category))
+            # Build base query; any relationship besides category must not
+            # be lazy loaded per product
+            query = select(Product).options(selectinload(Product.category), raiseload('*'))
 
             # Apply filters
             query = self._build_filters_query(query, filters)
@@ -261,6 +266,7 @@ class ProductService:
 
             db.add(product)
             await db.commit()
+            await self.refresh_catalog(db)
             await db.refresh(product)
 
             # Load category relationship
@@ -304,6 +310,7 @@ class ProductService:
                 setattr(product, field, value)
 
             await db.commit()
+            await self.refresh_catalog(db)
             await db.refresh(product)
 
             # Load category relationship
@@ -322,14 +329,15 @@ class ProductService:
                     .values(is_deleted=True, is_active=False)
                 )
                 await db.commit()
-                return result.rowcount > 0
             else:
                 # Hard delete
                 result = await db.execute(
                     delete(Product).where(Product.id == product_id)
                 )
                 await db.commit()
-                return result.rowcount > 0
+
+            await self.refresh_catalog(db)
+            return result.rowcount > 0
 
     async def search_products(self, search_term: str, limit: int = 50) -> List[Product]:
         """Search products by term."""
@@ -437,6 +445,11 @@ class ProductService:
                                     )
                                 )
                             )
+                            # Bulk UPDATE skips mapper events, refresh cart totals explicitly
+                            await db.execute(
+                                cart_totals_update()
+                                .where(Cart.id.in_(carts_with_product(product_id)))
+                            )
                         elif request.discount_percentage:
                             discount_multiplier = 1 - (request.discount_percentage / 100)
                             await db.execute(
@@ -460,6 +473,7 @@ class ProductService:
                     result.errors.append(f"Product {product_id}: {str(e)}")
 
             await db.commit()
+            await self.refresh_catalog(db)
             return result
 
     async def update_popularity_score(self, product_id: int, increment: int = 1) -> bool:
@@ -473,6 +487,42 @@ class ProductService:
             await db.commit()
             return result.rowcount > 0
 
+    async def refresh_catalog(self, db: AsyncSession) -> None:
+        """
+        Refresh mv_product_catalog after products were changed.
+
+        Runs after the product change is committed, so a failed refresh is
+        only logged and the catalog catches up on the next one.
+        """
+        try:
+            # CONCURRENTLY keeps the catalog readable by the storefront during refresh
+            await db.execute(text("REFRESH MATERIALIZED VIEW CONCURRENTLY mv_product_catalog"))
+            await db.commit()
+        except Exception as e:
+            await db.rollback()
+            logger.error(f"Failed to refresh product catalog: {e}")
+
+    async def get_catalog(
+        self,
+        category_id: Optional[int] = None,
+        limit: int = 50,
+        offset: int = 0
+    ) -> List[Dict[str, Any]]:
+        """Get storefront product cards from the mv_product_catalog view."""
+        query = (
+            "SELECT id, name, slug, effective_price, image_url, category_id, category_name, "
+            "popularity_score, sort_order FROM mv_product_catalog"
+        )
+        params: Dict[str, Any] = {"limit": limit, "offset": offset}
+        if category_id is not None:
+            query += " WHERE category_id = :category_id"
+            params["category_id"] = category_id
+        query += " ORDER BY popularity_score DESC, sort_order LIMIT :limit OFFSET :offset"
+
+        async for db in self._get_session():
+            result = await db.execute(text(query), params)
+            return [dict(row._mapping) for row in result.all()]
+
     # Legacy methods for backward compatibility
     async def get_all_products(self) -> List[Product]:
         """Get all active products (legacy method)."""
@@ -1,6 +1,9 @@
 """Telegram Payments service for handling payment operations."""
 
+import hashlib
+import hmac
 import logging
+import re
 from typing import Dict, Any, Optional, List
 from aiogram.types import LabeledPrice, InlineKeyboardMarkup, InlineKeyboardButton
 from aiogram import Bot
@@ -11,6 +14,24 @@ from app.models.payment import Payment, PaymentStatus
 
 logger = logging.getLogger(__name__)
 
+# Invoice payload format: "order_{order_id}_payment_{payment_id}_{signature}"
+INVOICE_PAYLOAD_TEMPLATE = "order_{order_id}_payment_{payment_id}_{signature}"
+# Signature is optional to keep invoices sent before it was introduced payable
+_INVOICE_PAYLOAD_RE = re.compile(r"order_(\d+)_payment_(\d+)(?:_([0-9a-f]{16}))?")
+PAYLOAD_SIGNATURE_LENGTH = 16
+
+# User-facing payment messages
+_SUCCESS_TMPL = (
+    "✅ <b>Платёж успешно обработан!</b>\n\n"
+    "💰 <b>Заказ:</b> #{order_id}\n"
+    "💳 <b>Сумма:</b> {amount}\n"
+    "📅 <b>Дата:</b> {date}\n\n"
+    "{charge_line}"
+    "📦 <b>Ваш заказ принят в обработку!</b>\n"
+    "🕐 Мы уведомим вас о готовности заказа."
+)
+_SUCCESS_CHARGE_LINE_TMPL = "🔗 <b>ID транзакции:</b> <code>{charge_id}</code>\n\n"
+
 
 class TelegramPaymentsService:
     """Service for handling Telegram Payments."""
@@ -51,10 +72,14 @@ class TelegramPaymentsService:
             # Invoice details
             title = "Оплата заказа в FrozenBot"
             description = f"Заказ #{order.id}\n"
-            description += f"Товаров: {len(order.items)}\n"
+            description += f"Товаров: {order.items_count}\n"
             description += f"Сумма: {order.formatted_total}"
 
-            payload = f"order_{order.id}_payment_{payment.id}"
+            payload = INVOICE_PAYLOAD_TEMPLATE.format(
+                order_id=order.id,
+                payment_id=payment.id,
+                signature=self.sign_payment(payment.id, payment.amount_kopecks)
+            )
             currency = "RUB"
 
             # Additional invoice parameters
@@ -162,7 +187,35 @@ class TelegramPaymentsService:
             }
 
     @staticmethod
-    def extract_payment_data_from_payload(payload: str) -> Optional[Dict[str, int]]:
+    def sign_payment(payment_id: int, amount_kopecks: int) -> str:
+        """
+        Sign payment ID and amount for the invoice payload.
+
+        Args:
+            payment_id: Payment ID
+            amount_kopecks: Payment amount in kopecks
+
+        Returns:
+            Truncated HMAC-SHA256 hex digest
+        """
+        return hmac.new(
+            settings.secret_key.encode(),
+            f"{payment_id}:{amount_kopecks}".encode(),
+            hashlib.sha256
+        ).hexdigest()[:PAYLOAD_SIGNATURE_LENGTH]
+
+    @staticmethod
+    def verify_payment_signature(payment_id: int, amount_kopecks: int, signature: Optional[str]) -> bool:
+        """Check payload signature against payment ID and amount in constant time."""
+        if not signature:
+            return False
+        return hmac.compare_digest(
+            TelegramPaymentsService.sign_payment(payment_id, amount_kopecks),
+            signature
+        )
+
+    @staticmethod
+    def extract_payment_data_from_payload(payload: str) -> Optional[Dict[str, Any]]:
         """
         Extract order and payment IDs from invoice payload.
 
@@ -170,18 +223,17 @@ class TelegramPaymentsService:
             payload: Invoice payload string
 
         Returns:
-            Dictionary with order_id and payment_id, or None if invalid
+            Dictionary with order_id, payment_id and signature (None for
+            unsigned payloads), or None if invalid
         """
-        try:
-            # Expected format: "order_{order_id}_payment_{payment_id}"
-            parts = payload.split("_")
-            if len(parts) == 4 and parts[0] == "order" and parts[2] == "payment":
-                return {
-                    "order_id": int(parts[1]),
-                    "payment_id": int(parts[3])
-                }
-        except (ValueError, IndexError):
-            pass
+        # Single precompiled match instead of split + per-part checks
+        match = _INVOICE_PAYLOAD_RE.fullmatch(payload) if payload else None
+        if match:
+            return {
+                "order_id": int(match.group(1)),
+                "payment_id": int(match.group(2)),
+                "signature": match.group(3)
+            }
 
         logger.warning(f"Invalid payment payload format: {payload}")
         return None
@@ -198,18 +250,13 @@ class TelegramPaymentsService:
         Returns:
             Formatted success message
         """
-        message = "✅ <b>Платёж успешно обработан!</b>\n\n"
-        message += f"💰 <b>Заказ:</b> #{order.id}\n"
-        message += f"💳 <b>Сумма:</b> {payment.formatted_amount}\n"
-        message += f"📅 <b>Дата:</b> {payment.created_at.strftime('%d.%m.%Y %H:%M')}\n\n"
-
-        if payment.telegram_payment_charge_id:
-            message += f"🔗 <b>ID транзакции:</b> <code>{payment.telegram_payment_charge_id}</code>\n\n"
-
-        message += "📦 <b>Ваш заказ принят в обработку!</b>\n"
-        message += "🕐 Мы уведомим вас о готовности заказа."
-
-        return message
+        charge_id = payment.telegram_payment_charge_id
+        return _SUCCESS_TMPL.format_map({
+            "order_id": order.id,
+            "amount": payment.formatted_amount,
+            "date": payment.created_at.strftime('%d.%m.%Y %H:%M'),
+            "charge_line": _SUCCESS_CHARGE_LINE_TMPL.format(charge_id=charge_id) if charge_id else ""
+        })
 
     @staticmethod
     def format_payment_failed_message(order: Order, error_message: Optional[str] = None) -> str:
@@ -5,7 +5,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
 from app.database import get_async_session
-from app.models.user import User
+from app.models.user import User, UserRole
 
 
 class UserService:
@@ -42,7 +42,8 @@ class UserService:
                     username=username,
                     first_name=first_name,
                     last_name=last_name,
-                    is_admin=telegram_id == 1050239011  # Admin ID from config
+                    # Admin ID from config
+                    role=UserRole.ADMIN if telegram_id == 1050239011 else UserRole.USER
                 )
                 db.add(user)
 
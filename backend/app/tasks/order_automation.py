@@ -177,57 +177,30 @@ class OrderAutomationTasks:
     @staticmethod
     async def calculate_order_metrics() -> Dict[str, Any]:
         """
-        Calculate and update order metrics.
+        Refresh daily order KPIs.
+        Durations are generated columns, so only the roll-up view needs updating,
+        plus filling status history durations missed at insert time.
         This should be run periodically (e.g., hourly).
         """
         results = {
             'task_started_at': datetime.utcnow().isoformat(),
-            'orders_updated': 0,
+            'history_durations_filled': 0,
             'errors': []
         }
 
         try:
             async with get_async_session() as db:
-                # Update preparation durations for orders that are ready/completed but missing duration
-                from sqlalchemy import select, and_
-                from app.models.order import Order, OrderStatus
-
-                orders_to_update = await db.execute(
-                    select(Order).where(
-                        and_(
-                            Order.status.in_([OrderStatus.READY, OrderStatus.COMPLETED]),
-                            Order.preparation_duration.is_(None),
-                            Order.actual_preparation_start.isnot(None),
-                            Order.actual_preparation_end.isnot(None)
-                        )
-                    )
-                )
-                orders = orders_to_update.scalars().all()
-
-                for order in orders:
-                    if order.actual_preparation_start and order.actual_preparation_end:
-                        duration = order.actual_preparation_end - order.actual_preparation_start
-                        order.preparation_duration = int(duration.total_seconds() / 60)
-                        results['orders_updated'] += 1
+                from sqlalchemy import text
+                from app.models.order_status_history import OrderStatusHistory
 
-                # Update total durations for completed orders
-                completed_orders = await db.execute(
-                    select(Order).where(
-                        and_(
-                            Order.status == OrderStatus.COMPLETED,
-                            Order.total_duration.is_(None),
-                            Order.status_completed_at.isnot(None)
-                        )
-                    )
+                results['history_durations_filled'] = await OrderStatusHistory.backfill_durations(
+                    db, only_missing=True
                 )
-                for order in completed_orders.scalars().all():
-                    if order.status_completed_at:
-                        duration = order.status_completed_at - order.created_at
-                        order.total_duration = int(duration.total_seconds() / 60)
-                        results['orders_updated'] += 1
 
+                # CONCURRENTLY keeps the view readable by dashboards during refresh
+                await db.execute(text("REFRESH MATERIALIZED VIEW CONCURRENTLY mv_order_kpis_daily"))
                 await db.commit()
-                logger.info(f"Order metrics updated: {results}")
+                logger.info("Order KPIs view refreshed")
 
         except Exception as e:
             error_msg = f"Error in calculate metrics task: {e}"
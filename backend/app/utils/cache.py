@@ -0,0 +1,8 @@
+"""Async Redis cache client."""
+
+import redis.asyncio as redis
+
+from app.config import settings
+
+# Shared async Redis client; connections are opened lazily on first command
+redis_client = redis.from_url(settings.redis_url, decode_responses=True)
@@ -1,13 +1,20 @@
 """Security utilities for password hashing, validation and other security features."""
 
+import asyncio
 import secrets
 import hashlib
+import logging
 import re
+import time
+from collections import deque
 from passlib.context import CryptContext
 from passlib.hash import bcrypt
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Deque, List, Tuple
 from datetime import datetime, timedelta
 
+from app.utils.cache import redis_client
+
+logger = logging.getLogger(__name__)
 
 # Password context using bcrypt
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -269,10 +276,154 @@ class RateLimiter:
                 del self._attempts[key]
 
 
+class RedisRateLimiter:
+    """Rate limiter shared between workers through Redis."""
+
+    # Fixed window: one atomic INCR, expiry is set by the first hit of the window
+    FIXED_WINDOW_SCRIPT = """
+local n = redis.call('INCR', KEYS[1])
+if n == 1 then
+    redis.call('PEXPIRE', KEYS[1], ARGV[1])
+end
+return {n, redis.call('PTTL', KEYS[1])}
+"""
+
+    # Sliding window: timestamps of hits in a sorted set
+    SLIDING_WINDOW_SCRIPT = """
+local now = tonumber(ARGV[2])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], 0, now - tonumber(ARGV[1]))
+redis.call('ZADD', KEYS[1], now, ARGV[3])
+redis.call('PEXPIRE', KEYS[1], ARGV[1])
+return {redis.call('ZCARD', KEYS[1]), tonumber(ARGV[1])}
+"""
+
+    def __init__(self, client=redis_client):
+        """Initialize rate limiter."""
+        # Scripts are loaded once and run with EVALSHA afterwards
+        self._fixed_window = client.register_script(self.FIXED_WINDOW_SCRIPT)
+        self._sliding_window = client.register_script(self.SLIDING_WINDOW_SCRIPT)
+        # Per-worker counter used while Redis is unavailable
+        self._fallback = BucketCounter()
+
+    async def is_allowed(
+        self,
+        key: str,
+        max_attempts: int = 5,
+        window_minutes: int = 15,
+        sliding_window: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Count request and check if it is allowed.
+
+        Args:
+            key: Unique identifier (IP, user_id, etc.)
+            max_attempts: Maximum attempts allowed
+            window_minutes: Time window in minutes
+            sliding_window: Use exact sliding window instead of fixed window
+
+        Returns:
+            Dict with allowed status and remaining attempts. If Redis is
+            unavailable, requests are counted by an in-process limiter instead.
+        """
+        window_ms = window_minutes * 60 * 1000
+
+        try:
+            if sliding_window:
+                now_ms = int(time.time() * 1000)
+                attempts, ttl_ms = await self._sliding_window(
+                    keys=[f"rl:{key}"],
+                    args=[window_ms, now_ms, f"{now_ms}:{secrets.token_hex(4)}"]
+                )
+            else:
+                attempts, ttl_ms = await self._fixed_window(keys=[f"rl:{key}"], args=[window_ms])
+        except Exception as e:
+            logger.warning(f"Rate limiter unavailable for key {key}, using in-process limits: {e}")
+            return await self._fallback.is_allowed(key, max_attempts, window_minutes)
+
+        return {
+            "allowed": attempts <= max_attempts,
+            "remaining": max(0, max_attempts - attempts),
+            "reset_time": datetime.utcnow() + timedelta(milliseconds=max(ttl_ms, 0)),
+            "current_attempts": attempts
+        }
+
+
+class BucketCounter:
+    """
+    In-process sliding window rate limiter with per-minute buckets.
+
+    Cheap enough for hot, per-worker limits that don't need cross-worker accuracy.
+    """
+
+    SHARDS = 16
+    MAX_KEYS_PER_SHARD = 10000
+
+    def __init__(self):
+        """Initialize bucket counter."""
+        # {key: deque([(bucket_minute, count), ...])} per shard
+        self._shards: List[Dict[str, Deque[Tuple[int, int]]]] = [{} for _ in range(self.SHARDS)]
+        self._locks = [asyncio.Lock() for _ in range(self.SHARDS)]
+
+    async def is_allowed(
+        self,
+        key: str,
+        max_attempts: int = 5,
+        window_minutes: int = 15
+    ) -> Dict[str, Any]:
+        """
+        Count request and check if it is allowed.
+
+        Args:
+            key: Unique identifier (IP, user_id, etc.)
+            max_attempts: Maximum attempts allowed
+            window_minutes: Time window in minutes
+
+        Returns:
+            Dict with allowed status and remaining attempts
+        """
+        current_minute = int(time.time()) // 60
+        oldest_minute = current_minute - window_minutes + 1
+        shard_index = hash(key) & (self.SHARDS - 1)
+        shard = self._shards[shard_index]
+
+        async with self._locks[shard_index]:
+            buckets = shard.get(key)
+            if buckets is None:
+                if len(shard) >= self.MAX_KEYS_PER_SHARD:
+                    self._evict_stale(shard, oldest_minute)
+                buckets = shard[key] = deque(maxlen=window_minutes)
+
+            # Drop buckets that left the window
+            while buckets and buckets[0][0] < oldest_minute:
+                buckets.popleft()
+
+            if buckets and buckets[-1][0] == current_minute:
+                buckets[-1] = (current_minute, buckets[-1][1] + 1)
+            else:
+                buckets.append((current_minute, 1))
+
+            attempts = sum(count for _, count in buckets)
+
+        return {
+            "allowed": attempts <= max_attempts,
+            "remaining": max(0, max_attempts - attempts),
+            "reset_time": datetime.utcfromtimestamp((buckets[0][0] + window_minutes) * 60),
+            "current_attempts": attempts
+        }
+
+    @staticmethod
+    def _evict_stale(shard: Dict[str, Deque[Tuple[int, int]]], oldest_minute: int):
+        """Remove keys without hits in the current window."""
+        for stale_key in [k for k, b in shard.items() if not b or b[-1][0] < oldest_minute]:
+            del shard[stale_key]
+
+
 # Global instances
 password_validator = PasswordValidator()
 security_utils = SecurityUtils()
 rate_limiter = RateLimiter()
+redis_rate_limiter = RedisRateLimiter()
+bucket_rate_limiter = BucketCounter()
 
 
 # Convenience functions
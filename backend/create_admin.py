@@ -107,7 +107,6 @@ async def create_admin_user():
                 email=email,
                 password_hash=hash_password(password),
                 role=UserRole.ADMIN,
-                is_admin=True,
                 is_active=True
             )
 
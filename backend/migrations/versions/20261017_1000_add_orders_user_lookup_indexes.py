@@ -0,0 +1,50 @@
+"""Add indexes for per-user order lookups
+
+Revision ID: 20261017_1000_add_orders_user_lookup_indexes
+Revises: 20250916_1722_add_order_status_management
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '20261017_1000_add_orders_user_lookup_indexes'
+down_revision = '20250916_1722_add_order_status_management'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Create indexes backing the /pay and /payment_status bot commands."""
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        # Recent orders of a user: WHERE user_id = ? AND is_deleted = false ORDER BY created_at DESC
+        op.create_index(
+            'ix_orders_user_status_created',
+            'orders',
+            ['user_id', 'is_deleted', 'status', sa.text('created_at DESC')],
+            unique=False,
+            postgresql_concurrently=True
+        )
+
+        # Latest pending order of a user
+        op.create_index(
+            'ix_orders_user_pending',
+            'orders',
+            ['user_id', sa.text('created_at DESC')],
+            unique=False,
+            postgresql_where=sa.text("status = 'PENDING' AND is_deleted = false"),
+            postgresql_concurrently=True
+        )
+
+    # users.telegram_id is already covered by its unique index
+
+
+def downgrade() -> None:
+    """Drop per-user order lookup indexes."""
+
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_orders_user_pending', table_name='orders', postgresql_concurrently=True)
+        op.drop_index('ix_orders_user_status_created', table_name='orders', postgresql_concurrently=True)
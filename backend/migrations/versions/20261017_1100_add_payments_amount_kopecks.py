@@ -0,0 +1,34 @@
+"""Add amount in kopecks to payments
+
+Revision ID: 20261017_1100_add_payments_amount_kopecks
+Revises: 20261017_1000_add_orders_user_lookup_indexes
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '20261017_1100_add_payments_amount_kopecks'
+down_revision = '20261017_1000_add_orders_user_lookup_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Add payments.amount_kopecks and fill it from the amount in rubles."""
+
+    op.add_column(
+        'payments',
+        sa.Column('amount_kopecks', sa.Integer(), nullable=True, comment='Payment amount in kopecks')
+    )
+
+    op.execute("UPDATE payments SET amount_kopecks = ROUND(amount * 100)")
+
+    op.alter_column('payments', 'amount_kopecks', nullable=False)
+
+
+def downgrade() -> None:
+    """Drop payments.amount_kopecks."""
+
+    op.drop_column('payments', 'amount_kopecks')
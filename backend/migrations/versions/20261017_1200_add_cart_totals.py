@@ -0,0 +1,49 @@
+"""Add denormalized totals to carts
+
+Revision ID: 20261017_1200_add_cart_totals
+Revises: 20261017_1100_add_payments_amount_kopecks
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '20261017_1200_add_cart_totals'
+down_revision = '20261017_1100_add_payments_amount_kopecks'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Add carts.total_amount_cached / total_items_cached and fill them."""
+
+    op.add_column(
+        'carts',
+        sa.Column('total_amount_cached', sa.Numeric(12, 2), nullable=False, server_default='0')
+    )
+    op.add_column(
+        'carts',
+        sa.Column('total_items_cached', sa.Integer(), nullable=False, server_default='0')
+    )
+
+    op.execute("""
+        UPDATE carts SET
+            total_amount_cached = totals.amount,
+            total_items_cached = totals.items
+        FROM (
+            SELECT ci.cart_id, SUM(ci.quantity * p.price) AS amount, SUM(ci.quantity) AS items
+            FROM cart_items ci
+            JOIN products p ON p.id = ci.product_id
+            WHERE ci.is_deleted = false
+            GROUP BY ci.cart_id
+        ) AS totals
+        WHERE carts.id = totals.cart_id
+    """)
+
+
+def downgrade() -> None:
+    """Drop denormalized cart totals."""
+
+    op.drop_column('carts', 'total_items_cached')
+    op.drop_column('carts', 'total_amount_cached')
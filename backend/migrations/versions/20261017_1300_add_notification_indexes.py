@@ -0,0 +1,65 @@
+"""Add composite indexes for notification and cart item lookups
+
+Revision ID: 20261017_1300_add_notification_indexes
+Revises: 20261017_1200_add_cart_totals
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '20261017_1300_add_notification_indexes'
+down_revision = '20261017_1200_add_cart_totals'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Create indexes backing notification retries, scheduling and cart totals."""
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_notif_status_retry',
+            'notifications',
+            ['status', 'retry_count'],
+            unique=False,
+            postgresql_concurrently=True
+        )
+
+        op.create_index(
+            'ix_notif_user_type_sent',
+            'notifications',
+            ['user_id', 'notification_type', 'sent_at'],
+            unique=False,
+            postgresql_concurrently=True
+        )
+
+        op.create_index(
+            'ix_notif_scheduled',
+            'notifications',
+            ['scheduled_at'],
+            unique=False,
+            postgresql_where=sa.text("status = 'SCHEDULED'"),
+            postgresql_concurrently=True
+        )
+
+        op.create_index(
+            'ix_cart_items_cart_notdel',
+            'cart_items',
+            ['cart_id'],
+            unique=False,
+            postgresql_where=sa.text("is_deleted = false"),
+            postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    """Drop notification and cart item indexes."""
+
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_cart_items_cart_notdel', table_name='cart_items', postgresql_concurrently=True)
+        op.drop_index('ix_notif_scheduled', table_name='notifications', postgresql_concurrently=True)
+        op.drop_index('ix_notif_user_type_sent', table_name='notifications', postgresql_concurrently=True)
+        op.drop_index('ix_notif_status_retry', table_name='notifications', postgresql_concurrently=True)
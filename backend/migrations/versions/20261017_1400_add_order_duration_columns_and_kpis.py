@@ -0,0 +1,90 @@
+"""Generate order durations in the database and add daily KPI view
+
+Revision ID: 20261017_1400_add_order_duration_columns_and_kpis
+Revises: 20261017_1300_add_notification_indexes
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '20261017_1400_add_order_duration_columns_and_kpis'
+down_revision = '20261017_1300_add_notification_indexes'
+branch_labels = None
+depends_on = None
+
+
+PREPARATION_DURATION_SQL = (
+    "CAST(FLOOR(EXTRACT(EPOCH FROM (actual_preparation_end - actual_preparation_start)) / 60) AS INTEGER)"
+)
+TOTAL_DURATION_SQL = (
+    "CAST(FLOOR(EXTRACT(EPOCH FROM (status_completed_at - created_at)) / 60) AS INTEGER)"
+)
+
+
+def upgrade() -> None:
+    """Replace duration columns with generated ones and create mv_order_kpis_daily."""
+
+    # Existing columns cannot be turned into generated ones, so re-add them
+    op.drop_column('orders', 'preparation_duration')
+    op.drop_column('orders', 'total_duration')
+    op.add_column(
+        'orders',
+        sa.Column(
+            'preparation_duration',
+            sa.Integer(),
+            sa.Computed(PREPARATION_DURATION_SQL, persisted=True),
+            nullable=True,
+            comment='Actual preparation time in minutes'
+        )
+    )
+    op.add_column(
+        'orders',
+        sa.Column(
+            'total_duration',
+            sa.Integer(),
+            sa.Computed(TOTAL_DURATION_SQL, persisted=True),
+            nullable=True,
+            comment='Total order completion time in minutes'
+        )
+    )
+
+    op.execute("""
+        CREATE MATERIALIZED VIEW mv_order_kpis_daily AS
+        SELECT
+            date_trunc('day', created_at) AS day,
+            status,
+            COUNT(*) AS orders_count,
+            AVG(preparation_duration) AS avg_preparation_duration,
+            AVG(total_duration) AS avg_total_duration,
+            COUNT(*) FILTER (
+                WHERE status IN ('PENDING', 'CONFIRMED', 'PREPARING', 'READY')
+                AND estimated_preparation_time IS NOT NULL
+                AND COALESCE(status_confirmed_at, created_at)
+                    + estimated_preparation_time * INTERVAL '1 minute' < now()
+            ) AS overdue_count
+        FROM orders
+        WHERE is_deleted = false
+        GROUP BY 1, 2
+    """)
+    # Unique index is required for REFRESH ... CONCURRENTLY
+    op.execute("CREATE UNIQUE INDEX ix_mv_order_kpis_daily_day_status ON mv_order_kpis_daily (day, status)")
+
+
+def downgrade() -> None:
+    """Drop mv_order_kpis_daily and restore plain duration columns."""
+
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS mv_order_kpis_daily")
+
+    op.drop_column('orders', 'total_duration')
+    op.drop_column('orders', 'preparation_duration')
+    op.add_column(
+        'orders',
+        sa.Column('preparation_duration', sa.Integer(), nullable=True, comment='Actual preparation time in minutes')
+    )
+    op.add_column(
+        'orders',
+        sa.Column('total_duration', sa.Integer(), nullable=True, comment='Total order completion time in minutes')
+    )
+    op.execute(f"UPDATE orders SET preparation_duration = {PREPARATION_DURATION_SQL}, total_duration = {TOTAL_DURATION_SQL}")
@@ -0,0 +1,96 @@
+"""Store order and payment enums as VARCHAR values with check constraints
+
+Revision ID: 20261017_1500_store_order_payment_enums_as_varchar
+Revises: 20261017_1400_add_order_duration_columns_and_kpis
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '20261017_1500_store_order_payment_enums_as_varchar'
+down_revision = '20261017_1400_add_order_duration_columns_and_kpis'
+branch_labels = None
+depends_on = None
+
+
+# (table, column, native enum type, enum values)
+ENUM_COLUMNS = [
+    ('orders', 'status', 'orderstatus',
+     ['pending', 'confirmed', 'preparing', 'ready', 'completed', 'cancelled', 'refunded', 'failed']),
+    ('orders', 'priority', 'orderpriority', ['low', 'normal', 'high', 'vip']),
+    ('payments', 'status', 'paymentstatus', ['pending', 'success', 'failed', 'refunded']),
+    ('payments', 'payment_method', 'paymentmethod', ['telegram', 'card', 'cash']),
+]
+
+KPI_VIEW_SQL = """
+    CREATE MATERIALIZED VIEW mv_order_kpis_daily AS
+    SELECT
+        date_trunc('day', created_at) AS day,
+        status,
+        COUNT(*) AS orders_count,
+        AVG(preparation_duration) AS avg_preparation_duration,
+        AVG(total_duration) AS avg_total_duration,
+        COUNT(*) FILTER (
+            WHERE status IN ({active})
+            AND estimated_preparation_time IS NOT NULL
+            AND COALESCE(status_confirmed_at, created_at)
+                + estimated_preparation_time * INTERVAL '1 minute' < now()
+        ) AS overdue_count
+    FROM orders
+    WHERE is_deleted = false
+    GROUP BY 1, 2
+"""
+
+
+def _in_list(values) -> str:
+    return ', '.join(f"'{value}'" for value in values)
+
+
+def _recreate_dependents(pending: str, active) -> None:
+    """Recreate the partial index and KPI view that reference orders.status."""
+    op.create_index(
+        'ix_orders_user_pending',
+        'orders',
+        ['user_id', sa.text('created_at DESC')],
+        unique=False,
+        postgresql_where=sa.text(f"status = '{pending}' AND is_deleted = false")
+    )
+    op.execute(KPI_VIEW_SQL.format(active=_in_list(active)))
+    op.execute("CREATE UNIQUE INDEX ix_mv_order_kpis_daily_day_status ON mv_order_kpis_daily (day, status)")
+
+
+def upgrade() -> None:
+    """Convert native enum columns to VARCHAR(20) holding lowercase enum values."""
+
+    # Objects whose definitions depend on the column type
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS mv_order_kpis_daily")
+    op.drop_index('ix_orders_user_pending', table_name='orders')
+
+    for table, column, type_name, values in ENUM_COLUMNS:
+        # Older rows hold member names, values added later are lowercase
+        op.execute(
+            f"ALTER TABLE {table} ALTER COLUMN {column} TYPE VARCHAR(20) USING lower({column}::text)"
+        )
+        op.create_check_constraint(f'ck_{table}_{column}', table, f"{column} IN ({_in_list(values)})")
+        op.execute(f"DROP TYPE IF EXISTS {type_name}")
+
+    _recreate_dependents('pending', ['pending', 'confirmed', 'preparing', 'ready'])
+
+
+def downgrade() -> None:
+    """Restore native enum columns holding member names."""
+
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS mv_order_kpis_daily")
+    op.drop_index('ix_orders_user_pending', table_name='orders')
+
+    for table, column, type_name, values in ENUM_COLUMNS:
+        names = [value.upper() for value in values]
+        op.drop_constraint(f'ck_{table}_{column}', table, type_='check')
+        op.execute(f"CREATE TYPE {type_name} AS ENUM ({_in_list(names)})")
+        op.execute(
+            f"ALTER TABLE {table} ALTER COLUMN {column} TYPE {type_name} USING upper({column})::{type_name}"
+        )
+
+    _recreate_dependents('PENDING', ['PENDING', 'CONFIRMED', 'PREPARING', 'READY'])
@@ -0,0 +1,71 @@
+"""Add indexes for order dashboard and audit trail queries
+
+Revision ID: 20261017_1600_add_order_dashboard_indexes
+Revises: 20261017_1500_store_order_payment_enums_as_varchar
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '20261017_1600_add_order_dashboard_indexes'
+down_revision = '20261017_1500_store_order_payment_enums_as_varchar'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Create order listing indexes and replace the history order_id index."""
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_orders_status_created',
+            'orders',
+            ['status', 'created_at'],
+            unique=False,
+            postgresql_concurrently=True
+        )
+
+        op.create_index(
+            'ix_orders_active',
+            'orders',
+            ['created_at'],
+            unique=False,
+            postgresql_where=sa.text(
+                "status IN ('pending', 'confirmed', 'preparing', 'ready') AND is_deleted = false"
+            ),
+            postgresql_concurrently=True
+        )
+
+        op.create_index(
+            'ix_history_order_changed',
+            'order_status_history',
+            ['order_id', 'changed_at'],
+            unique=False,
+            postgresql_concurrently=True
+        )
+
+        # Covered by the leading column of ix_history_order_changed
+        op.drop_index(
+            'ix_order_status_history_order_id',
+            table_name='order_status_history',
+            postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    """Drop order dashboard indexes and restore the history order_id index."""
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_order_status_history_order_id',
+            'order_status_history',
+            ['order_id'],
+            unique=False,
+            postgresql_concurrently=True
+        )
+        op.drop_index('ix_history_order_changed', table_name='order_status_history', postgresql_concurrently=True)
+        op.drop_index('ix_orders_active', table_name='orders', postgresql_concurrently=True)
+        op.drop_index('ix_orders_status_created', table_name='orders', postgresql_concurrently=True)
@@ -0,0 +1,127 @@
+"""Consolidate order status timestamp columns into status_timestamps JSONB
+
+Revision ID: 20261017_1700_consolidate_order_status_timestamps
+Revises: 20261017_1600_add_order_dashboard_indexes
+Create Date: 2026-10-17 17:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '20261017_1700_consolidate_order_status_timestamps'
+down_revision = '20261017_1600_add_order_dashboard_indexes'
+branch_labels = None
+depends_on = None
+
+
+STATUSES = ['pending', 'confirmed', 'preparing', 'ready', 'completed', 'cancelled']
+
+# A text -> timestamp cast is only STABLE: it accepts 'now'/'today' and reads
+# non-ISO input according to DateStyle. The function casts nothing but strict
+# ISO 8601 strings (what datetime.isoformat() and jsonb_build_object() write),
+# which parse the same under any setting, and raises on anything else. That
+# makes it truly immutable, so it can back the stored total_duration column
+JSONB_TIMESTAMP_FUNCTION = """
+    CREATE OR REPLACE FUNCTION jsonb_timestamp(data jsonb, key text)
+    RETURNS timestamp
+    LANGUAGE plpgsql IMMUTABLE PARALLEL SAFE
+    AS $$
+    DECLARE
+        raw text := data ->> key;
+    BEGIN
+        IF raw IS NULL THEN
+            RETURN NULL;
+        END IF;
+        IF raw !~ '^[0-9]{4}-[0-9]{2}-[0-9]{2}T[0-9]{2}:[0-9]{2}:[0-9]{2}(\\.[0-9]{1,6})?$' THEN
+            RAISE EXCEPTION 'jsonb_timestamp: % is not an ISO 8601 timestamp', raw;
+        END IF;
+        RETURN raw::timestamp;
+    END
+    $$
+"""
+
+KPI_VIEW_SQL = """
+    CREATE MATERIALIZED VIEW mv_order_kpis_daily AS
+    SELECT
+        date_trunc('day', created_at) AS day,
+        status,
+        COUNT(*) AS orders_count,
+        AVG(preparation_duration) AS avg_preparation_duration,
+        AVG(total_duration) AS avg_total_duration,
+        COUNT(*) FILTER (
+            WHERE status IN ('pending', 'confirmed', 'preparing', 'ready')
+            AND estimated_preparation_time IS NOT NULL
+            AND COALESCE({confirmed_at}, created_at)
+                + estimated_preparation_time * INTERVAL '1 minute' < now()
+        ) AS overdue_count
+    FROM orders
+    WHERE is_deleted = false
+    GROUP BY 1, 2
+"""
+
+TOTAL_DURATION_SQL = "CAST(FLOOR(EXTRACT(EPOCH FROM ({completed_at} - created_at)) / 60) AS INTEGER)"
+
+
+def _recreate_kpi_view(confirmed_at: str) -> None:
+    op.execute(KPI_VIEW_SQL.format(confirmed_at=confirmed_at))
+    op.execute("CREATE UNIQUE INDEX ix_mv_order_kpis_daily_day_status ON mv_order_kpis_daily (day, status)")
+
+
+def _add_total_duration(completed_at: str) -> None:
+    op.add_column(
+        'orders',
+        sa.Column(
+            'total_duration',
+            sa.Integer(),
+            sa.Computed(TOTAL_DURATION_SQL.format(completed_at=completed_at), persisted=True),
+            nullable=True,
+            comment='Total order completion time in minutes'
+        )
+    )
+
+
+def upgrade() -> None:
+    """Move status_*_at columns into orders.status_timestamps."""
+
+    op.execute(JSONB_TIMESTAMP_FUNCTION)
+    op.add_column(
+        'orders',
+        sa.Column('status_timestamps', postgresql.JSONB(), nullable=False, server_default=sa.text("'{}'"))
+    )
+    pairs = ", ".join(f"'{status}', status_{status}_at" for status in STATUSES)
+    op.execute(f"UPDATE orders SET status_timestamps = jsonb_strip_nulls(jsonb_build_object({pairs}))")
+
+    # Objects depending on the old columns
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS mv_order_kpis_daily")
+    op.drop_column('orders', 'total_duration')
+
+    for status in STATUSES:
+        op.drop_column('orders', f'status_{status}_at')
+
+    _add_total_duration("jsonb_timestamp(status_timestamps, 'completed')")
+    _recreate_kpi_view("jsonb_timestamp(status_timestamps, 'confirmed')")
+
+
+def downgrade() -> None:
+    """Restore status_*_at columns from orders.status_timestamps."""
+
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS mv_order_kpis_daily")
+    op.drop_column('orders', 'total_duration')
+
+    for status in STATUSES:
+        op.add_column('orders', sa.Column(f'status_{status}_at', sa.DateTime(), nullable=True))
+    assignments = ", ".join(
+        f"status_{status}_at = jsonb_timestamp(status_timestamps, '{status}')" for status in STATUSES
+    )
+    op.execute(f"UPDATE orders SET {assignments}")
+    op.execute("UPDATE orders SET status_pending_at = created_at WHERE status_pending_at IS NULL")
+    op.alter_column('orders', 'status_pending_at', nullable=False)
+
+    op.drop_column('orders', 'status_timestamps')
+
+    _add_total_duration("status_completed_at")
+    _recreate_kpi_view("status_confirmed_at")
+
+    op.execute("DROP FUNCTION IF EXISTS jsonb_timestamp(jsonb, text)")
@@ -0,0 +1,50 @@
+"""Add denormalized item aggregates to orders
+
+Revision ID: 20261017_1800_add_order_items_aggregates
+Revises: 20261017_1700_consolidate_order_status_timestamps
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '20261017_1800_add_order_items_aggregates'
+down_revision = '20261017_1700_consolidate_order_status_timestamps'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Add orders.items_count / items_subtotal and fill them."""
+
+    op.add_column(
+        'orders',
+        sa.Column('items_count', sa.Integer(), nullable=False, server_default='0',
+                  comment='Number of order item rows')
+    )
+    op.add_column(
+        'orders',
+        sa.Column('items_subtotal', sa.Float(), nullable=False, server_default='0',
+                  comment='Sum of price * quantity over items')
+    )
+
+    op.execute("""
+        UPDATE orders SET
+            items_count = totals.items,
+            items_subtotal = totals.subtotal
+        FROM (
+            SELECT order_id, COUNT(*) AS items, SUM(quantity * price) AS subtotal
+            FROM order_items
+            WHERE is_deleted = false
+            GROUP BY order_id
+        ) AS totals
+        WHERE orders.id = totals.order_id
+    """)
+
+
+def downgrade() -> None:
+    """Drop denormalized order item aggregates."""
+
+    op.drop_column('orders', 'items_subtotal')
+    op.drop_column('orders', 'items_count')
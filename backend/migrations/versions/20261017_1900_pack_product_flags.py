@@ -0,0 +1,65 @@
+"""Pack product boolean flags into a SMALLINT bitmask
+
+Revision ID: 20261017_1900_pack_product_flags
+Revises: 20261017_1800_add_order_items_aggregates
+Create Date: 2026-10-17 19:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '20261017_1900_pack_product_flags'
+down_revision = '20261017_1800_add_order_items_aggregates'
+branch_labels = None
+depends_on = None
+
+
+# (column, bit, server default) matching app.models.product FLAG_* constants
+FLAG_COLUMNS = [
+    ('is_active', 1, 'true'),
+    ('in_stock', 2, 'true'),
+    ('is_featured', 4, 'false'),
+]
+
+BOOLEAN_INDEXES = [
+    ('ix_products_is_active', ['is_active']),
+    ('ix_products_in_stock', ['in_stock']),
+    ('ix_product_category_active', ['category_id', 'is_active']),
+    ('ix_product_stock_active', ['in_stock', 'is_active']),
+    ('ix_product_featured_active', ['is_featured', 'is_active']),
+]
+
+
+def upgrade() -> None:
+    """Replace is_active / in_stock / is_featured with products.flags."""
+
+    op.add_column(
+        'products',
+        sa.Column('flags', sa.SmallInteger(), nullable=False, server_default='3', comment='Product flag bits')
+    )
+    bits = ' | '.join(f"(CASE WHEN {column} THEN {bit} ELSE 0 END)" for column, bit, _ in FLAG_COLUMNS)
+    op.execute(f"UPDATE products SET flags = {bits}")
+
+    for name, _ in BOOLEAN_INDEXES:
+        op.drop_index(name, table_name='products')
+    for column, _, _ in FLAG_COLUMNS:
+        op.drop_column('products', column)
+
+    op.create_index('ix_product_category_flags', 'products', ['category_id', 'flags'])
+
+
+def downgrade() -> None:
+    """Restore boolean flag columns from products.flags."""
+
+    op.drop_index('ix_product_category_flags', table_name='products')
+
+    for column, bit, default in FLAG_COLUMNS:
+        op.add_column('products', sa.Column(column, sa.Boolean(), nullable=False, server_default=default))
+    assignments = ', '.join(f"{column} = (flags & {bit}) <> 0" for column, bit, _ in FLAG_COLUMNS)
+    op.execute(f"UPDATE products SET {assignments}")
+
+    for name, columns in BOOLEAN_INDEXES:
+        op.create_index(name, 'products', columns)
+
+    op.drop_column('products', 'flags')
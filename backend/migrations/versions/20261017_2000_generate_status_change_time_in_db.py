@@ -0,0 +1,41 @@
+"""Generate order status history change time in the database
+
+Revision ID: 20261017_2000_generate_status_change_time_in_db
+Revises: 20261017_1900_pack_product_flags
+Create Date: 2026-10-17 20:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '20261017_2000_generate_status_change_time_in_db'
+down_revision = '20261017_1900_pack_product_flags'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Add server default to order_status_history.changed_at."""
+
+    # Column is a naive UTC timestamp like the rest of the schema, so convert
+    # explicitly instead of relying on the session time zone
+    op.alter_column(
+        'order_status_history',
+        'changed_at',
+        server_default=sa.text("timezone('utc', now())"),
+        existing_type=sa.DateTime(),
+        existing_nullable=False
+    )
+
+
+def downgrade() -> None:
+    """Drop server default of order_status_history.changed_at."""
+
+    op.alter_column(
+        'order_status_history',
+        'changed_at',
+        server_default=None,
+        existing_type=sa.DateTime(),
+        existing_nullable=False
+    )
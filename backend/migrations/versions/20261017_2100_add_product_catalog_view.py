@@ -0,0 +1,53 @@
+"""Add product catalog materialized view
+
+Revision ID: 20261017_2100_add_product_catalog_view
+Revises: 20261017_2000_generate_status_change_time_in_db
+Create Date: 2026-10-17 21:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '20261017_2100_add_product_catalog_view'
+down_revision = '20261017_2000_generate_status_change_time_in_db'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Create mv_product_catalog with storefront card fields."""
+
+    # flags & 3 = 3: active and in stock, see app.models.product FLAG_* bits
+    op.execute("""
+        CREATE MATERIALIZED VIEW mv_product_catalog AS
+        SELECT
+            p.id,
+            p.name,
+            p.slug,
+            COALESCE(NULLIF(p.discount_price, 0), p.price) AS effective_price,
+            p.image_url,
+            p.category_id,
+            c.name AS category_name,
+            p.popularity_score,
+            p.sort_order
+        FROM products p
+        LEFT JOIN categories c ON c.id = p.category_id
+        WHERE p.flags & 3 = 3
+        AND p.is_deleted = false
+    """)
+    # Unique index is required for REFRESH ... CONCURRENTLY
+    op.execute("CREATE UNIQUE INDEX ix_mv_product_catalog_id ON mv_product_catalog (id)")
+    op.execute(
+        "CREATE INDEX ix_mv_product_catalog_category_popularity "
+        "ON mv_product_catalog (category_id, popularity_score DESC, sort_order)"
+    )
+    op.execute(
+        "CREATE INDEX ix_mv_product_catalog_popularity "
+        "ON mv_product_catalog (popularity_score DESC, sort_order)"
+    )
+
+
+def downgrade() -> None:
+    """Drop mv_product_catalog."""
+
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS mv_product_catalog")
@@ -0,0 +1,37 @@
+"""Add partial index on active users by role
+
+Revision ID: 20261017_2200_add_users_role_active_index
+Revises: 20261017_2100_add_product_catalog_view
+Create Date: 2026-10-17 22:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '20261017_2200_add_users_role_active_index'
+down_revision = '20261017_2100_add_product_catalog_view'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Create ix_users_role_active over active users."""
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_users_role_active',
+            'users',
+            ['role', 'is_active'],
+            unique=False,
+            postgresql_where=sa.text("is_active = true"),
+            postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    """Drop ix_users_role_active."""
+
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_users_role_active', table_name='users', postgresql_concurrently=True)
@@ -0,0 +1,40 @@
+"""Generate users.is_admin from role
+
+Revision ID: 20261017_2300_generate_users_is_admin_from_role
+Revises: 20261017_2200_add_users_role_active_index
+Create Date: 2026-10-17 23:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '20261017_2300_generate_users_is_admin_from_role'
+down_revision = '20261017_2200_add_users_role_active_index'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Replace the stored is_admin flag with a column generated from role."""
+
+    # Users flagged as admins without an admin role keep admin rights
+    op.execute("UPDATE users SET role = 'ADMIN' WHERE is_admin = true AND role = 'USER'")
+
+    op.drop_column('users', 'is_admin')
+    op.add_column(
+        'users',
+        sa.Column('is_admin', sa.Boolean(), sa.Computed("role = 'ADMIN'", persisted=True), nullable=False)
+    )
+
+
+def downgrade() -> None:
+    """Restore is_admin as a plain column filled from role."""
+
+    op.drop_column('users', 'is_admin')
+    op.add_column(
+        'users',
+        sa.Column('is_admin', sa.Boolean(), nullable=False, server_default=sa.false())
+    )
+    op.execute("UPDATE users SET is_admin = (role = 'ADMIN')")
+    op.alter_column('users', 'is_admin', server_default=None)
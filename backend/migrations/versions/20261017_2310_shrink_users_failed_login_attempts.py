@@ -0,0 +1,41 @@
+"""Store users.failed_login_attempts as SMALLINT
+
+Revision ID: 20261017_2310_shrink_users_failed_login_attempts
+Revises: 20261017_2300_generate_users_is_admin_from_role
+Create Date: 2026-10-17 23:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '20261017_2310_shrink_users_failed_login_attempts'
+down_revision = '20261017_2300_generate_users_is_admin_from_role'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Convert failed_login_attempts from BIGINT to SMALLINT."""
+
+    # Attempts keep counting while an account is locked, clamp to the SMALLINT range
+    op.alter_column(
+        'users',
+        'failed_login_attempts',
+        type_=sa.SmallInteger(),
+        existing_type=sa.BigInteger(),
+        existing_nullable=False,
+        postgresql_using='LEAST(failed_login_attempts, 32767)::smallint'
+    )
+
+
+def downgrade() -> None:
+    """Convert failed_login_attempts back to BIGINT."""
+
+    op.alter_column(
+        'users',
+        'failed_login_attempts',
+        type_=sa.BigInteger(),
+        existing_type=sa.SmallInteger(),
+        existing_nullable=False
+    )
@@ -0,0 +1,49 @@
+"""Store users.role as native user_role enum of lowercase values
+
+Revision ID: 20261017_2320_store_user_role_values
+Revises: 20261017_2310_shrink_users_failed_login_attempts
+Create Date: 2026-10-17 23:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '20261017_2320_store_user_role_values'
+down_revision = '20261017_2310_shrink_users_failed_login_attempts'
+branch_labels = None
+depends_on = None
+
+
+ROLES = ['user', 'manager', 'admin']
+
+
+def _in_list(values) -> str:
+    return ', '.join(f"'{value}'" for value in values)
+
+
+def _convert_role(old_type: str, new_type: str, labels, cast: str, admin: str) -> None:
+    """Move users.role to new_type, rebuilding the generated is_admin column."""
+    # The generated column depends on role and has to go while its type changes
+    op.drop_column('users', 'is_admin')
+
+    op.execute(f"CREATE TYPE {new_type} AS ENUM ({_in_list(labels)})")
+    op.execute(f"ALTER TABLE users ALTER COLUMN role TYPE {new_type} USING {cast}(role::text)::{new_type}")
+    op.execute(f"DROP TYPE IF EXISTS {old_type}")
+
+    op.add_column(
+        'users',
+        sa.Column('is_admin', sa.Boolean(), sa.Computed(f"role = '{admin}'", persisted=True), nullable=False)
+    )
+
+
+def upgrade() -> None:
+    """Convert users.role from userrole member names to user_role values."""
+
+    _convert_role('userrole', 'user_role', ROLES, 'lower', 'admin')
+
+
+def downgrade() -> None:
+    """Convert users.role back to userrole member names."""
+
+    _convert_role('user_role', 'userrole', [role.upper() for role in ROLES], 'upper', 'ADMIN')
@@ -25,5 +25,6 @@ if __name__ == "__main__":
         host="0.0.0.0",
         port=8000,
         reload=True,
+        loop="uvloop",
         log_level="info"
     )
\ No newline at end of file
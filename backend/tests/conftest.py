@@ -68,7 +68,6 @@ async def test_admin_user(db_session):
         last_name="User",
         email="admin@example.com",
         role=UserRole.ADMIN,
-        is_admin=True,
         password_hash="hashed_admin_password"
     )
 
@@ -319,7 +319,7 @@ class TestFeedbackCommands:
 
             # Mock no feedback
             mock_feedback_result = MagicMock()
-            mock_feedback_result.all.return_value = []
+            mock_feedback_result.scalars.return_value.all.return_value = []
 
             mock_db.execute.side_effect = [mock_user_result, mock_feedback_result]
 
@@ -346,9 +346,10 @@ class TestFeedbackCommands:
             mock_feedback.rating_emoji = "⭐⭐⭐⭐⭐"
             mock_feedback.feedback_text = "Great service!"
             mock_feedback.created_at.strftime.return_value = "01.01.2024"
+            mock_feedback.order = mock_order
 
             mock_feedback_result = MagicMock()
-            mock_feedback_result.all.return_value = [(mock_feedback, mock_order)]
+            mock_feedback_result.scalars.return_value.all.return_value = [mock_feedback]
 
             mock_db.execute.side_effect = [mock_user_result, mock_feedback_result]
 
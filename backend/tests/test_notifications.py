@@ -224,8 +224,7 @@ class TestNotificationService:
         mock_result.scalars.return_value.all.return_value = [mock_notification]
         mock_db.execute.return_value = mock_result
 
-        with patch.object(notification_service, '_send_telegram_message', new_callable=AsyncMock) as mock_send:
-            mock_send.return_value = True
+        with patch.object(notification_service, '_deliver_telegram_message', new_callable=AsyncMock) as mock_send:
 
             sent_count = await notification_service.process_scheduled_notifications()
 
@@ -251,14 +250,31 @@ class TestNotificationService:
         mock_result.scalars.return_value.all.return_value = [mock_notification]
         mock_db.execute.return_value = mock_result
 
-        with patch.object(notification_service, '_send_telegram_message', new_callable=AsyncMock) as mock_send:
-            mock_send.return_value = True
+        with patch.object(notification_service, '_deliver_telegram_message', new_callable=AsyncMock) as mock_send:
 
             retried_count = await notification_service.retry_failed_notifications()
 
             assert retried_count == 1
             mock_send.assert_called_once_with(mock_notification)
 
+    @pytest.mark.asyncio
+    async def test_send_messages_commits_in_chunks(self, mock_db):
+        """Test sent statuses are committed every NOTIFICATION_COMMIT_CHUNK messages."""
+        notification_service = NotificationService(mock_db)
+        notifications = [
+            Notification(id=i, target_telegram_id=123456789, message="Test", retry_count=0)
+            for i in range(1, 121)
+        ]
+
+        with patch.object(notification_service, '_deliver_telegram_message', new_callable=AsyncMock), \
+                patch.object(Notification, 'mark_sent_bulk', new_callable=AsyncMock) as mock_mark_sent:
+
+            sent_count = await notification_service._send_telegram_messages(notifications)
+
+            assert sent_count == 120
+            assert [len(call.args[1]) for call in mock_mark_sent.call_args_list] == [50, 50, 20]
+            assert mock_db.commit.await_count == 3
+
     @pytest.mark.asyncio
     async def test_get_notification_stats(self, mock_db):
         """Test getting notification statistics."""
@@ -284,6 +300,19 @@ class TestNotificationService:
         assert isinstance(stats, dict)
         assert 'period_days' in stats
 
+    @pytest.mark.asyncio
+    async def test_schedule_admin_notification(self):
+        """Test admin notification is sent in the background without a DB session."""
+        with patch('app.services.notification.bot') as mock_bot:
+            mock_bot.send_message = AsyncMock()
+
+            task = NotificationService.schedule_admin_notification("Test admin message")
+            assert task in NotificationService._background_tasks
+
+            assert await task is True
+            mock_bot.send_message.assert_called_once()
+            assert task not in NotificationService._background_tasks
+
 
 class TestNotificationScheduler:
     """Test NotificationScheduler functionality."""
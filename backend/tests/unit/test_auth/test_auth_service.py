@@ -13,9 +13,9 @@ class TestAuthService:
     """Test authentication service functionality."""
 
     @pytest.fixture
-    async def auth_service(self, db_session):
+    def auth_service(self):
         """Create auth service instance."""
-        return AuthService(db_session)
+        return AuthService()
 
     @pytest.fixture
     async def user_with_password(self, db_session):
@@ -37,7 +37,7 @@ class TestAuthService:
 
         return user, password
 
-    async def test_authenticate_user_success(self, auth_service, user_with_password):
+    async def test_authenticate_user_success(self, auth_service, user_with_password, db_session):
         """Test successful user authentication."""
         user, password = user_with_password
 
@@ -45,6 +45,7 @@ class TestAuthService:
             mock_rate_limiter.is_allowed.return_value = {"allowed": True, "remaining": 5}
 
             result = await auth_service.authenticate_user(
+                db=db_session,
                 username=user.username,
                 password=password,
                 client_ip="127.0.0.1"
@@ -56,19 +57,20 @@ class TestAuthService:
         assert result["tokens"]["access_token"]
         assert result["tokens"]["refresh_token"]
 
-    async def test_authenticate_user_invalid_username(self, auth_service):
+    async def test_authenticate_user_invalid_username(self, auth_service, db_session):
         """Test authentication with invalid username."""
         with patch('app.utils.security.rate_limiter') as mock_rate_limiter:
             mock_rate_limiter.is_allowed.return_value = {"allowed": True, "remaining": 5}
 
             with pytest.raises(AuthenticationError, match="Invalid credentials"):
                 await auth_service.authenticate_user(
+                    db=db_session,
                     username="nonexistent",
                     password="password",
                     client_ip="127.0.0.1"
                 )
 
-    async def test_authenticate_user_invalid_password(self, auth_service, user_with_password):
+    async def test_authenticate_user_invalid_password(self, auth_service, user_with_password, db_session):
         """Test authentication with invalid password."""
         user, _ = user_with_password
 
@@ -77,61 +79,65 @@ class TestAuthService:
 
             with pytest.raises(AuthenticationError, match="Invalid credentials"):
                 await auth_service.authenticate_user(
+                    db=db_session,
                     username=user.username,
                     password="wrong_password",
                     client_ip="127.0.0.1"
                 )
 
-    async def test_authenticate_user_rate_limited(self, auth_service):
+    async def test_authenticate_user_rate_limited(self, auth_service, db_session):
         """Test authentication with rate limiting."""
         with patch('app.utils.security.rate_limiter') as mock_rate_limiter:
             mock_rate_limiter.is_allowed.return_value = {"allowed": False, "remaining": 0}
 
             with pytest.raises(AuthenticationError, match="Too many authentication attempts"):
                 await auth_service.authenticate_user(
+                    db=db_session,
                     username="test",
                     password="password",
                     client_ip="127.0.0.1"
                 )
 
-    async def test_authenticate_user_account_locked(self, auth_service, user_with_password):
+    async def test_authenticate_user_account_locked(self, auth_service, user_with_password, db_session):
         """Test authentication with locked account."""
         user, password = user_with_password
 
         # Lock the user account
         user.locked_until = datetime.utcnow().replace(microsecond=0) + \
                            datetime.timedelta(minutes=30)
-        await auth_service.db.commit()
+        await db_session.commit()
 
         with patch('app.utils.security.rate_limiter') as mock_rate_limiter:
             mock_rate_limiter.is_allowed.return_value = {"allowed": True, "remaining": 5}
 
             with pytest.raises(AuthenticationError, match="Account is temporarily locked"):
                 await auth_service.authenticate_user(
+                    db=db_session,
                     username=user.username,
                     password=password,
                     client_ip="127.0.0.1"
                 )
 
-    async def test_authenticate_user_inactive(self, auth_service, user_with_password):
+    async def test_authenticate_user_inactive(self, auth_service, user_with_password, db_session):
         """Test authentication with inactive user."""
         user, password = user_with_password
 
         # Deactivate user
         user.is_active = False
-        await auth_service.db.commit()
+        await db_session.commit()
 
         with patch('app.utils.security.rate_limiter') as mock_rate_limiter:
             mock_rate_limiter.is_allowed.return_value = {"allowed": True, "remaining": 5}
 
             with pytest.raises(AuthenticationError, match="Account is disabled"):
                 await auth_service.authenticate_user(
+                    db=db_session,
                     username=user.username,
                     password=password,
                     client_ip="127.0.0.1"
                 )
 
-    async def test_authenticate_telegram_user_new(self, auth_service):
+    async def test_authenticate_telegram_user_new(self, auth_service, db_session):
         """Test Telegram authentication for new user."""
         telegram_data = {
             "id": 999888777,
@@ -140,14 +146,14 @@ class TestAuthService:
             "username": "telegramuser"
         }
 
-        result = await auth_service.authenticate_telegram_user(telegram_data)
+        result = await auth_service.authenticate_telegram_user(db_session, telegram_data)
 
         assert result is not None
         assert result["user"].telegram_id == telegram_data["id"]
         assert result["user"].first_name == telegram_data["first_name"]
         assert "tokens" in result
 
-    async def test_authenticate_telegram_user_existing(self, auth_service, test_user):
+    async def test_authenticate_telegram_user_existing(self, auth_service, test_user, db_session):
         """Test Telegram authentication for existing user."""
         telegram_data = {
             "id": test_user.telegram_id,
@@ -156,14 +162,14 @@ class TestAuthService:
             "username": "updated_username"
         }
 
-        result = await auth_service.authenticate_telegram_user(telegram_data)
+        result = await auth_service.authenticate_telegram_user(db_session, telegram_data)
 
         assert result is not None
         assert result["user"].id == test_user.id
         # Check that user info was updated
         assert result["user"].first_name == "Updated"
 
-    async def test_refresh_tokens_success(self, auth_service, test_user):
+    async def test_refresh_tokens_success(self, auth_service, test_user, db_session):
         """Test successful token refresh."""
         # Create initial tokens
         initial_result = await auth_service._generate_tokens(test_user)
@@ -177,18 +183,18 @@ class TestAuthService:
                 "expires_in": 1800
             }
 
-            result = await auth_service.refresh_tokens(refresh_token)
+            result = await auth_service.refresh_tokens(db_session, refresh_token)
 
             assert result is not None
             assert result["access_token"] == "new_access_token"
 
-    async def test_refresh_tokens_invalid(self, auth_service):
+    async def test_refresh_tokens_invalid(self, auth_service, db_session):
         """Test token refresh with invalid token."""
         with patch('app.utils.jwt.jwt_manager.refresh_access_token') as mock_refresh:
             mock_refresh.return_value = None
 
             with pytest.raises(AuthenticationError, match="Invalid or expired refresh token"):
-                await auth_service.refresh_tokens("invalid_token")
+                await auth_service.refresh_tokens(db_session, "invalid_token")
 
     async def test_logout_user(self, auth_service):
         """Test user logout."""
@@ -215,7 +221,7 @@ class TestAuthService:
             assert result is True
             mock_blacklist.assert_called_once_with(user_id)
 
-    async def test_change_password_success(self, auth_service, user_with_password):
+    async def test_change_password_success(self, auth_service, user_with_password, db_session):
         """Test successful password change."""
         user, current_password = user_with_password
         new_password = "NewPassword123!"
@@ -224,6 +230,7 @@ class TestAuthService:
             mock_logout.return_value = True
 
             result = await auth_service.change_password(
+                db=db_session,
                 user_id=user.id,
                 current_password=current_password,
                 new_password=new_password
@@ -232,29 +239,31 @@ class TestAuthService:
             assert result is True
             mock_logout.assert_called_once_with(user.id)
 
-    async def test_change_password_invalid_current(self, auth_service, user_with_password):
+    async def test_change_password_invalid_current(self, auth_service, user_with_password, db_session):
         """Test password change with invalid current password."""
         user, _ = user_with_password
 
         with pytest.raises(AuthenticationError, match="Invalid current password"):
             await auth_service.change_password(
+                db=db_session,
                 user_id=user.id,
                 current_password="wrong_password",
                 new_password="NewPassword123!"
             )
 
-    async def test_change_password_weak_new(self, auth_service, user_with_password):
+    async def test_change_password_weak_new(self, auth_service, user_with_password, db_session):
         """Test password change with weak new password."""
         user, current_password = user_with_password
 
         with pytest.raises(AuthenticationError, match="not strong enough"):
             await auth_service.change_password(
+                db=db_session,
                 user_id=user.id,
                 current_password=current_password,
                 new_password="weak"
             )
 
-    async def test_register_admin_user_success(self, auth_service):
+    async def test_register_admin_user_success(self, auth_service, db_session):
         """Test successful admin user registration."""
         user_data = {
             "username": "newadmin",
@@ -265,27 +274,29 @@ class TestAuthService:
             "role": UserRole.ADMIN
         }
 
-        user = await auth_service.register_admin_user(**user_data)
+        user = await auth_service.register_admin_user(db_session, **user_data)
 
         assert user is not None
         assert user.username == user_data["username"]
         assert user.role == UserRole.ADMIN
         assert user.password_hash is not None
 
-    async def test_register_admin_user_duplicate_username(self, auth_service, test_user):
+    async def test_register_admin_user_duplicate_username(self, auth_service, test_user, db_session):
         """Test admin registration with duplicate username."""
         with pytest.raises(AuthenticationError, match="Username already exists"):
             await auth_service.register_admin_user(
+                db=db_session,
                 username=test_user.username,
                 password="Password123!",
                 first_name="Test",
                 role=UserRole.ADMIN
             )
 
-    async def test_register_admin_user_duplicate_email(self, auth_service, test_user):
+    async def test_register_admin_user_duplicate_email(self, auth_service, test_user, db_session):
         """Test admin registration with duplicate email."""
         with pytest.raises(AuthenticationError, match="Email already exists"):
             await auth_service.register_admin_user(
+                db=db_session,
                 username="newuser",
                 password="Password123!",
                 first_name="Test",
@@ -293,22 +304,35 @@ class TestAuthService:
                 role=UserRole.ADMIN
             )
 
-    async def test_get_current_user_valid_token(self, auth_service, test_user):
+    async def test_get_current_user_valid_token(self, auth_service, test_user, db_session):
         """Test getting current user with valid token."""
         tokens = await auth_service._generate_tokens(test_user)
         access_token = tokens["access_token"]
 
-        user = await auth_service.get_current_user(access_token)
+        user = await auth_service.get_current_user(db_session, access_token)
 
         assert user is not None
         assert user.id == test_user.id
 
-    async def test_get_current_user_invalid_token(self, auth_service):
+    async def test_get_current_user_invalid_token(self, auth_service, db_session):
         """Test getting current user with invalid token."""
-        user = await auth_service.get_current_user("invalid_token")
+        user = await auth_service.get_current_user(db_session, "invalid_token")
 
         assert user is None
 
+    async def test_get_current_user_cached_token(self, auth_service, test_user, db_session):
+        """Test verified token is not decoded again."""
+        tokens = await auth_service._generate_tokens(test_user)
+        access_token = tokens["access_token"]
+
+        await auth_service.get_current_user(db_session, access_token)
+
+        with patch('app.services.auth.jwt_manager.verify_token') as mock_verify:
+            user = await auth_service.get_current_user(db_session, access_token)
+
+            mock_verify.assert_not_called()
+            assert user.id == test_user.id
+
     async def test_check_permission_admin(self, auth_service, test_admin_user):
         """Test permission check for admin user."""
         result = await auth_service.check_permission(test_admin_user, "any:permission")
@@ -325,6 +349,12 @@ class TestAuthService:
         result = await auth_service.check_permission(test_user, "admin:access")
         assert result is False
 
+    async def test_check_permissions_user(self, auth_service, test_user):
+        """Test bulk permission check for regular user."""
+        result = await auth_service.check_permissions(test_user, ["product:view", "admin:access"])
+
+        assert result == {"product:view": True, "admin:access": False}
+
     async def test_require_permission_success(self, auth_service, test_admin_user):
         """Test require permission with sufficient permissions."""
         # Should not raise exception
@@ -1,5 +1,6 @@
 """Tests for authentication middleware."""
 
+import asyncio
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 from fastapi import HTTPException, Request
@@ -115,8 +116,7 @@ class TestAuthMiddleware:
             role_dependency = AuthMiddleware.require_roles([UserRole.ADMIN])
             user = await role_dependency(
                 request=mock_request,
-                user=test_admin_user,
-                db=db_session
+                user=test_admin_user
             )
 
             assert user == test_admin_user
@@ -131,8 +131,7 @@ class TestAuthMiddleware:
             with pytest.raises(HTTPException) as exc_info:
                 await role_dependency(
                     request=mock_request,
-                    user=test_user,
-                    db=db_session
+                    user=test_user
                 )
 
             assert exc_info.value.status_code == 403
@@ -143,14 +142,13 @@ class TestAuthMiddleware:
         with patch('app.middleware.auth.AuthMiddleware.require_authenticated_user') as mock_auth:
             mock_auth.return_value = test_admin_user
 
-            with patch('app.services.auth.AuthService.check_permission') as mock_check:
-                mock_check.return_value = True
+            with patch('app.services.auth.AuthService.check_permissions') as mock_check:
+                mock_check.return_value = {"admin:access": True}
 
                 permission_dependency = AuthMiddleware.require_permissions(["admin:access"])
                 user = await permission_dependency(
                     request=mock_request,
-                    user=test_admin_user,
-                    db=db_session
+                    user=test_admin_user
                 )
 
                 assert user == test_admin_user
@@ -160,16 +158,15 @@ class TestAuthMiddleware:
         with patch('app.middleware.auth.AuthMiddleware.require_authenticated_user') as mock_auth:
             mock_auth.return_value = test_user
 
-            with patch('app.services.auth.AuthService.check_permission') as mock_check:
-                mock_check.return_value = False
+            with patch('app.services.auth.AuthService.check_permissions') as mock_check:
+                mock_check.return_value = {"admin:access": False}
 
                 permission_dependency = AuthMiddleware.require_permissions(["admin:access"])
 
                 with pytest.raises(HTTPException) as exc_info:
                     await permission_dependency(
                         request=mock_request,
-                        user=test_user,
-                        db=db_session
+                        user=test_user
                     )
 
                 assert exc_info.value.status_code == 403
@@ -179,8 +176,7 @@ class TestAuthMiddleware:
         """Test require_admin_user with admin user."""
         user = await AuthMiddleware.require_admin_user(
             request=mock_request,
-            user=test_admin_user,
-            db=db_session
+            user=test_admin_user
         )
 
         assert user == test_admin_user
@@ -190,8 +186,7 @@ class TestAuthMiddleware:
         with pytest.raises(HTTPException) as exc_info:
             await AuthMiddleware.require_admin_user(
                 request=mock_request,
-                user=test_user,
-                db=db_session
+                user=test_user
             )
 
         assert exc_info.value.status_code == 403
@@ -201,8 +196,7 @@ class TestAuthMiddleware:
         """Test require_manager_or_admin with admin user."""
         user = await AuthMiddleware.require_manager_or_admin(
             request=mock_request,
-            user=test_admin_user,
-            db=db_session
+            user=test_admin_user
         )
 
         assert user == test_admin_user
@@ -211,8 +205,7 @@ class TestAuthMiddleware:
         """Test require_manager_or_admin with manager user."""
         user = await AuthMiddleware.require_manager_or_admin(
             request=mock_request,
-            user=test_manager_user,
-            db=db_session
+            user=test_manager_user
         )
 
         assert user == test_manager_user
@@ -222,8 +215,7 @@ class TestAuthMiddleware:
         with pytest.raises(HTTPException) as exc_info:
             await AuthMiddleware.require_manager_or_admin(
                 request=mock_request,
-                user=test_user,
-                db=db_session
+                user=test_user
             )
 
         assert exc_info.value.status_code == 403
@@ -231,7 +223,7 @@ class TestAuthMiddleware:
 
     async def test_rate_limit_dependency_allowed(self, mock_request):
         """Test rate limit dependency when requests are allowed."""
-        with patch('app.utils.security.rate_limiter.is_allowed') as mock_rate_limit:
+        with patch('app.utils.security.redis_rate_limiter.is_allowed', new_callable=AsyncMock) as mock_rate_limit:
             mock_rate_limit.return_value = {
                 "allowed": True,
                 "remaining": 5,
@@ -248,7 +240,7 @@ class TestAuthMiddleware:
 
     async def test_rate_limit_dependency_exceeded(self, mock_request):
         """Test rate limit dependency when rate limit is exceeded."""
-        with patch('app.utils.security.rate_limiter.is_allowed') as mock_rate_limit:
+        with patch('app.utils.security.redis_rate_limiter.is_allowed', new_callable=AsyncMock) as mock_rate_limit:
             mock_rate_limit.return_value = {
                 "allowed": False,
                 "remaining": 0,
@@ -262,6 +254,8 @@ class TestAuthMiddleware:
 
             assert exc_info.value.status_code == 429
             assert "Rate limit exceeded" in str(exc_info.value.detail)
+            assert exc_info.value.headers["Retry-After"] == "60"
+            assert exc_info.value.headers["X-RateLimit-Remaining"] == "0"
 
     def test_rate_limit_custom_parameters(self, mock_request):
         """Test rate limit dependency with custom parameters."""
@@ -272,7 +266,7 @@ class TestAuthMiddleware:
             key_func=custom_key_func
         )
 
-        with patch('app.utils.security.rate_limiter.is_allowed') as mock_rate_limit:
+        with patch('app.utils.security.redis_rate_limiter.is_allowed', new_callable=AsyncMock) as mock_rate_limit:
             mock_rate_limit.return_value = {"allowed": True, "remaining": 5}
 
             # Should use custom parameters
@@ -281,5 +275,23 @@ class TestAuthMiddleware:
             mock_rate_limit.assert_called_once_with(
                 "api:custom_key",
                 max_attempts=10,
-                window_minutes=5
-            )
\ No newline at end of file
+                window_minutes=5,
+                sliding_window=False
+            )
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_scopes_separate_keys(self, mock_request):
+        """Test limiters with different scopes don't share a counter."""
+        with patch('app.utils.security.redis_rate_limiter.is_allowed', new_callable=AsyncMock) as mock_rate_limit:
+            mock_rate_limit.return_value = {"allowed": True, "remaining": 5, "reset_time": MagicMock()}
+
+            for scope in ("auth", "strict"):
+                rate_limit_dep = AuthMiddleware.rate_limit_dependency(
+                    key_func=lambda req: "127.0.0.1",
+                    sliding_window=True,
+                    scope=scope
+                )
+                await rate_limit_dep(mock_request)
+
+            keys = [call.args[0] for call in mock_rate_limit.call_args_list]
+            assert keys == ["auth:127.0.0.1", "strict:127.0.0.1"]
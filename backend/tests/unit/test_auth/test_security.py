@@ -2,9 +2,11 @@
 
 import pytest
 from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, Mock
 
 from app.utils.security import (
-    SecurityUtils, PasswordValidator, RateLimiter,
+    SecurityUtils, PasswordValidator, RateLimiter, BucketCounter,
+    RedisRateLimiter,
     hash_password, verify_password, validate_password
 )
 
@@ -381,6 +383,70 @@ class TestRateLimiter:
         assert result["allowed"] is True
 
 
+class TestBucketCounter:
+    """Test in-process bucketed rate limiting."""
+
+    @pytest.fixture
+    def bucket_counter(self):
+        """Create bucket counter instance."""
+        return BucketCounter()
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_exceeded(self, bucket_counter):
+        """Test rate limit is enforced."""
+        key = "test_key"
+        max_attempts = 3
+
+        for i in range(max_attempts):
+            result = await bucket_counter.is_allowed(key, max_attempts=max_attempts, window_minutes=1)
+            assert result["allowed"] is True
+            assert result["remaining"] == max_attempts - i - 1
+
+        result = await bucket_counter.is_allowed(key, max_attempts=max_attempts, window_minutes=1)
+        assert result["allowed"] is False
+        assert result["remaining"] == 0
+
+    @pytest.mark.asyncio
+    async def test_different_keys_independent(self, bucket_counter):
+        """Test that different keys are tracked independently."""
+        await bucket_counter.is_allowed("key1", max_attempts=1, window_minutes=1)
+
+        result = await bucket_counter.is_allowed("key1", max_attempts=1, window_minutes=1)
+        assert result["allowed"] is False
+
+        result = await bucket_counter.is_allowed("key2", max_attempts=1, window_minutes=1)
+        assert result["allowed"] is True
+
+
+class TestRedisRateLimiter:
+    """Test Redis rate limiting."""
+
+    @pytest.fixture
+    def redis_rate_limiter(self):
+        """Create rate limiter with a Redis client that is down."""
+        client = Mock()
+        client.register_script.return_value = AsyncMock(side_effect=ConnectionError("Redis is down"))
+        return RedisRateLimiter(client)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("sliding_window", [False, True])
+    async def test_redis_error_keeps_limiting(self, redis_rate_limiter, sliding_window):
+        """Test requests are still limited in-process when Redis fails."""
+        max_attempts = 2
+
+        for _ in range(max_attempts):
+            result = await redis_rate_limiter.is_allowed(
+                "test_key", max_attempts=max_attempts, window_minutes=1, sliding_window=sliding_window
+            )
+            assert result["allowed"] is True
+
+        result = await redis_rate_limiter.is_allowed(
+            "test_key", max_attempts=max_attempts, window_minutes=1, sliding_window=sliding_window
+        )
+        assert result["allowed"] is False
+        assert result["remaining"] == 0
+
+
 # Convenience function tests
 class TestConvenienceFunctions:
     """Test convenience functions."""
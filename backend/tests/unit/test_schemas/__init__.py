@@ -0,0 +1 @@
+"""Schema tests package."""
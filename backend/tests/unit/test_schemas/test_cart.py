@@ -0,0 +1,65 @@
+"""Tests for cart schemas."""
+
+from datetime import datetime
+
+from app.schemas.cart import CartResponse
+
+
+NOW = datetime(2024, 1, 1)
+
+PRODUCT = {
+    "id": 1,
+    "name": "Брокколи замороженная",
+    "price": 150.0,
+    "formatted_price": "150₽",
+    "formatted_discount_price": "",
+    "effective_price": 150.0,
+    "formatted_effective_price": "150₽",
+    "discount_percentage": 0,
+    "is_on_sale": False,
+    "is_active": True,
+    "in_stock": True,
+    "formatted_weight": "500г",
+    "sort_order": 0,
+    "stock_quantity": 10,
+    "min_stock_level": 1,
+    "popularity_score": 0,
+    "is_featured": False,
+    "stock_status": "in_stock",
+    "is_low_stock": False,
+    "created_at": NOW,
+    "updated_at": NOW,
+}
+
+
+class TestCartResponse:
+    """Test cart response serialization."""
+
+    def test_items_serialize_repeatedly(self):
+        """Test items survive more than one dump."""
+        cart = CartResponse(
+            id=1,
+            user_id=1,
+            items=iter([{
+                "id": 1,
+                "cart_id": 1,
+                "product_id": 1,
+                "quantity": 2,
+                "product": PRODUCT,
+                "total_price": 300.0,
+                "created_at": NOW,
+                "updated_at": NOW,
+            }]),
+            total_amount=300.0,
+            total_items=2,
+            created_at=NOW,
+            updated_at=NOW,
+        )
+
+        first = cart.model_dump()
+        second = cart.model_dump()
+
+        assert isinstance(first["items"], list)
+        assert len(first["items"]) == 1
+        assert second == first
+        assert cart.model_dump_json() == cart.model_dump_json()
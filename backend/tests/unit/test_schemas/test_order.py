@@ -0,0 +1,70 @@
+"""Tests for order schemas."""
+
+from datetime import datetime
+
+import pytest
+
+from app.models.order import Order, OrderItem, OrderStatus, OrderPriority
+from app.models.product import Product
+from app.models.user import User, UserRole
+from app.schemas.order import OrderResponse
+
+
+NOW = datetime(2024, 1, 1, 12, 0)
+
+
+def _loaded(obj):
+    """Fill column defaults the database would have set on a stored row."""
+    for column in obj.__table__.columns:
+        default = column.default
+        if getattr(obj, column.key) is None and default is not None and default.is_scalar:
+            setattr(obj, column.key, default.arg)
+    return obj
+
+
+@pytest.fixture
+def order():
+    """Create an order with its user loaded and no items."""
+    user = _loaded(User(
+        id=1, telegram_id=42, first_name="Иван", role=UserRole.USER,
+        created_at=NOW, updated_at=NOW
+    ))
+    user.is_admin = False  # Generated by the database
+    order = _loaded(Order(
+        id=1, user_id=1, status=OrderStatus.PENDING, priority=OrderPriority.NORMAL,
+        total_amount=300, customer_name="Иван", customer_phone="+79990000000",
+        delivery_type="pickup", payment_method="card",
+        created_at=NOW, updated_at=NOW
+    ))
+    order.user = user
+    return order
+
+
+class TestOrderResponse:
+    """Test building order responses from ORM rows."""
+
+    def test_from_orm_trusted_without_items(self, order):
+        """Test trusted response of an order without items survives validation."""
+        data = OrderResponse.from_orm_trusted(order).model_dump_json()
+
+        response = OrderResponse.model_validate_json(data)
+
+        assert response.items == []
+        assert response.user.telegram_id == 42
+        assert response.model_dump_json() == data
+
+    def test_from_orm_trusted_with_items(self, order):
+        """Test trusted response of an order with items survives validation."""
+        product = _loaded(Product(
+            id=5, name="Брокколи", price=150, created_at=NOW, updated_at=NOW
+        ))
+        order.items = [_loaded(OrderItem(
+            id=3, order_id=1, product_id=5, quantity=2, price=150, product=product
+        ))]
+
+        data = OrderResponse.from_orm_trusted(order).model_dump_json()
+
+        response = OrderResponse.model_validate_json(data)
+        assert len(response.items) == 1
+        assert response.items[0].total_price == 300
+        assert response.model_dump_json() == data
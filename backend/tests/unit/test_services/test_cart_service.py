@@ -0,0 +1,47 @@
+"""Tests for cart service."""
+
+import pytest
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock
+
+from app.models.cart import Cart
+from app.services.cart import CartService
+
+
+class TestCartTotals:
+    """Test cart totals."""
+
+    @pytest.fixture
+    def db(self):
+        """Create mock database session returning SQL totals."""
+        db = MagicMock()
+        result = MagicMock()
+        result.one.return_value = (Decimal("301.5"), 3)
+        db.execute = AsyncMock(return_value=result)
+        return db
+
+    @pytest.mark.asyncio
+    async def test_cart_totals(self, db):
+        """Test totals are summed in one query and returned as Decimal."""
+        total_amount, total_items = await CartService(db).cart_totals(1)
+
+        assert total_amount == Decimal("301.50")
+        assert isinstance(total_amount, Decimal)
+        assert total_items == 3
+        db.execute.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_get_cart_totals_uses_cached_columns(self, db):
+        """Test cached totals are returned without a query."""
+        cart = Cart(id=1, total_amount_cached=Decimal("150.00"), total_items_cached=2)
+
+        assert await CartService(db).get_cart_totals(cart) == (Decimal("150.00"), 2)
+        db.execute.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_get_cart_totals_without_cached_columns(self, db):
+        """Test totals are calculated in the database when not cached yet."""
+        cart = Cart(id=1)
+
+        assert await CartService(db).get_cart_totals(cart) == (Decimal("301.50"), 3)
+        db.execute.assert_awaited_once()